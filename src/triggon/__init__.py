@@ -7,6 +7,8 @@ from .errors.public import (
     UnregisteredLabelError,
     UpdateError,
 )
+from .indexed import IndexedValues
+from .lazy_value import LazyValue
 from .trigfunc import TrigFunc
 
 __version__ = "2.0.1"
@@ -14,6 +16,8 @@ __version__ = "2.0.1"
 __all__ = [
     "Triggon",
     "TrigFunc",
+    "IndexedValues",
+    "LazyValue",
     "FrameAccessError",
     "InvalidArgumentError",
     "RollbackNotSupportedError",
@@ -1,15 +1,21 @@
 from .debug.setup import logger
 from .mixins import _Internal
-from .rollback_ast import collect_rollback_refs, revert_targets
+from .rollback_ast import collect_rollback_refs, restore_snapshots, revert_targets, snapshot_targets
 from .utils import to_dict, unwrap_value
 from .validators import (
     check_after,
     check_bool,
     check_cond,
     check_debug,
+    check_discover,
     check_idxs,
     check_items,
+    check_non_negative_int,
+    check_positive_int,
+    check_prewarm,
+    check_rate,
     check_str_sequence,
+    check_timeout,
 )
 
 all = [
@@ -18,13 +24,21 @@ all = [
     "check_bool",
     "check_cond",
     "check_debug",
+    "check_discover",
     "check_idxs",
     "check_items",
     "check_labels",
+    "check_non_negative_int",
+    "check_positive_int",
+    "check_prewarm",
+    "check_rate",
     "check_str_sequence",
+    "check_timeout",
     "collect_rollback_refs",
     "logger",
+    "restore_snapshots",
     "revert_targets",
+    "snapshot_targets",
     "to_dict",
     "unwrap_value",
 ]
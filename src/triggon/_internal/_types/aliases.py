@@ -1,12 +1,26 @@
-from collections.abc import Mapping, Sequence
+from collections.abc import Hashable, Mapping, Sequence
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal
 
 from .structs import AttrRef, VarRef
 
 # Literal
 type DelayKey = Literal["trigger", "revert"]
-type NumArg = Literal["after", "index", "indices"]
+type DiscoverMode = Literal["source", "bytecode"]
+type NumArg = Literal[
+    "after",
+    "index",
+    "indices",
+    "prewarm",
+    "rate",
+    "burst",
+    "maxsize",
+    "batch_size",
+    "chunk_size",
+    "timeout",
+    "size_hint",
+    "max_bytes",
+]
 type VarKey = Literal["glob_var", "loc_var"]
 
 # References
@@ -28,3 +42,5 @@ type DebugArg = bool | LabelArg
 type LabelArg = str | Sequence[str]
 type IndexArg = int | Sequence[int]
 type NameArg = str | Sequence[str]
+type SwitchItem = tuple[LabelArg, Any] | tuple[LabelArg, Any, IndexArg | None]
+type SwitchSpec = Mapping[Hashable, SwitchItem] | Sequence[SwitchItem]
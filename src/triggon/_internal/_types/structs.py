@@ -1,7 +1,9 @@
-from collections.abc import Sequence
+import weakref
+from collections.abc import Callable, Mapping, MutableMapping, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from threading import Timer
+from types import ModuleType
 from typing import Any, NamedTuple, TypedDict
 
 # NamedTuples
@@ -15,14 +17,37 @@ class VarRef(NamedTuple):
 class AttrRef(NamedTuple):
     ref_id: int
     attr_name: str
-    parent_obj: Any
+    # a weakref to the parent, or a strong holder if it cannot be weakly referenced
+    parent_ref: Callable[[], Any]
     full_name: str
 
+    @property
+    def parent_obj(self) -> Any:
+        # None once a weakly referenced parent has been collected
+        return self.parent_ref()
+
 
 class RefMeta(NamedTuple):
     file: str
     scope_name: str
     orig_val: Any
+    # the module the ref was registered from, None for namespaces without one
+    module_ref: weakref.ref[ModuleType] | None = None
+
+
+class TargetScope(NamedTuple):
+    # namespaces used to resolve names, and the file key of registered refs
+    f_locals: MutableMapping[str, Any]
+    f_globals: MutableMapping[str, Any]
+    file: str
+    scope_name: str
+
+
+class DerivedLabel(NamedTuple):
+    expr: str
+    idx: int  # the index of the value applied on activation
+    inputs: tuple[str, ...]
+    predicate: Callable[[Mapping[str, bool]], bool]
 
 
 class Callsite(NamedTuple):
@@ -55,4 +80,6 @@ class DelayState:
     timer: Timer | None = None
     cur_timer_id: int = 0
     labels: tuple[str, ...] | None = None
+    prewarm_timer: Timer | None = None
+    staged: dict[int, Any] | None = None  # prewarmed results by index
 
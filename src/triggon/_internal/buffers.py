@@ -0,0 +1,91 @@
+import sys
+from typing import Any
+
+
+def _get_ndarray_type() -> type | None:
+    # numpy is optional, and an array can only exist once it is imported
+    numpy = sys.modules.get("numpy")
+    return None if numpy is None else numpy.ndarray
+
+
+def is_buffer_target(value: Any) -> bool:
+    """Return whether `value` is a writable NumPy array or buffer object."""
+
+    ndarray = _get_ndarray_type()
+    if ndarray is not None and isinstance(value, ndarray):
+        return bool(value.flags.writeable)
+
+    try:
+        with memoryview(value) as view:
+            return not view.readonly
+    except TypeError:
+        return False
+
+
+def is_array_like(value: Any) -> bool:
+    """Return whether `value` must be compared by identity.
+
+    `==` on NumPy arrays is elementwise and has no truth value.
+    """
+
+    ndarray = _get_ndarray_type()
+    if ndarray is not None and isinstance(value, ndarray):
+        return True
+    return is_buffer_target(value)
+
+
+def snapshot_buffer(value: Any) -> Any | None:
+    """Return an independent copy of the contents of a buffer target.
+
+    Returns None if the buffer layout cannot be reproduced.
+    """
+
+    ndarray = _get_ndarray_type()
+    if ndarray is not None and isinstance(value, ndarray):
+        return value.copy()
+
+    with memoryview(value) as view:
+        if not view.c_contiguous:
+            return None
+        data = bytearray(view.tobytes())
+        try:
+            return memoryview(data).cast(view.format, view.shape)
+        except (TypeError, ValueError):
+            # e.g. non-native struct formats of ctypes arrays
+            return None
+
+
+def copy_into(target: Any, source: Any) -> bool:
+    """Copy the contents of `source` into `target` without reallocating.
+
+    Returns False if the two do not have the same shape and element type,
+    in which case `target` is left unchanged.
+    """
+
+    ndarray = _get_ndarray_type()
+    if ndarray is not None and isinstance(target, ndarray):
+        numpy = sys.modules["numpy"]
+        try:
+            source = numpy.asarray(source)
+            if source.shape != target.shape:
+                return False
+            numpy.copyto(target, source, casting="same_kind")
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    try:
+        with memoryview(target) as dst, memoryview(source) as src:
+            if (
+                dst.readonly
+                or dst.format != src.format
+                or dst.shape != src.shape
+                or not dst.c_contiguous
+                or not src.c_contiguous
+            ):
+                return False
+            with dst.cast("B") as dst_bytes, src.cast("B") as src_bytes:
+                dst_bytes[:] = src_bytes
+    except TypeError:
+        return False
+    return True
@@ -3,7 +3,7 @@ import os
 import threading
 from typing import Any
 
-from ...trigfunc import TRIGFUNC_ATTR
+from ...trigfunc import TrigFunc
 from .._types.structs import Callsite, DebugConfig
 from ..frames import get_callsite, get_target_frame
 from ..sentinel import _NO_VALUE
@@ -22,6 +22,7 @@ UNREGISTER_REF_LOG = "{name} was unregistered from label {label}"
 
 TRIG_EARLY_RET = "Early return triggered (return_value={value})"
 TRIG_CALL = "Trigger call executed (target={target})"
+TRIG_CALL_THROTTLED = "Trigger call throttled (target={target})"
 
 SWITCH_LIT_ATTR = "_switch_lit_debug_state"
 
@@ -93,9 +94,9 @@ class DebugLogger:
         if label is not None and not self._is_target_label(label):
             return
 
-        if hasattr(prev_value, TRIGFUNC_ATTR):
+        if isinstance(prev_value, TrigFunc):
             prev_value = prev_value._trigcall.name
-        if hasattr(new_value, TRIGFUNC_ATTR):
+        if isinstance(new_value, TrigFunc):
             new_value = new_value._trigcall.name
 
         if target_name is None:
@@ -162,11 +163,24 @@ class DebugLogger:
 
         self._logger.debug(TRIG_EARLY_RET.format(value=repr(value)), extra=_build_log_extra(callsite))
 
-    def log_trigger_call(self, label: str, target_name: str, callsite: Callsite) -> None:
+    def log_trigger_call(
+        self,
+        label: str,
+        target: TrigFunc,
+        callsite: Callsite,
+        throttled: bool = False,
+    ) -> None:
         if not self._is_target_label(label):
             return
 
-        self._logger.debug(TRIG_CALL.format(target=target_name), extra=_build_log_extra(callsite))
+        assert target._trigcall is not None
+        target_name = target._trigcall.name
+
+        if throttled:
+            log_msg = TRIG_CALL_THROTTLED.format(target=target_name)
+        else:
+            log_msg = TRIG_CALL.format(target=target_name)
+        self._logger.debug(log_msg, extra=_build_log_extra(callsite))
 
 
 def _build_log_extra(callsite: Callsite) -> dict[str, str | int]:
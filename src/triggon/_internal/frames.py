@@ -2,7 +2,7 @@ import inspect
 from types import FrameType
 
 from ..errors.public import FrameAccessError
-from ._types.structs import Callsite
+from ._types.structs import Callsite, TargetScope
 
 
 def get_target_frame(depth: int = 1) -> FrameType:
@@ -35,3 +35,8 @@ def get_callsite(frame: FrameType, get_lasti: bool = False) -> Callsite:
         lasti = frame.f_lasti
         return Callsite(filename, lineno, scope_name, lasti)
     return Callsite(filename, lineno, scope_name, lasti=None)
+
+
+def get_target_scope(frame: FrameType) -> TargetScope:
+    code = frame.f_code
+    return TargetScope(frame.f_locals, frame.f_globals, code.co_filename, code.co_name)
@@ -2,13 +2,14 @@ from collections.abc import KeysView, Mapping, Sequence, ValuesView
 from typing import Any
 
 from ..errors.public import InvalidArgumentError, UnregisteredLabelError
+from ..indexed import IndexedValues
 from ._types.aliases import IndexArg, LabelArg
 
 SYMBOL = "*"
 
 
 class LabelValidator:
-    _new_values: Mapping[str, tuple[Any, ...]]
+    _new_values: Mapping[str, Sequence[Any]]
 
     def resolve_labels_and_idxs(
         self,
@@ -81,7 +82,11 @@ class LabelValidator:
 
     def validate_idx_range(self, label: str, idx: int) -> None:
         label_values = self._new_values[label]
-        if len(label_values) - 1 < idx:
+        if isinstance(label_values, IndexedValues):
+            in_range = label_values.has_index(idx)
+        else:
+            in_range = idx < len(label_values)
+        if not in_range:
             raise IndexError(f"index {idx} is out of range for label {label!r}")
 
 
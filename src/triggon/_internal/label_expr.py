@@ -0,0 +1,86 @@
+import re
+from collections.abc import Callable, Mapping
+from typing import NoReturn
+
+from ..errors.public import InvalidArgumentError
+
+type LabelPredicate = Callable[[Mapping[str, bool]], bool]
+
+_TOKEN = re.compile(r"\(|\)|[^\s()]+")
+_KEYWORDS = frozenset(("and", "or", "not"))
+
+
+def compile_label_expr(expr: str) -> tuple[tuple[str, ...], LabelPredicate]:
+    """Compile a boolean expression over label names.
+
+    The expression consists of label names, `and`, `or`, `not`, and
+    parentheses, with the usual precedence. Returns the labels in order of
+    first appearance and a predicate over a mapping of label flags.
+    """
+
+    parser = _Parser(expr)
+    predicate = parser.parse_or()
+    if parser.peek() is not None:
+        parser.fail(f"unexpected {parser.peek()!r}")
+    return tuple(dict.fromkeys(parser.labels)), predicate
+
+
+class _Parser:
+    def __init__(self, expr: str) -> None:
+        self.expr = expr
+        self.tokens = _TOKEN.findall(expr)
+        self.pos = 0
+        self.labels: list[str] = []
+
+    def peek(self) -> str | None:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self) -> str:
+        token = self.peek()
+        if token is None:
+            self.fail("unexpected end of expression")
+        self.pos += 1
+        return token
+
+    def fail(self, reason: str) -> NoReturn:
+        raise InvalidArgumentError(f"invalid label expression {self.expr!r}: {reason}")
+
+    def parse_or(self) -> LabelPredicate:
+        operands = [self.parse_and()]
+        while self.peek() == "or":
+            self.take()
+            operands.append(self.parse_and())
+
+        if len(operands) == 1:
+            return operands[0]
+        return lambda flags: any(operand(flags) for operand in operands)
+
+    def parse_and(self) -> LabelPredicate:
+        operands = [self.parse_not()]
+        while self.peek() == "and":
+            self.take()
+            operands.append(self.parse_not())
+
+        if len(operands) == 1:
+            return operands[0]
+        return lambda flags: all(operand(flags) for operand in operands)
+
+    def parse_not(self) -> LabelPredicate:
+        if self.peek() == "not":
+            self.take()
+            operand = self.parse_not()
+            return lambda flags: not operand(flags)
+        return self.parse_atom()
+
+    def parse_atom(self) -> LabelPredicate:
+        token = self.take()
+        if token == "(":
+            predicate = self.parse_or()
+            if self.take() != ")":
+                self.fail("missing ')'")
+            return predicate
+        if token == ")" or token in _KEYWORDS:
+            self.fail(f"unexpected {token!r}")
+
+        self.labels.append(token)
+        return lambda flags: flags[token]
@@ -0,0 +1,101 @@
+import threading
+import weakref
+from functools import partial
+from time import monotonic
+from typing import Any
+
+from .utils import LRUCache
+
+
+class TokenBucket:
+    """Token bucket shared by every call to one rate-limited target."""
+
+    __slots__ = ("rate", "burst", "_tokens", "_stamp", "_lock")
+
+    def __init__(self, rate: int | float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._stamp = monotonic()
+        # one lock per bucket, so unrelated targets never contend
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = monotonic()
+            tokens = self._tokens + (now - self._stamp) * self.rate
+            if tokens > self.burst:
+                tokens = self.burst
+            self._stamp = now
+
+            if tokens < 1:
+                self._tokens = tokens
+                return False
+
+            self._tokens = tokens - 1
+            return True
+
+
+type _LimitKey = tuple[tuple[str, ...], int | float, int]
+type _Buckets = dict[_LimitKey, TokenBucket]
+
+
+class CallBuckets:
+    """Token buckets keyed by the root object of a chain and its limits.
+
+    Roots are held weakly, so their buckets are dropped once they are
+    collected. Roots that cannot be weakly referenced, such as strings and
+    integers, are kept in a bounded LRU instead.
+    """
+
+    __slots__ = ("_weak", "_strong", "_lock")
+
+    def __init__(self, maxsize: int = 256) -> None:
+        # id(root) -> (weak ref to root, buckets)
+        self._weak: dict[int, tuple[weakref.ref[Any], _Buckets]] = {}
+        # id(root) -> (root, buckets); holding the root keeps its id unique
+        self._strong: LRUCache[int, tuple[Any, _Buckets]] = LRUCache(maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, root: Any, path: tuple[str, ...], rate: int | float, burst: int) -> TokenBucket:
+        # chains from different root objects, or with different limits,
+        # never share a bucket
+        limit_key = (path, rate, burst)
+        with self._lock:
+            buckets = self._get_buckets(root)
+            bucket = buckets.get(limit_key)
+            if bucket is None:
+                bucket = buckets[limit_key] = TokenBucket(rate, burst)
+        return bucket
+
+    def __len__(self) -> int:
+        return len(self._weak) + len(self._strong)
+
+    def _get_buckets(self, root: Any) -> _Buckets:
+        key = id(root)
+        entry = self._weak.get(key)
+        if entry is not None and entry[0]() is root:
+            return entry[1]
+        strong_entry = self._strong.get(key)
+        if strong_entry is not None and strong_entry[0] is root:
+            return strong_entry[1]
+
+        buckets: _Buckets = {}
+        try:
+            ref = weakref.ref(root, partial(_drop_buckets, self._weak, key))
+        except TypeError:
+            self._strong.put(key, (root, buckets))
+        else:
+            self._weak[key] = (ref, buckets)
+        return buckets
+
+
+def _drop_buckets(
+    weak: dict[int, tuple[weakref.ref[Any], _Buckets]],
+    key: int,
+    ref: weakref.ref[Any],
+) -> None:
+    # the id may already belong to a newer root
+    entry = weak.get(key)
+    if entry is not None and entry[0] is ref:
+        weak.pop(key, None)
@@ -1,26 +1,62 @@
 import ast
 import linecache
+import os
+from bisect import bisect_right
 from collections.abc import Mapping, Sequence
 from types import FrameType
+from typing import Any, NamedTuple
 
 from ..core.value_resolver import AttrResult, VarResult, resolve_ref_info
 from ..errors.public import InvalidArgumentError, RollbackSourceError, UpdateError
+from ._types.aliases import DiscoverMode
+from ._types.structs import TargetScope
 from .keys import GLOB_VAR, LOC_VAR
+from .rollback_bytecode import collect_assigned_names
+from .snapshot import ContainerSnapshot, snapshot_container
+from .utils import LRUCache
+
+MUTATING_METHODS = frozenset(
+    (
+        "add",
+        "append",
+        "clear",
+        "discard",
+        "extend",
+        "insert",
+        "pop",
+        "popitem",
+        "remove",
+        "reverse",
+        "setdefault",
+        "sort",
+        "update",
+    )
+)
 
 
 def collect_rollback_refs(
-    frame: FrameType,
+    scope: TargetScope,
+    frame: FrameType | None,
     target_names: Sequence[str] | None,
+    discover: DiscoverMode = "source",
+    track_mutations: bool = False,
 ) -> Mapping[str, VarResult | AttrResult]:
-    node = _find_with_node(frame)
-
+    # explicit targets need neither the source nor the bytecode
     if target_names is None:
-        target_names = _collect_assigned_ref_names(node)
+        if frame is None:
+            raise AssertionError("target discovery requires the caller's frame")
+        if discover == "bytecode":
+            target_names = collect_assigned_names(frame.f_code, frame.f_lasti)
+        else:
+            block = _find_with_block(frame)
+            target_names = block.assigned_names
+            if track_mutations:
+                target_names += block.mutated_names
 
     name_to_refs = {}
     for name in target_names:
         try:
-            value = resolve_ref_info(name, frame, allow_loc_var=True)
+            value = resolve_ref_info(name, scope, allow_loc_var=True)
             name_to_refs[name] = value
         except (InvalidArgumentError, NameError):
             continue
@@ -28,42 +64,144 @@ def collect_rollback_refs(
     return name_to_refs
 
 
-def revert_targets(frame: FrameType, name_to_refs: Mapping[str, VarResult | AttrResult]) -> None:
+def revert_targets(
+    scope: TargetScope,
+    name_to_refs: Mapping[str, VarResult | AttrResult],
+) -> None:
     for name, ref in name_to_refs.items():
-        if isinstance(ref, AttrResult):
-            try:
-                setattr(ref.parent_obj, ref.attr_name, ref.value)
-            except (AttributeError, TypeError, ValueError) as e:
-                raise UpdateError(name, e) from None
-        elif isinstance(ref, VarResult):
-            if ref.kind == GLOB_VAR:
-                frame.f_globals[name] = ref.value
-            elif ref.kind == LOC_VAR:
-                frame.f_locals[name] = ref.value
-            else:
-                raise AssertionError(f"unreachable ref type: {type(ref)!r}")
+        _bind_target(scope, name, ref, ref.value)
+
+
+def snapshot_targets(
+    name_to_refs: Mapping[str, VarResult | AttrResult],
+) -> list[ContainerSnapshot]:
+    snapshots = []
+    seen = set()
+    for ref in name_to_refs.values():
+        # a container bound to several targets is restored once
+        if id(ref.value) in seen:
+            continue
+        snapshot = snapshot_container(ref.value)
+        if snapshot is not None:
+            seen.add(id(ref.value))
+            snapshots.append(snapshot)
+    return snapshots
+
+
+def restore_snapshots(snapshots: Sequence[ContainerSnapshot]) -> None:
+    for snapshot in snapshots:
+        snapshot.restore()
+
+
+def _bind_target(scope: TargetScope, name: str, ref: VarResult | AttrResult, value: Any) -> None:
+    if isinstance(ref, AttrResult):
+        try:
+            setattr(ref.parent_obj, ref.attr_name, value)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise UpdateError(name, e) from None
+    elif isinstance(ref, VarResult):
+        if ref.kind == GLOB_VAR:
+            scope.f_globals[name] = value
+        elif ref.kind == LOC_VAR:
+            # f_locals of a function frame writes through to the frame
+            scope.f_locals[name] = value
+        else:
+            raise AssertionError(f"unreachable ref type: {type(ref)!r}")
+
+
+class _WithBlock(NamedTuple):
+    node: ast.With
+    start: int
+    end: int
+    parent: int  # position of the enclosing block, -1 at the top level
+    assigned_names: tuple[str, ...]
+    mutated_names: tuple[str, ...]  # containers changed in place
+
+
+class _WithIndex:
+    """Line-sorted index of the `with` blocks in one source file."""
+
+    __slots__ = ("_starts", "_blocks")
+
+    def __init__(self, tree: ast.Module) -> None:
+        self._blocks: list[_WithBlock] = []
+        self._collect(tree, parent=-1)
+        # pre-order traversal keeps blocks sorted by their first line
+        self._starts = [block.start for block in self._blocks]
+
+    def _collect(self, node: ast.AST, parent: int) -> None:
+        for child in ast.iter_child_nodes(node):
+            child_parent = parent
+            if isinstance(child, ast.With):
+                start = getattr(child, "lineno", None)
+                end = getattr(child, "end_lineno", None)
+                if start is not None and end is not None:
+                    child_parent = len(self._blocks)
+                    names = tuple(_collect_assigned_ref_names(child))
+                    mutated = tuple(_collect_mutated_ref_names(child))
+                    self._blocks.append(_WithBlock(child, start, end, parent, names, mutated))
+            self._collect(child, child_parent)
+
+    def find(self, lineno: int) -> _WithBlock | None:
+        # the last block starting at or before lineno either contains it or
+        # is nested in the innermost block that does
+        i = bisect_right(self._starts, lineno) - 1
+        while i >= 0:
+            block = self._blocks[i]
+            if block.end >= lineno:
+                return block
+            i = block.parent
+        return None
 
 
 def _find_with_node(frame: FrameType) -> ast.With:
-    lineno = frame.f_lineno
+    return _find_with_block(frame).node
+
+
+def _find_with_block(frame: FrameType) -> _WithBlock:
+    block = _get_with_index(frame).find(frame.f_lineno)
+    if block is None:
+        raise RuntimeError("failed to locate the target rollback block")
+    return block
+
+
+type _CacheKey = tuple[str, int | None, int]
+
+_index_cache: LRUCache[_CacheKey, _WithIndex] = LRUCache(maxsize=64)
+
+
+def _get_with_index(frame: FrameType) -> _WithIndex:
+    filename = frame.f_code.co_filename
+    key = _get_stat_key(filename)
+    if key is not None:
+        index = _index_cache.get(key)
+        if index is not None:
+            return index
+        # the file changed since linecache last read it
+        linecache.checkcache(filename)
+
     source, source_name = _load_source(frame)
-    tree = ast.parse(source, filename=source_name)
+    if key is None or source_name != filename:
+        key = _get_stat_key(source_name)
+        if key is None:
+            # no file on disk (e.g. zipimport); key by the source itself
+            key = (source_name, None, hash(source))
 
-    with_node = None
+        index = _index_cache.get(key)
+        if index is not None:
+            return index
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.With):
-            node_start = getattr(node, "lineno", None)
-            node_end = getattr(node, "end_lineno", None)
+    index = _WithIndex(ast.parse(source, filename=source_name))
+    _index_cache.put(key, index)
+    return index
 
-            if node_start is None or node_end is None:
-                continue
-            if node_start <= lineno <= node_end:
-                with_node = node
 
-    if with_node is None:
-        raise RuntimeError("failed to locate the target rollback block")
-    return with_node
+def _get_stat_key(filename: str) -> _CacheKey | None:
+    try:
+        st = os.stat(filename)
+    except (OSError, ValueError):
+        return None
+    return filename, st.st_mtime_ns, st.st_size
 
 
 def _load_source(frame: FrameType) -> tuple[str, str]:
@@ -102,6 +240,35 @@ def _collect_assigned_ref_names(node: ast.With) -> list[str]:
     return vars_and_attrs
 
 
+def _collect_mutated_ref_names(node: ast.With) -> list[str]:
+    containers = []
+
+    for child in ast.walk(node):
+        if isinstance(child, (ast.Assign, ast.Delete)):
+            targets = child.targets
+        elif isinstance(child, (ast.AnnAssign, ast.AugAssign)):
+            targets = [child.target]
+        elif (
+            isinstance(child, ast.Call)
+            and isinstance(child.func, ast.Attribute)
+            and child.func.attr in MUTATING_METHODS
+        ):
+            name = _get_target_name(child.func.value)
+            if name is not None:
+                containers.append(name)
+            continue
+        else:
+            continue
+
+        for target in targets:
+            if isinstance(target, ast.Subscript):
+                name = _get_target_name(target.value)
+                if name is not None:
+                    containers.append(name)
+
+    return list(dict.fromkeys(containers))
+
+
 def _get_target_name(target: ast.expr) -> str | None:
     if isinstance(target, ast.Name):
         return target.id
@@ -0,0 +1,181 @@
+import dis
+from collections.abc import Sequence
+from types import CodeType
+
+from .utils import LRUCache
+
+NAME_STORES = frozenset(
+    ("STORE_NAME", "STORE_GLOBAL", "STORE_FAST", "STORE_DEREF", "STORE_FAST_STORE_FAST")
+)
+NAME_LOADS = frozenset(
+    ("LOAD_NAME", "LOAD_GLOBAL", "LOAD_FAST", "LOAD_FAST_CHECK", "LOAD_DEREF", "LOAD_FAST_BORROW")
+)
+PAIR_LOADS = frozenset(("LOAD_FAST_LOAD_FAST", "LOAD_FAST_BORROW_LOAD_FAST_BORROW"))
+
+type _Entry = dis._ExceptionTableEntry
+
+_names_cache: LRUCache[tuple[CodeType, int], tuple[str, ...]] = LRUCache(maxsize=256)
+
+
+def collect_assigned_names(code: CodeType, lasti: int) -> tuple[str, ...]:
+    """Return the names assigned in the `with` block entered at `lasti`.
+
+    `lasti` is the offset of the instruction that calls `__enter__()`.
+    Returns an empty tuple if no `with` block starts there.
+    """
+
+    key = (code, lasti)
+    names = _names_cache.get(key)
+    if names is None:
+        names = _analyse_with_block(code, lasti)
+        _names_cache.put(key, names)
+    return names
+
+
+def _analyse_with_block(code: CodeType, lasti: int) -> tuple[str, ...]:
+    instrs = list(dis.get_instructions(code))
+    entries = dis.Bytecode(code).exception_entries
+
+    with_target = _find_with_handler(instrs, entries, lasti)
+    if with_target is None:
+        return ()
+
+    enter_line = None
+    for instr in instrs:
+        if instr.offset == lasti:
+            enter_line = instr.positions.lineno if instr.positions else None
+            break
+
+    names = []
+    for i, instr in enumerate(instrs):
+        if instr.offset <= lasti:
+            continue
+        if not _is_in_block(instr.offset, entries, with_target):
+            continue
+        if instr.positions is not None and instr.positions.lineno == enter_line:
+            # skip the `as` target of the with statement itself
+            continue
+
+        if instr.opname in NAME_STORES:
+            if isinstance(instr.argval, tuple):
+                names.extend(instr.argval)
+            else:
+                names.append(instr.argval)
+        elif instr.opname == "STORE_FAST_LOAD_FAST":
+            names.append(instr.argval[0])
+        elif instr.opname == "STORE_ATTR":
+            attr_target = _get_attr_target(instrs, i)
+            if attr_target is not None:
+                names.append(attr_target[0])
+
+    return tuple(dict.fromkeys(names))
+
+
+def collect_function_names(code: CodeType) -> tuple[str, ...]:
+    """Return the names a function assigns outside of its own frame.
+
+    These are global names, closure variables, and attribute paths whose
+    root is a global name or a closure variable.
+    """
+
+    instrs = list(dis.get_instructions(code))
+    freevars = frozenset(code.co_freevars)
+
+    names = []
+    for i, instr in enumerate(instrs):
+        if instr.opname == "STORE_GLOBAL":
+            names.append(instr.argval)
+        elif instr.opname == "STORE_DEREF" and instr.argval in freevars:
+            names.append(instr.argval)
+        elif instr.opname == "STORE_ATTR":
+            attr_target = _get_attr_target(instrs, i)
+            if attr_target is None:
+                continue
+
+            name, root_op = attr_target
+            if root_op in ("LOAD_GLOBAL", "LOAD_NAME"):
+                names.append(name)
+            elif root_op == "LOAD_DEREF" and name.partition(".")[0] in freevars:
+                names.append(name)
+
+    return tuple(dict.fromkeys(names))
+
+
+def _find_with_handler(
+    instrs: Sequence[dis.Instruction],
+    entries: Sequence[_Entry],
+    lasti: int,
+) -> int | None:
+    # the body of the block is protected by the first handler after the
+    # enter call that runs WITH_EXCEPT_START
+    op_at = {instr.offset: i for i, instr in enumerate(instrs)}
+
+    for entry in sorted(entries, key=lambda e: e.start):
+        if entry.start <= lasti:
+            continue
+
+        i = op_at.get(entry.target)
+        if i is None:
+            continue
+        handler_ops = [instr.opname for instr in instrs[i : i + 2]]
+        if handler_ops == ["PUSH_EXC_INFO", "WITH_EXCEPT_START"]:
+            return entry.target
+
+    return None
+
+
+def _is_in_block(offset: int, entries: Sequence[_Entry], with_target: int) -> bool:
+    # follow the chain of handlers, so that nested try blocks inside the
+    # with body count as part of it while the normal exit path does not
+    seen = set()
+    while offset not in seen:
+        seen.add(offset)
+
+        entry = _find_entry(offset, entries)
+        if entry is None:
+            return False
+        if entry.target == with_target:
+            return True
+        offset = entry.target
+
+    return False
+
+
+def _find_entry(offset: int, entries: Sequence[_Entry]) -> _Entry | None:
+    for entry in entries:
+        if entry.start <= offset < entry.end:
+            return entry
+    return None
+
+
+def _get_attr_target(
+    instrs: Sequence[dis.Instruction],
+    store_idx: int,
+) -> tuple[str, str] | None:
+    # rebuild "obj.attr" from the instructions that load the object,
+    # together with the opcode that loaded the root name
+    parts = [instrs[store_idx].argval]
+    i = store_idx - 1
+
+    if i >= 0 and instrs[i].opname == "SWAP":
+        # augmented assignment: the object was loaded before COPY 1
+        while i >= 0 and not (instrs[i].opname == "COPY" and instrs[i].arg == 1):
+            i -= 1
+        i -= 1
+
+    while i >= 0:
+        instr = instrs[i]
+        if instr.opname == "LOAD_ATTR":
+            parts.append(instr.argval)
+        elif instr.opname in NAME_LOADS:
+            parts.append(instr.argval)
+            return ".".join(reversed(parts)), instr.opname
+        elif instr.opname in PAIR_LOADS:
+            # the second name ends up on top of the stack
+            parts.append(instr.argval[1])
+            return ".".join(reversed(parts)), instr.opname
+        else:
+            return None
+        i -= 1
+
+    return None
@@ -0,0 +1,114 @@
+from collections.abc import Callable, Sequence
+from types import CellType, TracebackType
+from typing import Any, NamedTuple
+
+from ..errors.public import InvalidArgumentError, UpdateError
+from .rollback_bytecode import collect_function_names
+from .sentinel import _NO_VALUE
+
+
+class _Target(NamedTuple):
+    name: str
+    root: str
+    attrs: tuple[str, ...]
+    cell: CellType | None  # None for global roots
+
+
+type _Saved = tuple[_Target, Any, Any]
+
+
+class RollbackPlan:
+    """Targets of one decorated function, resolved once at decoration time."""
+
+    __slots__ = ("_globals", "_targets")
+
+    def __init__(self, func: Callable[..., Any], target_names: Sequence[str] | None) -> None:
+        code = func.__code__
+        if target_names is None:
+            target_names = collect_function_names(code)
+
+        freevars = code.co_freevars
+        closure = func.__closure__ or ()
+
+        targets = []
+        for name in target_names:
+            root, *attrs = name.split(".")
+            if root in freevars:
+                cell = closure[freevars.index(root)]
+            elif not attrs and root in code.co_varnames:
+                raise InvalidArgumentError(f"local variables cannot be rolled back: {name!r}")
+            else:
+                cell = None
+            targets.append(_Target(name, root, tuple(attrs), cell))
+
+        self._globals = func.__globals__
+        self._targets = tuple(targets)
+
+    @property
+    def target_names(self) -> tuple[str, ...]:
+        return tuple(target.name for target in self._targets)
+
+    def snapshot(self) -> list[_Saved]:
+        # unresolvable targets are skipped, as in rollback()
+        saved = []
+        for target in self._targets:
+            if target.cell is None:
+                obj = self._globals.get(target.root, _NO_VALUE)
+            else:
+                try:
+                    obj = target.cell.cell_contents
+                except ValueError:
+                    # the closure variable is not assigned yet
+                    obj = _NO_VALUE
+            if obj is _NO_VALUE:
+                continue
+
+            if not target.attrs:
+                saved.append((target, None, obj))
+                continue
+
+            parent = obj
+            for attr in target.attrs[:-1]:
+                parent = getattr(parent, attr, _NO_VALUE)
+                if parent is _NO_VALUE:
+                    break
+            else:
+                value = getattr(parent, target.attrs[-1], _NO_VALUE)
+                if value is not _NO_VALUE:
+                    saved.append((target, parent, value))
+
+        return saved
+
+    def restore(self, saved: Sequence[_Saved]) -> None:
+        for target, parent, value in saved:
+            if target.attrs:
+                try:
+                    setattr(parent, target.attrs[-1], value)
+                except (AttributeError, TypeError, ValueError) as e:
+                    raise UpdateError(target.name, e) from None
+            elif target.cell is None:
+                self._globals[target.root] = value
+            else:
+                target.cell.cell_contents = value
+
+
+class RollbackContext:
+    """Snapshot the targets of a plan on entry and restore them on exit."""
+
+    __slots__ = ("_plan", "_saved")
+
+    def __init__(self, plan: RollbackPlan) -> None:
+        self._plan = plan
+        self._saved: list[_Saved] = []
+
+    def __enter__(self) -> None:
+        self._saved = self._plan.snapshot()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        saved, self._saved = self._saved, []
+        self._plan.restore(saved)
@@ -0,0 +1,76 @@
+from collections.abc import Callable
+from typing import Any
+
+from .sentinel import _NO_VALUE
+
+
+class ContainerSnapshot:
+    """Shallow copy of a plain dict, list, or set that can be written back.
+
+    The container itself is never replaced, so it keeps its full API and
+    identity while it is changed, and changes made through any reference
+    to it are restored.
+    """
+
+    __slots__ = ("target", "_saved", "_restore")
+
+    def __init__(self, target: Any, restore: Callable[[Any, Any], None]) -> None:
+        self.target = target
+        self._saved = target.copy()
+        self._restore = restore
+
+    def restore(self) -> None:
+        self._restore(self.target, self._saved)
+
+
+def _restore_dict(data: dict[Any, Any], saved: dict[Any, Any]) -> None:
+    for key in [key for key in data if key not in saved]:
+        del data[key]
+    for key, value in saved.items():
+        if data.get(key, _NO_VALUE) is not value:
+            data[key] = value
+
+    # keys removed and added again inside the block moved to the end
+    if list(data) != list(saved):
+        data.clear()
+        data.update(saved)
+
+
+def _restore_list(data: list[Any], saved: list[Any]) -> None:
+    n = min(len(data), len(saved))
+    start = 0
+    while start < n and data[start] is saved[start]:
+        start += 1
+    if start == n and len(data) == len(saved):
+        return
+
+    end = 0
+    while end < n - start and data[-1 - end] is saved[-1 - end]:
+        end += 1
+    # replace only the range that differs
+    data[start : len(data) - end] = saved[start : len(saved) - end]
+
+
+def _restore_set(data: set[Any], saved: set[Any]) -> None:
+    data -= data - saved
+    data |= saved - data
+
+
+_RESTORERS: dict[type, Callable[[Any, Any], None]] = {
+    dict: _restore_dict,
+    list: _restore_list,
+    set: _restore_set,
+}
+
+
+def snapshot_container(value: Any) -> ContainerSnapshot | None:
+    """Return a snapshot of a plain dict, list, or set.
+
+    Subclasses are not snapshotted, since `copy()` and the base methods
+    used to write them back may not preserve their own state.
+    """
+
+    restore = _RESTORERS.get(type(value))
+    if restore is None:
+        return None
+    return ContainerSnapshot(value, restore)
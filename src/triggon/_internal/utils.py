@@ -1,8 +1,49 @@
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from types import ModuleType
 from typing import Any, KeysView, Sequence
 
 from ._types.aliases import RevertMap, TriggerMap
 
 
+class LRUCache[K: Hashable, V]:
+    """Small thread-safe LRU mapping."""
+
+    __slots__ = ("_maxsize", "_data", "_lock")
+
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: K, value: V) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def find_module(f_globals: Mapping[str, Any]) -> ModuleType | None:
+    # return the module whose namespace is f_globals, if any
+    module = sys.modules.get(f_globals.get("__name__", ""))
+    if module is None or vars(module) is not f_globals:
+        return None
+    return module
+
+
 def to_dict(
     keys: tuple[str, ...] | KeysView,
     values: tuple[str | int, ...] | None,
@@ -102,6 +102,56 @@ def check_after(after: Any) -> None:
     _ensure_non_negative(after, "after")
 
 
+def check_prewarm(prewarm: Any, after: int | float) -> None:
+    if isinstance(prewarm, bool) or not isinstance(prewarm, (int, float)):
+        _raise_type_error(arg_name="prewarm", type_msg="int or float", actual_value=prewarm)
+    _ensure_non_negative(prewarm, "prewarm")
+
+    if prewarm != 0 and after == 0:
+        raise InvalidArgumentError("'prewarm' requires 'after' to be set")
+
+
+def check_rate(rate: Any, burst: Any) -> None:
+    if rate is None:
+        return
+
+    if isinstance(rate, bool) or not isinstance(rate, (int, float)):
+        _raise_type_error(arg_name="rate", type_msg="int or float", actual_value=rate)
+    _ensure_positive(rate, "rate")
+
+    if isinstance(burst, bool) or not isinstance(burst, int):
+        _raise_type_error(arg_name="burst", type_msg="int", actual_value=burst)
+    _ensure_positive(burst, "burst")
+
+
+def check_positive_int(arg: Any, arg_name: NumArg) -> None:
+    if isinstance(arg, bool) or not isinstance(arg, int):
+        _raise_type_error(arg_name, type_msg="int", actual_value=arg)
+    _ensure_positive(arg, arg_name)
+
+
+def check_non_negative_int(arg: Any, arg_name: NumArg) -> None:
+    if isinstance(arg, bool) or not isinstance(arg, int):
+        _raise_type_error(arg_name, type_msg="int", actual_value=arg)
+    _ensure_non_negative(arg, arg_name)
+
+
+def check_timeout(timeout: Any) -> None:
+    if timeout is None:
+        return
+
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)):
+        _raise_type_error(arg_name="timeout", type_msg="int, float, or None", actual_value=timeout)
+    _ensure_non_negative(timeout, "timeout")
+
+
+def check_discover(discover: Any) -> None:
+    if not isinstance(discover, str):
+        _raise_type_error(arg_name="discover", type_msg="str", actual_value=discover)
+    if discover not in ("source", "bytecode"):
+        raise InvalidArgumentError(f"'discover' must be 'source' or 'bytecode', got {discover!r}")
+
+
 def check_bool(arg: Any, arg_name: str) -> None:
     if not isinstance(arg, bool):
         _raise_type_error(arg_name, type_msg="bool", actual_value=arg)
@@ -117,6 +167,11 @@ def _ensure_non_negative(num: int | float | Sequence[int], arg_name: NumArg) ->
         raise InvalidArgumentError(f"{arg_name!r} must be non-negative")
 
 
+def _ensure_positive(num: int | float, arg_name: NumArg) -> None:
+    if num <= 0:
+        raise InvalidArgumentError(f"{arg_name!r} must be positive")
+
+
 def check_cond(cond: Any) -> None:
     if not isinstance(cond, str):
         _raise_type_error(arg_name="cond", type_msg="str", actual_value=cond)
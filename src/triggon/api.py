@@ -1,10 +1,26 @@
+import functools
+import inspect
 import logging
 import sys
 import threading
+import weakref
+from collections import deque
+from concurrent.futures import Executor, Future
 from contextlib import contextmanager
-from collections.abc import Iterator, KeysView, Mapping, Sequence, ValuesView
-from dataclasses import dataclass
-from typing import Any, Self
+from collections.abc import (
+    Callable,
+    Collection,
+    Hashable,
+    Iterable,
+    Iterator,
+    KeysView,
+    Mapping,
+    MutableMapping,
+    Sequence,
+    ValuesView,
+)
+from types import ModuleType
+from typing import Any, ClassVar, Self, cast
 
 from ._internal import (
     _Internal,
@@ -12,29 +28,43 @@ from ._internal import (
     check_bool,
     check_cond,
     check_debug,
+    check_discover,
     check_idxs,
     check_items,
+    check_non_negative_int,
+    check_positive_int,
+    check_prewarm,
+    check_rate,
     check_str_sequence,
+    check_timeout,
     collect_rollback_refs,
+    restore_snapshots,
     revert_targets,
+    snapshot_targets,
     to_dict,
     unwrap_value,
 )
 from ._internal._types.aliases import (
     DebugArg,
     DelayKey,
+    DiscoverMode,
     IndexArg,
     LabelArg,
     LabelToRefs,
     NameArg,
+    SwitchSpec,
 )
 from ._internal._types.structs import (
+    Callsite,
     DebugConfig,
     DelayState,
+    DerivedLabel,
     RefMeta,
     RefsByKind,
+    TargetScope,
 )
-from ._internal.frames import get_callsite, get_target_frame
+from ._internal.frames import get_callsite, get_target_frame, get_target_scope
+from ._internal.rollback_func import RollbackContext, RollbackPlan
 from ._internal.keys import (
     ATTR,
     GLOB_VAR,
@@ -42,22 +72,24 @@ from ._internal.keys import (
     REVERT,
     TRIGGER,
 )
+from ._internal.rate_limit import CallBuckets
 from ._internal.sentinel import _NO_VALUE
+from .bound import BoundNamespace
+from .core.early_return import ReturnCapture, _EarlyReturn
 from .core.mixins import _Core
+from .core.refs.lazy import LazyRef
+from .core.sandbox import Sandbox
+from .core.work_queue import DEFAULT_BATCH_SIZE, DEFAULT_MAXSIZE, LabelQueue
 from .errors.public import InactiveCaptureError, InvalidArgumentError, RollbackNotSupportedError
-from .trigfunc import TRIGFUNC_ATTR, TrigFunc
-
-
-class _EarlyReturn(Exception):
-    """Internal signal used to perform an early return inside capture_return()."""
-
-
-@dataclass(slots=True)
-class EarlyReturnResult:
-    """Result returned by capture_return()."""
-
-    triggered: bool = False
-    value: Any = None
+from .indexed import IndexedValues
+from .lazy_value import LazyValue
+from .switch_array import select_array
+from .switch_attr import SwitchAttr
+from .switch_stream import DEFAULT_CHUNK_SIZE, stream_chunks
+from .switch_table import NEGATION, SwitchTable
+from .switch_batch import SwitchBatch
+from .trigfunc import DEFERRED_ATTR, TrigFunc
+from .trigfunc.trigfunc import _run_deferred
 
 
 class Triggon(_Core, _Internal):
@@ -68,13 +100,27 @@ class Triggon(_Core, _Internal):
     _label_is_active: dict[str, bool]
     _label_delay_state: dict[str, dict[DelayKey, DelayState]]
     _label_is_perm_disabled: dict[str, bool]
-    _new_values: dict[str, tuple[Any, ...]]
+    _new_values: dict[str, Sequence[Any]]  # a tuple or IndexedValues
     _label_refs: dict[str, RefsByKind]
     _id_meta: dict[int, RefMeta]
+    _dead_refs: deque[tuple[str, int]]  # refs whose parent was collected
+    _inplace_data: dict[int, Any]  # buffer contents saved by in-place switches
+    _sandboxes: list[Sandbox]  # entered sandboxes, innermost last
+    _lazy_proxies: dict[tuple[int, str], tuple[MutableMapping[str, Any], str, LazyRef]]
     _latest_id: int
-    _return_val_stack: list[Any]
+    _epoch: int  # bumped whenever a label flag flips
+    _return_capture: ReturnCapture
+    _call_buckets: CallBuckets
+    _work_queues: dict[str, LabelQueue]
+    _lazy_values: dict[LazyValue, set[str]]
+    _value_budget: int | None
+    _derived: dict[str, DerivedLabel]
+    _derived_order: tuple[str, ...]
     _lock: threading.Lock
 
+    # Live instances, used to sandbox every instance in tests
+    _instances: ClassVar[weakref.WeakSet["Triggon"]] = weakref.WeakSet()
+
     def __init__(
         self,
         label: LabelArg | None = None,
@@ -142,12 +188,24 @@ class Triggon(_Core, _Internal):
         self._label_is_perm_disabled = {}
         self._label_refs = {}
         self._id_meta = {}
+        self._dead_refs = deque()
+        self._inplace_data = {}
+        self._sandboxes = []
+        self._lazy_proxies = {}
         self._latest_id = 1
-        self._return_val_stack = []
+        self._epoch = 0
+        self._return_capture = ReturnCapture()
+        self._call_buckets = CallBuckets()
+        self._work_queues = {}
+        self._lazy_values = {}
+        self._value_budget = None
+        self._derived = {}
+        self._derived_order = ()
         self._lock = threading.Lock()
 
         self._normalize_label_values(labels, new_values)
         self.configure_debug(debug)
+        Triggon._instances.add(self)
 
     def _normalize_label_values(
         self,
@@ -172,15 +230,61 @@ class Triggon(_Core, _Internal):
             if debug_on:
                 self.log_added_label(label, callsite)
 
+            if isinstance(val, IndexedValues):
+                # kept as is, so that large storage is never copied into a tuple
+                label_values[label] = val
+                continue
+
             if isinstance(val, Sequence) and not isinstance(val, (str, bytes, bytearray)):
                 if len(val) >= 1:
                     label_values[label] = tuple(val)
+                    self.track_lazy_values(label, label_values[label])
                     continue
 
             label_values[label] = (val,)
+            self.track_lazy_values(label, label_values[label])
 
         self._new_values.update(label_values)
 
+    def _get_caller_scope(self) -> tuple[TargetScope, Callsite | None]:
+        # Add 1 to depth to account for the public method
+        frame = get_target_frame(depth=2)
+        scope = get_target_scope(frame)
+        callsite = get_callsite(frame) if self.debug[LOG_VERBOSITY] != 0 else None
+        return scope, callsite
+
+    def bind(self, namespace: ModuleType | MutableMapping[str, Any], /) -> BoundNamespace:
+        """Return a handle whose methods target an explicit namespace.
+
+        Methods of the handle resolve and update names in `namespace`
+        instead of the caller's frame, so they work the same when called
+        through wrappers or helper modules and never inspect frames. The
+        caller's location is captured only for debug logging.
+
+        Refs registered through the handle are keyed by the module's
+        `__file__`, so they are shared with refs registered by calls made
+        from that module.
+
+        Args:
+            namespace (ModuleType | MutableMapping[str, Any]):
+                The module, or the globals mapping of a module, to bind.
+
+        Returns:
+            BoundNamespace: A handle bound to `namespace`.
+
+        Raises:
+            TypeError:
+                If `namespace` is not a module or a mutable mapping.
+
+        Examples:
+            >>> import settings
+            >>> ns = tg.bind(settings)
+            >>> ns.register_ref("debug_mode", name="LOG_LEVEL")
+            >>> ns.set_trigger("debug_mode")
+        """
+
+        return BoundNamespace(self, namespace)
+
     def _add_new_labels(self, label: str) -> None:
         self._label_is_active[label] = False
         self._label_is_perm_disabled[label] = False
@@ -310,6 +414,71 @@ class Triggon(_Core, _Internal):
         )
         self._normalize_label_values(labels_tup, values, add=True)
 
+    def derive(
+        self,
+        label: str,
+        /,
+        expr: str,
+        *,
+        index: int | None = None,
+        propagate: bool = False,
+    ) -> None:
+        """Make a label active exactly when an expression over other labels holds.
+
+        The expression is compiled once. Whenever one of its input labels is
+        activated or deactivated, only the derived labels that depend on it
+        are evaluated again, in dependency order, and the refs of those that
+        flip are updated in the same call as the input. Derived labels cannot
+        be set with `set_trigger()` or `revert()`; calls with `all=True` skip
+        them. Calling this again for the same label replaces its expression.
+
+        Args:
+            label (str):
+                A registered label to derive. If it starts with `*`, the
+                number of leading `*` characters is treated as its index.
+            expr (str):
+                An expression of registered label names combined with `and`,
+                `or`, `not`, and parentheses, such as
+                `"db_slow or (cache_down and not maintenance)"`. Derived
+                labels may be used as inputs.
+            index (int, optional):
+                The index of the value applied to the refs of `label` when
+                it becomes active. Takes precedence over any `*` prefix.
+                If omitted, the prefix count is used, which is 0 without
+                a prefix.
+            propagate (bool, optional):
+                If True, refs registered from any module are updated when the
+                label flips as a result of this call. Defaults to False.
+
+        Raises:
+            InvalidArgumentError:
+                If `expr` is not a valid expression, if a label is invalid,
+                if a label in `expr` starts with `*`, or if labels would
+                depend on themselves.
+            TypeError:
+                If `label` or `expr` is not a str, or if `index` is not an int.
+            IndexError:
+                If `index` is out of range for `label`.
+            UnregisteredLabelError:
+                If `label` or any label in `expr` is not registered.
+
+        Examples:
+            >>> tg = Triggon.from_labels({"db_slow": None, "cache_down": None, "degraded": 1})
+            >>> tg.derive("degraded", "db_slow or cache_down")
+            >>> tg.set_trigger("cache_down")
+            >>> tg.is_triggered("degraded")
+            True
+        """
+
+        check_str_sequence(arg_name="label", args=label, allow_multi=False)
+        check_str_sequence(arg_name="expr", args=expr, allow_multi=False)
+        check_idxs(index, allow_multi=False)
+        check_bool(arg_name="propagate", arg=propagate)
+
+        scope, callsite = self._get_caller_scope()
+        flips = self.add_derived_label(label, index, expr)
+        self.apply_derived_flips(flips, scope.f_globals, scope.file, callsite, propagate)
+
     def set_trigger(
         self,
         labels: LabelArg | None = None,
@@ -320,11 +489,15 @@ class Triggon(_Core, _Internal):
         cond: str = "",
         after: int | float = 0,
         reschedule: bool = False,
+        prewarm: int | float = 0,
+        propagate: bool = False,
     ) -> None:
         """Activate labels.
 
         If an applied value is deferred by `TrigFunc`, it is executed
-        during the update, and its result is used.
+        during the update, and its result is used. With `prewarm`, it is
+        executed in the background before the scheduled activation instead,
+        and the staged result is assigned when the labels become active.
 
         Args:
             labels (str | Sequence[str], optional):
@@ -348,12 +521,23 @@ class Triggon(_Core, _Internal):
             reschedule (bool, optional):
                 If True, replace any existing scheduled trigger for the same
                 labels.
+            prewarm (int | float, optional):
+                Seconds before the scheduled activation at which deferred
+                values of the labels are executed. Requires `after`. Each
+                deferred value is executed once, and all refs of its label
+                receive that one result instead of executing it per ref. If
+                the execution fails, the value is executed again on activation.
+            propagate (bool, optional):
+                If True, update the refs of the labels registered from every
+                module, not only those of the caller's file. Refs are updated
+                in one pass grouped by module. Refs of unloaded modules are
+                skipped.
 
         Raises:
             InvalidArgumentError:
                 If no labels are specified when `all` is False, or if any
-                argument is invalid, or if `cond` uses an unsupported
-                expression.
+                argument is invalid, if `cond` uses an unsupported
+                expression, or if `prewarm` is given without `after`.
             IndexError:
                 If any resolved index is out of range for its label.
             NameError:
@@ -364,6 +548,24 @@ class Triggon(_Core, _Internal):
                 If any given label is not registered.
         """
 
+        scope, callsite = self._get_caller_scope()
+        self._set_trigger(
+            scope, callsite, labels, indices, all, cond, after, reschedule, prewarm, propagate
+        )
+
+    def _set_trigger(
+        self,
+        scope: TargetScope,
+        callsite: Callsite | None,
+        labels: LabelArg | None,
+        indices: IndexArg | None,
+        all: bool,
+        cond: str,
+        after: int | float,
+        reschedule: bool,
+        prewarm: int | float,
+        propagate: bool,
+    ) -> None:
         if not all:
             if labels is None:
                 raise InvalidArgumentError("no labels specified")
@@ -371,18 +573,32 @@ class Triggon(_Core, _Internal):
             check_str_sequence(arg_name="labels", args=labels)
             labels_iter = labels
         else:
-            labels_iter = self._new_values.keys()
+            # derived labels follow their inputs
+            labels_iter = [label for label in self._new_values if not self.is_derived(label)]
 
         check_idxs(indices)
         check_bool(arg_name="all", arg=all)
         check_cond(cond)
         check_after(after)
         check_bool(arg_name="reschedule", arg=reschedule)
+        check_prewarm(prewarm, after)
+        check_bool(arg_name="propagate", arg=propagate)
 
         labels, indices = self.resolve_labels_and_idxs(labels_iter, indices)
+        self.ensure_not_derived(labels)
 
         label_to_idx = to_dict(labels, indices)
-        self.set_label_flags(label_to_idx, cond, after, reschedule, set_true=True)
+        self.set_label_flags(
+            label_to_idx,
+            cond,
+            after,
+            reschedule,
+            set_true=True,
+            scope=scope,
+            callsite=callsite,
+            prewarm=prewarm,
+            propagate=propagate,
+        )
 
     def is_triggered(self, *labels: LabelArg, match_all: bool = True) -> bool:
         """Return whether labels are active.
@@ -480,13 +696,401 @@ class Triggon(_Core, _Internal):
         assert idx is not None
         new_value = self._new_values[target_label][idx]
 
-        if hasattr(new_value, TRIGFUNC_ATTR):
+        if hasattr(new_value, DEFERRED_ATTR):
             new_value = new_value._run()
         if debug_on:
             self.store_debug_state(original_val, new_value, target_label, idx)
 
         return new_value
 
+    def attr(
+        self,
+        labels: LabelArg,
+        /,
+        default: Any = None,
+        *,
+        indices: IndexArg | None = None,
+    ) -> SwitchAttr:
+        """Return a descriptor that switches a class attribute by labels.
+
+        Use the result in a class body instead of registering the attribute
+        of every instance. Reading the attribute from an instance returns
+        the value of the first active label, or `default` when no label is
+        active. The labels are resolved once here, so each read only checks
+        the label flags. If the value is deferred by `TrigFunc`, it is
+        executed on every read.
+
+        Assigning the attribute on an instance stores a plain instance
+        attribute, which takes precedence over the switched value.
+
+        Args:
+            labels (str | Sequence[str]):
+                Labels used to select the value. If multiple labels are
+                active, the first active label after normalization is used.
+                If a label starts with `*`, the number of leading `*`
+                characters is treated as its index.
+            default (Any, optional):
+                The value returned when none of the labels is active.
+                Defaults to None.
+            indices (int | Sequence[int], optional):
+                The indices of the values to use for each label. When
+                provided, the number of indices must match the number of
+                labels. These explicit values take precedence over any `*`
+                prefix in `labels`.
+
+        Returns:
+            SwitchAttr: A non-data descriptor bound to this instance.
+
+        Raises:
+            InvalidArgumentError:
+                If `labels` or `indices` are invalid.
+            IndexError:
+                If any resolved index is out of range for its label.
+            UnregisteredLabelError:
+                If any given label is not registered.
+
+        Examples:
+            >>> tg = Triggon.from_label("fast", new_values=0.01)
+            >>> class Connection:
+            ...     timeout = tg.attr("fast", default=5.0)
+            >>> tg.set_trigger("fast")
+            >>> Connection().timeout
+            0.01
+        """
+
+        check_str_sequence(arg_name="labels", args=labels)
+        check_idxs(indices)
+
+        labels, indices = self.resolve_labels_and_idxs(labels, indices)
+        return SwitchAttr(self, tuple(zip(labels, indices)), default)
+
+    def compile_switches(self, spec: SwitchSpec, /) -> SwitchBatch:
+        """Validate a `switch_many()` spec once for repeated use.
+
+        Args:
+            spec (Mapping[Hashable, tuple] | Sequence[tuple]):
+                See `switch_many()`.
+
+        Returns:
+            SwitchBatch: The validated batch, which `switch_many()` resolves
+            without validating its items again.
+
+        Raises:
+            InvalidArgumentError:
+                If an item is not a 2- or 3-tuple, or if its labels or
+                indices are invalid.
+            TypeError:
+                If `spec` is not a mapping or sequence.
+            IndexError:
+                If any resolved index is out of range for its label.
+            UnregisteredLabelError:
+                If any given label is not registered.
+        """
+
+        if isinstance(spec, Mapping):
+            keys: tuple[Hashable, ...] | None = tuple(spec)
+            raw_items = tuple(spec.values())
+        elif isinstance(spec, Sequence) and not isinstance(spec, str):
+            keys = None
+            raw_items = tuple(spec)
+        else:
+            raise TypeError(f"spec must be Mapping or Sequence, got {type(spec).__name__}")
+
+        items = []
+        for pos, item in enumerate(raw_items):
+            where = repr(keys[pos]) if keys is not None else str(pos)
+            if not isinstance(item, (tuple, list)) or len(item) not in (2, 3):
+                raise InvalidArgumentError(
+                    f"spec[{where}] must be (labels, original_val[, indices]), got {item!r}"
+                )
+
+            labels, original_val, *rest = item
+            indices = rest[0] if rest else None
+            check_str_sequence(arg_name="labels", args=labels)
+            check_idxs(indices)
+
+            labels, indices = self.resolve_labels_and_idxs(labels, indices)
+            items.append((tuple(zip(labels, indices)), original_val))
+
+        return SwitchBatch(self, keys, tuple(items))
+
+    def switch_many(
+        self, spec: SwitchSpec | SwitchBatch, /
+    ) -> dict[Hashable, Any] | tuple[Any, ...]:
+        """Resolve many `switch_lit()` calls against one state of the labels.
+
+        The flags of all labels in the batch are read at once under the
+        instance lock, so a label toggled by another thread cannot apply
+        to only part of the results. Deferred values are executed after
+        the flags are read. Debug values are not stored for batch items.
+
+        Args:
+            spec (Mapping[Hashable, tuple] | Sequence[tuple] | SwitchBatch):
+                Items of the form `(labels, original_val)` or
+                `(labels, original_val, indices)`, with the same meaning as
+                the arguments of `switch_lit()`. Pass the result of
+                `compile_switches()` to skip validation on repeated calls.
+
+        Returns:
+            dict[Hashable, Any] | tuple[Any, ...]: The switched values, as a
+            dict with the same keys for a mapping spec, or as a tuple in
+            item order for a sequence spec.
+
+        Raises:
+            InvalidArgumentError:
+                If an item is invalid, or if a batch was compiled by another
+                instance.
+            TypeError:
+                If `spec` is not a mapping, sequence, or `SwitchBatch`.
+            IndexError:
+                If any resolved index is out of range for its label.
+            UnregisteredLabelError:
+                If any given label is not registered.
+
+        Examples:
+            >>> tg = Triggon.from_labels({"debug": (10, "verbose")})
+            >>> batch = tg.compile_switches({
+            ...     "retries": ("debug", 3),
+            ...     "level": ("debug", "info", 1),
+            ... })
+            >>> tg.set_trigger("debug")
+            >>> tg.switch_many(batch)
+            {'retries': 10, 'level': 'verbose'}
+        """
+
+        if isinstance(spec, SwitchBatch):
+            if spec._tg is not self:
+                raise InvalidArgumentError("spec was compiled by another Triggon instance")
+            return spec.resolve()
+
+        return self.compile_switches(spec).resolve()
+
+    def switch_array(
+        self,
+        labels: LabelArg,
+        /,
+        choices: Any,
+        originals: Any,
+        *,
+        indices: IndexArg | None = None,
+    ) -> Any:
+        """Select a label value or the original value for every array element.
+
+        Works like `switch_lit()` applied per element, but in vectorized
+        NumPy passes against one state of the labels, so the cost does not
+        grow with a Python loop over the elements. Requires NumPy.
+
+        Args:
+            labels (str | Sequence[str]):
+                The candidate labels. If a label starts with `*`, the number
+                of leading `*` characters is treated as its index.
+            choices (array-like):
+                Either an integer array of label ids, where `k` selects the
+                k-th label and a negative id selects the original value, or
+                a boolean array of one mask per label, stacked on the first
+                axis, where the first active label whose mask is True is
+                used. Elements whose chosen label is inactive keep the
+                original value.
+            originals (array-like):
+                The original values, broadcast against `choices`.
+            indices (int | Sequence[int], optional):
+                The indices of the values to use for each label. When
+                provided, the number of indices must match the number of
+                labels.
+
+        Returns:
+            numpy.ndarray: A new array of the selected values. Label values
+            may be scalars or arrays broadcast against the elements.
+
+        Raises:
+            ImportError:
+                If NumPy is not installed.
+            InvalidArgumentError:
+                If `labels` or `indices` are invalid, if a label id is out of
+                range, or if the number of masks does not match the labels.
+            TypeError:
+                If `choices` is neither an integer nor a boolean array.
+            IndexError:
+                If any resolved index is out of range for its label.
+            UnregisteredLabelError:
+                If any given label is not registered.
+
+        Examples:
+            >>> tg = Triggon.from_labels({"premium": 0.2, "trial": 0.05})
+            >>> tg.set_trigger("premium")
+            >>> tg.switch_array(["premium", "trial"], np.array([0, 1, -1]), 0.1)
+            array([0.2, 0.1, 0.1])
+        """
+
+        check_str_sequence(arg_name="labels", args=labels)
+        check_idxs(indices)
+
+        labels, indices = self.resolve_labels_and_idxs(labels, indices)
+
+        with self._lock:
+            active = [self._label_is_active[label] for label in labels]
+
+        values = []
+        for is_active, label, idx in zip(active, labels, indices):
+            if not is_active:
+                values.append(_NO_VALUE)
+                continue
+            value = self._new_values[label][idx]
+            if hasattr(value, DEFERRED_ATTR):
+                value = value._run()
+            values.append(value)
+
+        return select_array(values, choices, originals)
+
+    def switch_stream(
+        self,
+        labels: LabelArg,
+        iterable: Iterable[Any],
+        /,
+        default: Callable[[Any], Any] | None = None,
+        *,
+        indices: IndexArg | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Any]:
+        """Lazily transform items with the value of the active label.
+
+        The value of the first active label must be a callable, which is
+        applied to each item. Items are read in chunks of `chunk_size`, and
+        the label flags are read once per chunk, so a label activated or
+        deactivated while iterating takes effect at the next chunk boundary.
+        If the value is deferred by `TrigFunc`, it is executed once per chunk
+        and its result is used as the transform.
+
+        Args:
+            labels (str | Sequence[str]):
+                Labels whose values are the transforms. If multiple labels
+                are active, the first active label after normalization is
+                used. If a label starts with `*`, the number of leading `*`
+                characters is treated as its index.
+            iterable (Iterable[Any]):
+                The items to transform.
+            default (Callable[[Any], Any] | None, optional):
+                The transform used when no label is active. If None, items
+                are yielded unchanged. Defaults to None.
+            indices (int | Sequence[int], optional):
+                The indices of the values to use for each label. When
+                provided, the number of indices must match the number of
+                labels.
+            chunk_size (int, optional):
+                The number of items read per state snapshot. Defaults to 256.
+
+        Returns:
+            Iterator[Any]: The transformed items, in order.
+
+        Raises:
+            InvalidArgumentError:
+                If `labels` or `indices` are invalid, or if `chunk_size` is
+                not positive.
+            TypeError:
+                If `default` is not callable or None, or when iterating, if
+                the value of the active label is not callable.
+            IndexError:
+                If any resolved index is out of range for its label.
+            UnregisteredLabelError:
+                If any given label is not registered.
+
+        Examples:
+            >>> tg = Triggon.from_label("mask", new_values=lambda r: {**r, "email": "***"})
+            >>> tg.set_trigger("mask")
+            >>> list(tg.switch_stream("mask", [{"email": "a@b.c"}]))
+            [{'email': '***'}]
+        """
+
+        check_str_sequence(arg_name="labels", args=labels)
+        check_idxs(indices)
+        check_positive_int(chunk_size, arg_name="chunk_size")
+        if default is not None and not callable(default):
+            raise TypeError(f"default must be callable or None, got {type(default).__name__}")
+
+        labels, indices = self.resolve_labels_and_idxs(labels, indices)
+        return stream_chunks(self, tuple(zip(labels, indices)), iterable, default, chunk_size)
+
+    def switch_table(
+        self,
+        rules: Mapping[str | Collection[str], Any],
+        /,
+        default: Any = None,
+    ) -> SwitchTable:
+        """Return a table that selects a value by the combination of active labels.
+
+        Each rule is a label, a label prefixed with `!` that must be inactive,
+        or a collection of such terms that must all hold. Call `resolve()`
+        on the result to get the value of the first matching rule in the
+        order of `rules`. The rule matching each combination of the involved
+        labels is found once and stored, so later resolution costs one
+        bitmask computation and a dict lookup.
+
+        Args:
+            rules (Mapping[str | Collection[str], Any]):
+                Rules mapped to their values, such as
+                `{frozenset({"dev", "fast"}): 1, ("prod", "!canary"): 2}`.
+                An empty collection matches any combination. Values deferred
+                by `TrigFunc` are executed on every resolution.
+            default (Any, optional):
+                The value when no rule matches. Defaults to None.
+
+        Returns:
+            SwitchTable: The compiled table bound to this instance.
+
+        Raises:
+            InvalidArgumentError:
+                If `rules` is empty, if a label is invalid or starts with
+                `*`, or if a rule requires a label to be both active and
+                inactive.
+            TypeError:
+                If `rules` is not a mapping, or if a rule is not a str or a
+                collection of str.
+            UnregisteredLabelError:
+                If any given label is not registered.
+
+        Examples:
+            >>> tg = Triggon.from_labels({"dev": None, "fast": None, "prod": None})
+            >>> table = tg.switch_table(
+            ...     {("dev", "fast"): "dev-fast", "dev": "dev", ("prod", "!fast"): "prod"},
+            ...     default="off",
+            ... )
+            >>> tg.set_trigger(["dev", "fast"])
+            >>> table.resolve()
+            'dev-fast'
+        """
+
+        if not isinstance(rules, Mapping):
+            raise TypeError(f"rules must be Mapping, got {type(rules).__name__}")
+        if not rules:
+            raise InvalidArgumentError("rules must not be empty")
+
+        bits: dict[str, int] = {}
+        compiled = []
+        for rule in rules:
+            terms = (rule,) if isinstance(rule, str) else rule
+            if not isinstance(terms, Collection) or not all(isinstance(t, str) for t in terms):
+                raise TypeError(f"each rule must be str or a collection of str, got {rule!r}")
+
+            required = forbidden = 0
+            for term in terms:
+                negated = term.startswith(NEGATION)
+                label = term[1:] if negated else term
+                labels, _ = self.resolve_labels_and_idxs(label, idxs=None, allow_symbol=False)
+
+                bit = 1 << bits.setdefault(labels[0], len(bits))
+                if negated:
+                    forbidden |= bit
+                else:
+                    required |= bit
+
+            if required & forbidden:
+                raise InvalidArgumentError(
+                    f"rule {rule!r} requires a label to be both active and inactive"
+                )
+            compiled.append((required, forbidden))
+
+        return SwitchTable(self, tuple(bits), tuple(compiled), tuple(rules.values()), default)
+
     def register_ref(
         self,
         label: str,
@@ -494,6 +1098,7 @@ class Triggon(_Core, _Internal):
         name: str,
         *,
         index: int | None = None,
+        lazy: bool = False,
     ) -> None:
         """Register a variable or attribute for a label.
 
@@ -501,6 +1106,12 @@ class Triggon(_Core, _Internal):
         target is updated immediately. If the applied value is deferred by
         `TrigFunc`, it is executed and its result is used.
 
+        With `lazy`, a global variable is replaced by a `LazyRef` proxy
+        instead. Activating or deactivating labels then writes nothing; the
+        proxy resolves the value of the first active label on access and
+        caches it until a label flag flips. Do not also register the same
+        name eagerly, since an eager update replaces the proxy.
+
         Args:
             label (str):
                 The label to associate with the variable or attribute. If the
@@ -513,11 +1124,15 @@ class Triggon(_Core, _Internal):
                 The index of the value to use from the given label. This
                 selects which indexed value is applied if the target is
                 registered while the label is already active.
+            lazy (bool, optional):
+                If True, replace the global variable with a proxy that resolves
+                the label value on access. Attribute paths are not supported.
 
         Raises:
             InvalidArgumentError:
                 If `name` starts from a local variable, if the attribute path is
-                invalid, or if `index` is invalid.
+                invalid, if `index` is invalid, or if `lazy` is given with an
+                attribute path.
             IndexError:
                 If the resolved index is out of range for the label.
             NameError:
@@ -526,14 +1141,31 @@ class Triggon(_Core, _Internal):
                 If any given label is not registered.
         """
 
+        scope, callsite = self._get_caller_scope()
+        self._register_ref(scope, callsite, label, name, index, lazy)
+
+    def _register_ref(
+        self,
+        scope: TargetScope,
+        callsite: Callsite | None,
+        label: str,
+        name: str,
+        index: int | None,
+        lazy: bool,
+    ) -> None:
         check_str_sequence(arg_name="label", args=label, allow_multi=False)
         check_str_sequence(arg_name="name", args=name, allow_multi=False)
         check_idxs(index)
+        check_bool(arg_name="lazy", arg=lazy)
 
         label_tup, index_tup = self.resolve_labels_and_idxs(label, index)
 
+        if lazy:
+            self.register_lazy_ref(label_tup[0], index_tup[0], name, scope, callsite)
+            return
+
         label_to_refs = {label_tup[0]: {name: index_tup[0]}}
-        self.register_target_refs(label_to_refs)
+        self.register_target_refs(label_to_refs, scope, callsite)
 
     def register_refs(self, label_to_refs: LabelToRefs, /) -> None:
         """Register multiple variables or attributes at once.
@@ -561,6 +1193,15 @@ class Triggon(_Core, _Internal):
                 If any given label is not registered.
         """
 
+        scope, callsite = self._get_caller_scope()
+        self._register_refs(scope, callsite, label_to_refs)
+
+    def _register_refs(
+        self,
+        scope: TargetScope,
+        callsite: Callsite | None,
+        label_to_refs: LabelToRefs,
+    ) -> None:
         check_items(arg_name="label_to_refs", arg=label_to_refs)
 
         for label, refs in label_to_refs.items():
@@ -568,7 +1209,7 @@ class Triggon(_Core, _Internal):
             for i in refs.values():
                 self.validate_idx_range(label, i)
 
-        self.register_target_refs(label_to_refs)
+        self.register_target_refs(label_to_refs, scope, callsite)
 
     def is_registered(
         self,
@@ -603,6 +1244,16 @@ class Triggon(_Core, _Internal):
                 If `label` is given but is not registered.
         """
 
+        scope, _ = self._get_caller_scope()
+        return self._is_registered(scope, names, label, match_all)
+
+    def _is_registered(
+        self,
+        scope: TargetScope,
+        names: tuple[NameArg, ...],
+        label: str | None,
+        match_all: bool,
+    ) -> bool:
         unwrapped_names = unwrap_value(names)
         if isinstance(unwrapped_names, str):
             unwrapped_names = (unwrapped_names,)
@@ -613,10 +1264,8 @@ class Triggon(_Core, _Internal):
             self.resolve_labels_and_idxs(label, idxs=None, allow_symbol=False)
         check_bool(arg_name="match_all", arg=match_all)
 
-        frame = get_target_frame()
-        callsite = get_callsite(frame)
-
-        target_ids = self.get_ids_by_file(callsite.file)
+        self.purge_dead_refs()
+        target_ids = self.get_ids_by_file(scope.file)
         target_var_refs, target_attr_refs = self.get_refs(label)
 
         if match_all:
@@ -626,8 +1275,8 @@ class Triggon(_Core, _Internal):
                     target_ids,
                     target_var_refs,
                     target_attr_refs,
-                    callsite.scope_name,
-                )
+                    scope.scope_name,
+                ) or self.is_lazy_registered(name, label, scope.f_globals)
                 if not registered:
                     return False
             return True
@@ -639,8 +1288,8 @@ class Triggon(_Core, _Internal):
                 target_ids,
                 target_var_refs,
                 target_attr_refs,
-                callsite.scope_name,
-            )
+                scope.scope_name,
+            ) or self.is_lazy_registered(name, label, scope.f_globals)
             if registered:
                 return True
         return False
@@ -669,6 +1318,16 @@ class Triggon(_Core, _Internal):
                 If any given label is not registered.
         """
 
+        scope, callsite = self._get_caller_scope()
+        self._unregister_refs(scope, callsite, names, labels)
+
+    def _unregister_refs(
+        self,
+        scope: TargetScope,
+        callsite: Callsite | None,
+        names: NameArg,
+        labels: LabelArg | None,
+    ) -> None:
         check_str_sequence(arg_name="names", args=names)
 
         if labels is not None:
@@ -680,13 +1339,13 @@ class Triggon(_Core, _Internal):
         if isinstance(names, str):
             names = (names,)
 
-        frame = get_target_frame()
-        callsite = get_callsite(frame)
-        target_ids = self.get_ids_by_file(callsite.file)
+        target_ids = self.get_ids_by_file(scope.file)
 
         for label in labels:
             with self._lock:
-                self.unregister_target_refs(label, names, target_ids, callsite)
+                self.unregister_target_refs(label, names, target_ids, scope.scope_name, callsite)
+
+        self.unregister_lazy_refs(names, labels, scope.f_globals, callsite)
 
     def revert(
         self,
@@ -698,6 +1357,7 @@ class Triggon(_Core, _Internal):
         cond: str = "",
         after: int | float = 0,
         reschedule: bool = False,
+        propagate: bool = False,
     ) -> None:
         """Deactivate labels.
 
@@ -720,6 +1380,9 @@ class Triggon(_Core, _Internal):
             reschedule (bool, optional):
                 If True, replace any existing scheduled revert for the same
                 labels.
+            propagate (bool, optional):
+                If True, restore the refs of the labels registered from every
+                module, not only those of the caller's file.
 
         Raises:
             InvalidArgumentError:
@@ -734,20 +1397,37 @@ class Triggon(_Core, _Internal):
                 If any given label is not registered.
         """
 
+        scope, callsite = self._get_caller_scope()
+        self._revert(scope, callsite, labels, all, disable, cond, after, reschedule, propagate)
+
+    def _revert(
+        self,
+        scope: TargetScope,
+        callsite: Callsite | None,
+        labels: LabelArg | None,
+        all: bool,
+        disable: bool,
+        cond: str,
+        after: int | float,
+        reschedule: bool,
+        propagate: bool,
+    ) -> None:
         if not all:
             if labels is None:
                 raise InvalidArgumentError("no labels specified")
 
             check_str_sequence(arg_name="labels", args=labels)
             labels_iter, _ = self.resolve_labels_and_idxs(labels, idxs=None, allow_symbol=False)
+            self.ensure_not_derived(labels_iter)
         else:
-            labels_iter = self._new_values.keys()
+            labels_iter = [label for label in self._new_values if not self.is_derived(label)]
 
         check_bool(arg_name="all", arg=all)
         check_bool(arg_name="disable", arg=disable)
         check_cond(cond)
         check_after(after)
         check_bool(arg_name="reschedule", arg=reschedule)
+        check_bool(arg_name="propagate", arg=propagate)
 
         label_to_idx = to_dict(labels_iter, values=None)
         self.set_label_flags(
@@ -756,17 +1436,31 @@ class Triggon(_Core, _Internal):
             after,
             reschedule,
             set_true=False,
+            scope=scope,
+            callsite=callsite,
             disable=disable,
+            propagate=propagate,
         )
 
     @staticmethod
     @contextmanager
-    def rollback(targets: NameArg | None = None) -> Iterator[None]:
+    def rollback(
+        targets: NameArg | None = None,
+        *,
+        discover: DiscoverMode = "source",
+        track_mutations: bool = False,
+    ) -> Iterator[None]:
         """Temporarily mutate names and restore their original values on exit.
 
         The original values are restored when leaving the context, even if an
         exception is raised inside it.
 
+        With `track_mutations=True`, targets bound to a plain `dict`, `list`,
+        or `set` are shallow-copied on entry, and only the keys and elements
+        that differ from the copy are written back on exit. The container
+        itself is not replaced, so changes made through any reference to it
+        are restored. Changes inside nested containers are not.
+
         Args:
             targets (str | Sequence[str] | None):
                 Names to restore when leaving the context. Each name may be a
@@ -774,14 +1468,25 @@ class Triggon(_Core, _Internal):
                 omitted, assignment targets inside the `with` block are
                 collected automatically. Undefined names and unsupported
                 targets are ignored.
+            discover (str, optional):
+                How assignment targets are collected when `targets` is
+                omitted. `"source"` parses the caller's source file, and
+                `"bytecode"` analyses the compiled code of the caller, which
+                works without `.py` files. Defaults to `"source"`.
+            track_mutations (bool, optional):
+                If True, in-place changes to container targets are undone on
+                exit. With `discover="source"`, containers changed by
+                subscript assignments or mutating method calls are also
+                collected. Defaults to False.
 
         Raises:
             RollbackNotSupportedError:
                 If the current runtime is earlier than CPython 3.13.
             RollbackSourceError:
-                If the caller's source file cannot be found.
+                If `discover` is `"source"`, `targets` is omitted, and the
+                caller's source file cannot be found.
             InvalidArgumentError:
-                If `targets` is empty.
+                If `targets` is empty or `discover` is not a valid mode.
             AttributeError:
                 If a given attribute path cannot be resolved.
             UpdateError:
@@ -795,18 +1500,116 @@ class Triggon(_Core, _Internal):
             check_str_sequence(arg_name="targets", args=targets)
             if isinstance(targets, str):
                 targets = (targets,)
+        check_discover(discover)
+        check_bool(arg_name="track_mutations", arg=track_mutations)
 
         # Add 1 to depth to account for @contextmanager
         frame = get_target_frame(depth=2)
-        name_to_refs = collect_rollback_refs(frame, targets)
+        scope = get_target_scope(frame)
+        name_to_refs = collect_rollback_refs(scope, frame, targets, discover, track_mutations)
+        snapshots = snapshot_targets(name_to_refs) if track_mutations else []
 
         try:
             yield
         finally:
-            revert_targets(frame, name_to_refs)
+            try:
+                restore_snapshots(snapshots)
+            finally:
+                revert_targets(scope, name_to_refs)
 
-    @contextmanager
-    def capture_return(self) -> Iterator[EarlyReturnResult]:
+    @staticmethod
+    def rollback_func[F: Callable[..., Any]](
+        targets: NameArg | None = None,
+    ) -> Callable[[F], F]:
+        """Restore names mutated by a function each time it returns.
+
+        Unlike `rollback()`, the targets are analysed once when the function
+        is decorated. Each call only snapshots their values and restores them
+        when the function returns or raises. Coroutine functions are
+        restored when the awaited call finishes.
+
+        Args:
+            targets (str | Sequence[str] | None):
+                Names to restore after each call. Each name may be a global
+                or closure variable, or an attribute path rooted at one, such
+                as `config.value`. If omitted, the global names, closure
+                variables, and attribute paths assigned in the function body
+                are collected from its bytecode. Names that are undefined when
+                the function is called are ignored.
+
+        Returns:
+            Callable: A decorator that wraps the function.
+
+        Raises:
+            InvalidArgumentError:
+                If `targets` is empty or names a local variable of the
+                function.
+            TypeError:
+                If the decorated object is not a Python function.
+            UpdateError:
+                If a target cannot be restored after a call.
+
+        Examples:
+            >>> @Triggon.rollback_func()
+            ... def run_experiment():
+            ...     global RETRIES
+            ...     RETRIES = 10
+            ...     config.mode = "fast"
+        """
+
+        if targets is not None:
+            check_str_sequence(arg_name="targets", args=targets)
+            if isinstance(targets, str):
+                targets = (targets,)
+
+        def decorator(func: F) -> F:
+            if not inspect.isfunction(func):
+                raise TypeError(f"rollback_func() expected a function, got {type(func).__name__}")
+
+            plan = RollbackPlan(func, targets)
+
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    with RollbackContext(plan):
+                        return await func(*args, **kwargs)
+
+                return cast(F, async_wrapper)
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                with RollbackContext(plan):
+                    return func(*args, **kwargs)
+
+            return cast(F, wrapper)
+
+        return decorator
+
+    def sandbox(self) -> Sandbox:
+        """Return a context that isolates changes made to this instance.
+
+        On entry, label flags and scheduled timers are recorded, and each
+        registered variable or attribute records its value the first time
+        it is switched inside the context. On exit, only those targets and
+        the flags that changed are restored, so the cost follows the number
+        of changes rather than of registered refs. Timers started inside the
+        context are cancelled, and labels and refs added inside it are
+        removed. Values assigned to targets directly, without this instance,
+        and work queued with `submit_when()` are not affected.
+
+        Returns:
+            Sandbox: A context manager that yields this instance.
+
+        Examples:
+            >>> with tg.sandbox():
+            ...     tg.set_trigger("debug")
+            ...     run_checks()
+        """
+
+        return Sandbox(self)
+
+    def capture_return(self) -> ReturnCapture:
         """Capture an early return triggered by `trigger_return()`.
 
         `trigger_return()` is active only inside this context. If it is
@@ -814,26 +1617,17 @@ class Triggon(_Core, _Internal):
         and the captured value. If the captured value is deferred by
         `TrigFunc`, it is executed and its result is stored.
 
-        Yields:
-            EarlyReturnResult: The result object for the captured return.
-        """
-
-        # Initialize the default return value to None
-        self._return_val_stack.append(None)
-        result = EarlyReturnResult()
+        The returned context manager is shared by every call on this
+        instance and can be entered repeatedly and nested. Captures are
+        tracked per thread and per asyncio task, so `trigger_return()`
+        only returns to a capture entered in the same thread or task.
 
-        try:
-            yield result
-        except _EarlyReturn:
-            result.triggered = True
+        Returns:
+            ReturnCapture: A context manager that yields the `EarlyReturnResult`
+            for the captured return.
+        """
 
-            value = self._return_val_stack[-1]
-            if value is not None and hasattr(value, TRIGFUNC_ATTR):
-                result.value = value._run()
-            else:
-                result.value = value
-        finally:
-            self._return_val_stack.pop()
+        return self._return_capture
 
     def trigger_return(
         self,
@@ -858,7 +1652,8 @@ class Triggon(_Core, _Internal):
 
         Raises:
             InactiveCaptureError:
-                If `capture_return()` is not active.
+                If `capture_return()` is not active in the current thread
+                or task.
             InvalidArgumentError:
                 If `labels` is invalid, or if any label starts
                 with `*`.
@@ -866,7 +1661,8 @@ class Triggon(_Core, _Internal):
                 If any given label is not registered.
         """
 
-        if not self._return_val_stack:
+        slot = self._return_capture.find_slot()
+        if slot is None:
             raise InactiveCaptureError()
 
         check_str_sequence("labels", labels)
@@ -883,49 +1679,165 @@ class Triggon(_Core, _Internal):
         if target_label is None:
             return
 
-        self._return_val_stack[-1] = value
+        slot.value = value
 
         if self.debug[LOG_VERBOSITY] != 0:
             frame = get_target_frame()
             callsite = get_callsite(frame)
             self.log_early_return(target_label, value, callsite)
 
-        raise _EarlyReturn
+        raise _EarlyReturn(slot)
+
+    def short_circuit[F: Callable[..., Any]](
+        self,
+        labels: LabelArg,
+        /,
+        *,
+        value: Any = None,
+    ) -> Callable[[F], F]:
+        """Return `value` instead of calling the function while a label is active.
+
+        The labels are checked before the decorated function is entered, so
+        no exception is raised and no context is entered when the function
+        is skipped. Unlike `trigger_return()`, this does not need
+        `capture_return()`. Coroutine functions are supported; the value is
+        returned when the coroutine is awaited.
+
+        Args:
+            labels (str | Sequence[str]):
+                Labels to check before each call. Labels must not start
+                with `*`.
+            value (Any, optional):
+                The value returned while an active label is found. If it is
+                deferred by `TrigFunc`, it is executed on each skipped call
+                and its result is returned.
+
+        Returns:
+            Callable: A decorator that wraps the function.
+
+        Raises:
+            InvalidArgumentError:
+                If `labels` is invalid, or if any label starts with `*`.
+            UnregisteredLabelError:
+                If any given label is not registered.
+            TypeError:
+                If the decorated object is not callable.
+
+        Examples:
+            >>> @tg.short_circuit("maintenance", value={"status": 503})
+            ... def handle(request):
+            ...     ...
+        """
+
+        check_str_sequence("labels", labels)
+        labels, _ = self.resolve_labels_and_idxs(labels, idxs=None, allow_symbol=False)
+
+        def decorator(func: F) -> F:
+            if not callable(func):
+                raise TypeError(f"short_circuit() expected a callable, got {type(func).__name__}")
+
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                    for label in labels:
+                        if self._label_is_active[label]:
+                            return self._short_circuit_value(label, value)
+                    return await func(*args, **kwargs)
+
+                return cast(F, async_wrapper)
+
+            @functools.wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                for label in labels:
+                    if self._label_is_active[label]:
+                        return self._short_circuit_value(label, value)
+                return func(*args, **kwargs)
+
+            return cast(F, wrapper)
+
+        return decorator
+
+    def _short_circuit_value(self, label: str, value: Any) -> Any:
+        if self.debug[LOG_VERBOSITY] != 0:
+            # Add 1 to depth to account for the wrapper
+            frame = get_target_frame(depth=2)
+            callsite = get_callsite(frame)
+            frame = None
+            self.log_early_return(label, value, callsite)
+
+        if value is not None and hasattr(value, DEFERRED_ATTR):
+            return value._run()
+        return value
 
     def trigger_call(
         self,
         labels: LabelArg,
         /,
         target: TrigFunc,
+        *,
+        rate: int | float | None = None,
+        burst: int = 1,
+        fallback: Any = None,
+        executor: Executor | None = None,
     ) -> Any:
         """Run a target deferred by `TrigFunc` when one of the labels is active.
 
+        When `rate` is given, executions of the same target are limited by a
+        token bucket kept by this instance. Buckets are keyed by the object
+        the chain starts from, its attribute and call path, and the limits,
+        so `f.cache.flush()` built at different callsites on the same `cache`
+        shares one bucket, while other objects or limits get their own. Roots
+        are held weakly where possible, so their buckets go away with them.
+        If the target was created with `TrigFunc(rate=...)`, the `rate` given
+        here replaces that limit for this call.
+
+        When `executor` is given, the target is submitted to it instead of
+        running in the calling thread. For a `ProcessPoolExecutor`, the
+        target is pickled, so its root must be importable and its arguments
+        picklable.
+
         Args:
             labels (str | Sequence[str]):
                 Labels to check before running `target`. Labels must not start
                 with `*`.
             target (TrigFunc):
                 A target deferred by `TrigFunc` to run.
+            rate (int | float | None, optional):
+                Maximum number of executions per second while a label is
+                active. If omitted, only the limit of `target` applies.
+            burst (int, optional):
+                Number of executions allowed back to back before `rate`
+                applies.
+            fallback (Any, optional):
+                The value returned when the execution is throttled.
+            executor (Executor | None, optional):
+                The executor used to run `target`. If omitted, `target` runs
+                in the calling thread.
 
         Returns:
             Any | None:
                 The result of `target._run()` if any of the given labels is active;
-                otherwise, `None`.
+                `fallback` if the execution is throttled; otherwise, `None`.
+                When `executor` is given, a `Future` resolving to the result or
+                to `fallback` is returned instead, unless no label is active.
 
         Raises:
             TypeError:
                 If `target` is not deferred by `TrigFunc`, or if it does not
                 satisfy the call requirements for this method.
             InvalidArgumentError:
-                If `labels` is invalid or any label starts with `*`.
+                If `labels` is invalid, if any label starts with `*`, or if
+                `rate` or `burst` is not positive.
             UnregisteredLabelError:
                 If any given label is not registered.
         """
 
-        if not hasattr(target, TRIGFUNC_ATTR):
+        if not isinstance(target, TrigFunc):
             raise TypeError("target must be deferred by TrigFunc")
 
         check_str_sequence(arg_name="labels", args=labels)
+        check_rate(rate, burst)
         labels, _ = self.resolve_labels_and_idxs(labels, idxs=None, allow_symbol=False)
 
         target_label = None
@@ -936,12 +1848,154 @@ class Triggon(_Core, _Internal):
         if target_label is None:
             return
 
+        assert target._trigcall is not None
+        if rate is None:
+            throttled = False
+        else:
+            root = target._resolve_root()
+            bucket = self._call_buckets.get(root, target._trigcall.path, rate, burst)
+            throttled = not bucket.try_acquire()
+
         if self.debug[LOG_VERBOSITY] != 0:
-            assert target._trigcall is not None
-            target_name = target._trigcall.name
             frame = get_target_frame()
             callsite = get_callsite(frame)
 
-            self.log_trigger_call(target_label, target_name, callsite)
+            self.log_trigger_call(target_label, target, callsite, throttled)
+
+        if executor is not None:
+            if throttled:
+                future = Future()
+                future.set_result(fallback)
+                return future
+            # a rate given here replaces the target's own limit
+            return executor.submit(_run_deferred, target, rate is None)
+
+        if throttled:
+            return fallback
+        return target._run(rate is None)
+
+    def configure_queue(
+        self,
+        label: str,
+        /,
+        *,
+        executor: Executor | None = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        """Configure the work queue used by `submit_when()` for a label.
+
+        Work that is already queued is kept and follows the new settings.
+
+        Args:
+            label (str):
+                The label whose queue is configured. Labels must not start
+                with `*`.
+            executor (Executor | None, optional):
+                The executor that receives queued work when the label becomes
+                active. If omitted, work runs in the thread that activates the
+                label.
+            maxsize (int, optional):
+                Maximum number of queued items. `submit_when()` waits for
+                free space once the queue is full.
+            batch_size (int, optional):
+                Number of items taken from the queue at a time while draining.
+
+        Raises:
+            InvalidArgumentError:
+                If `label` is invalid or starts with `*`, or if `maxsize` or
+                `batch_size` is not positive.
+            UnregisteredLabelError:
+                If `label` is not registered.
+        """
+
+        check_str_sequence(arg_name="label", args=label, allow_multi=False)
+        if executor is not None and not isinstance(executor, Executor):
+            raise TypeError(f"executor must be Executor, got {type(executor).__name__}")
+        check_positive_int(maxsize, arg_name="maxsize")
+        check_positive_int(batch_size, arg_name="batch_size")
+
+        self.resolve_labels_and_idxs(label, idxs=None, allow_symbol=False)
+
+        self.get_work_queue(label).configure(executor, maxsize, batch_size)
+
+    def configure_value_budget(self, max_bytes: int | None, /) -> None:
+        """Set the memory budget for loaded `LazyValue` values.
+
+        Whenever a value is loaded and the total size of loaded values of
+        this instance exceeds `max_bytes`, values used only by inactive
+        labels are evicted, least recently used first. Values of active
+        labels, and of labels with a scheduled activation, are never
+        evicted, so the total may stay above the budget.
+
+        Args:
+            max_bytes (int | None):
+                The budget in bytes. If None, loaded values are kept until
+                the instance is discarded.
+
+        Raises:
+            InvalidArgumentError:
+                If `max_bytes` is negative.
+        """
+
+        if max_bytes is not None:
+            check_non_negative_int(max_bytes, arg_name="max_bytes")
+
+        self._value_budget = max_bytes
+        self.enforce_value_budget()
+
+    def submit_when(
+        self,
+        label: str,
+        /,
+        target: TrigFunc | Callable[[], Any],
+        *,
+        block: bool = True,
+        timeout: int | float | None = None,
+    ) -> Future[Any]:
+        """Queue work that runs once a label becomes active.
+
+        Queued work is drained in batches when the label is activated, into
+        the executor set by `configure_queue()` or, by default, in the thread
+        that activates the label. If the label is already active, the work is
+        dispatched immediately.
+
+        Args:
+            label (str):
+                The label that releases the work. Labels must not start with
+                `*`.
+            target (TrigFunc | Callable[[], Any]):
+                A target deferred by `TrigFunc` or a callable taking no
+                arguments.
+            block (bool, optional):
+                If True, wait for free space when the queue is full. If
+                False, raise `queue.Full` immediately.
+            timeout (int | float | None, optional):
+                Maximum number of seconds to wait for free space. If omitted,
+                wait until space is available.
+
+        Returns:
+            Future[Any]: A future that resolves to the result of `target`.
+
+        Raises:
+            TypeError:
+                If `target` is neither deferred by `TrigFunc` nor callable.
+            InvalidArgumentError:
+                If `label` is invalid or starts with `*`, or if `timeout` is
+                negative.
+            UnregisteredLabelError:
+                If `label` is not registered.
+            queue.Full:
+                If the queue stays full for `timeout` seconds, or is full
+                when `block` is False.
+        """
+
+        check_str_sequence(arg_name="label", args=label, allow_multi=False)
+        if not isinstance(target, TrigFunc) and not callable(target):
+            raise TypeError("target must be deferred by TrigFunc or be callable")
+        check_bool(arg_name="block", arg=block)
+        check_timeout(timeout)
+
+        self.resolve_labels_and_idxs(label, idxs=None, allow_symbol=False)
 
-        return target._run()
+        return self.enqueue_work(label, target, block, timeout)
@@ -1,14 +1,26 @@
-from collections.abc import Iterator, Mapping
+from collections.abc import (
+    Callable,
+    Collection,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    MutableMapping,
+)
+from concurrent.futures import Executor, Future
 from contextlib import contextmanager
 from dataclasses import dataclass
-from typing import Any, Self
+from types import ModuleType, TracebackType
+from typing import Any, Self, overload
 
 from ._internal._types.aliases import (
     DebugArg,
+    DiscoverMode,
     IndexArg,
     LabelArg,
     LabelToRefs,
     NameArg,
+    SwitchSpec,
 )
 
 @dataclass(slots=True)
@@ -16,6 +28,99 @@ class EarlyReturnResult:
     triggered: bool = False
     value: Any = None
 
+class ReturnCapture:
+    def __enter__(self) -> EarlyReturnResult: ...
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> bool: ...
+
+class Sandbox:
+    def __enter__(self) -> Triggon: ...
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None: ...
+
+class LazyRef:
+    def resolve(self) -> Any: ...
+    def __getattr__(self, name: str) -> Any: ...
+    def __call__(self, *args: Any, **kwargs: Any) -> Any: ...
+
+class SwitchAttr:
+    def __set_name__(self, owner: type, name: str) -> None: ...
+    @overload
+    def __get__(self, instance: None, owner: type | None = None) -> Self: ...
+    @overload
+    def __get__(self, instance: object, owner: type | None = None) -> Any: ...
+    @property
+    def labels(self) -> tuple[str, ...]: ...
+    @property
+    def default(self) -> Any: ...
+
+class SwitchTable:
+    def resolve(self) -> Any: ...
+    @property
+    def labels(self) -> tuple[str, ...]: ...
+    @property
+    def default(self) -> Any: ...
+    def __len__(self) -> int: ...
+
+class SwitchBatch:
+    def __len__(self) -> int: ...
+
+class BoundNamespace:
+    @property
+    def namespace(self) -> MutableMapping[str, Any]: ...
+    def set_trigger(
+        self,
+        labels: LabelArg | None = None,
+        /,
+        *,
+        indices: IndexArg | None = None,
+        all: bool = False,
+        cond: str = "",
+        after: int | float = 0,
+        reschedule: bool = False,
+        prewarm: int | float = 0,
+        propagate: bool = False,
+    ) -> None: ...
+    def revert(
+        self,
+        labels: LabelArg | None = None,
+        /,
+        *,
+        all: bool = False,
+        disable: bool = False,
+        cond: str = "",
+        after: int | float = 0,
+        reschedule: bool = False,
+        propagate: bool = False,
+    ) -> None: ...
+    def register_ref(
+        self,
+        label: str,
+        /,
+        name: str,
+        *,
+        index: int | None = None,
+        lazy: bool = False,
+    ) -> None: ...
+    def register_refs(self, label_to_refs: LabelToRefs, /) -> None: ...
+    def is_registered(
+        self,
+        *names: NameArg,
+        label: str | None = None,
+        match_all: bool = True,
+    ) -> bool: ...
+    def unregister_refs(self, names: NameArg, /, *, labels: LabelArg | None = None) -> None: ...
+    @contextmanager
+    def rollback(self, targets: NameArg, *, track_mutations: bool = False) -> Iterator[None]: ...
+
 class Triggon:
     @classmethod
     def from_label(
@@ -33,8 +138,18 @@ class Triggon:
         *,
         debug: DebugArg = False,
     ) -> Self: ...
+    def bind(self, namespace: ModuleType | MutableMapping[str, Any], /) -> BoundNamespace: ...
     def add_label(self, label: str, /, new_values: Any = None) -> None: ...
     def add_labels(self, label_values: Mapping[str, Any], /) -> None: ...
+    def derive(
+        self,
+        label: str,
+        /,
+        expr: str,
+        *,
+        index: int | None = None,
+        propagate: bool = False,
+    ) -> None: ...
     def set_trigger(
         self,
         labels: LabelArg | None = None,
@@ -45,6 +160,8 @@ class Triggon:
         cond: str = "",
         after: int | float = 0,
         reschedule: bool = False,
+        prewarm: int | float = 0,
+        propagate: bool = False,
     ) -> None: ...
     def is_triggered(self, *labels: LabelArg, match_all: bool = True) -> bool: ...
     def switch_lit(
@@ -55,6 +172,43 @@ class Triggon:
         *,
         indices: IndexArg | None = None,
     ) -> Any: ...
+    def attr(
+        self,
+        labels: LabelArg,
+        /,
+        default: Any = None,
+        *,
+        indices: IndexArg | None = None,
+    ) -> SwitchAttr: ...
+    def compile_switches(self, spec: SwitchSpec, /) -> SwitchBatch: ...
+    def switch_many(
+        self, spec: SwitchSpec | SwitchBatch, /
+    ) -> dict[Hashable, Any] | tuple[Any, ...]: ...
+    def switch_array(
+        self,
+        labels: LabelArg,
+        /,
+        choices: Any,
+        originals: Any,
+        *,
+        indices: IndexArg | None = None,
+    ) -> Any: ...
+    def switch_stream(
+        self,
+        labels: LabelArg,
+        iterable: Iterable[Any],
+        /,
+        default: Callable[[Any], Any] | None = None,
+        *,
+        indices: IndexArg | None = None,
+        chunk_size: int = 256,
+    ) -> Iterator[Any]: ...
+    def switch_table(
+        self,
+        rules: Mapping[str | Collection[str], Any],
+        /,
+        default: Any = None,
+    ) -> SwitchTable: ...
     def register_ref(
         self,
         label: str,
@@ -62,6 +216,7 @@ class Triggon:
         name: str,
         *,
         index: int | None = None,
+        lazy: bool = False,
     ) -> None: ...
     def register_refs(self, label_to_refs: LabelToRefs, /) -> None: ...
     def unregister_refs(self, names: NameArg, /, *, labels: LabelArg | None = None) -> None: ...
@@ -81,12 +236,22 @@ class Triggon:
         cond: str = "",
         after: int | float = 0,
         reschedule: bool = False,
+        propagate: bool = False,
     ) -> None: ...
     @staticmethod
     @contextmanager
-    def rollback(targets: NameArg | None = None) -> Iterator[None]: ...
-    @contextmanager
-    def capture_return(self) -> Iterator[EarlyReturnResult]: ...
+    def rollback(
+        targets: NameArg | None = None,
+        *,
+        discover: DiscoverMode = "source",
+        track_mutations: bool = False,
+    ) -> Iterator[None]: ...
+    @staticmethod
+    def rollback_func[F: Callable[..., Any]](
+        targets: NameArg | None = None,
+    ) -> Callable[[F], F]: ...
+    def sandbox(self) -> Sandbox: ...
+    def capture_return(self) -> ReturnCapture: ...
     def trigger_return(
         self,
         labels: LabelArg,
@@ -94,12 +259,51 @@ class Triggon:
         *,
         value: Any = None,
     ) -> None: ...
+    def short_circuit[F: Callable[..., Any]](
+        self,
+        labels: LabelArg,
+        /,
+        *,
+        value: Any = None,
+    ) -> Callable[[F], F]: ...
     def trigger_call(
         self,
         labels: LabelArg,
         /,
         target: TrigFunc,
+        *,
+        rate: int | float | None = None,
+        burst: int = 1,
+        fallback: Any = None,
+        executor: Executor | None = None,
     ) -> Any: ...
+    def configure_queue(
+        self,
+        label: str,
+        /,
+        *,
+        executor: Executor | None = None,
+        maxsize: int = 1024,
+        batch_size: int = 64,
+    ) -> None: ...
+    def configure_value_budget(self, max_bytes: int | None, /) -> None: ...
+    def submit_when(
+        self,
+        label: str,
+        /,
+        target: TrigFunc | Callable[[], Any],
+        *,
+        block: bool = True,
+        timeout: int | float | None = None,
+    ) -> Future[Any]: ...
 
 class TrigFunc:
-    def __init__(self) -> None: ...
+    def __init__(
+        self,
+        *,
+        namespace: ModuleType | Mapping[str, Any] | None = None,
+        weak: bool = False,
+        rate: int | float | None = None,
+        burst: int = 1,
+        fallback: Any = None,
+    ) -> None: ...
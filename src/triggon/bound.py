@@ -0,0 +1,214 @@
+from collections.abc import Iterator, MutableMapping
+from contextlib import contextmanager
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+from ._internal import (
+    check_bool,
+    check_str_sequence,
+    collect_rollback_refs,
+    restore_snapshots,
+    revert_targets,
+    snapshot_targets,
+)
+from ._internal._types.aliases import IndexArg, LabelArg, LabelToRefs, NameArg
+from ._internal._types.structs import Callsite, TargetScope
+from ._internal.frames import get_callsite, get_target_frame
+from ._internal.keys import LOG_VERBOSITY, MODULE_SCOPE
+
+if TYPE_CHECKING:
+    from .api import Triggon
+
+
+class BoundNamespace:
+    """Triggon methods bound to an explicit module namespace.
+
+    Created by `Triggon.bind()`. Each method behaves like the `Triggon`
+    method of the same name, but resolves and updates names in the bound
+    namespace instead of the caller's frame.
+    """
+
+    __slots__ = ("_tg", "_scope")
+
+    def __init__(self, tg: "Triggon", namespace: ModuleType | MutableMapping[str, Any]) -> None:
+        self._tg = tg
+        self._scope = _get_namespace_scope(namespace)
+
+    @property
+    def namespace(self) -> MutableMapping[str, Any]:
+        return self._scope.f_globals
+
+    def _get_callsite(self) -> Callsite | None:
+        if self._tg.debug[LOG_VERBOSITY] == 0:
+            return None
+
+        # Add 1 to depth to account for the bound method
+        frame = get_target_frame(depth=2)
+        callsite = get_callsite(frame)
+        frame = None
+        return callsite
+
+    def set_trigger(
+        self,
+        labels: LabelArg | None = None,
+        /,
+        *,
+        indices: IndexArg | None = None,
+        all: bool = False,
+        cond: str = "",
+        after: int | float = 0,
+        reschedule: bool = False,
+        prewarm: int | float = 0,
+        propagate: bool = False,
+    ) -> None:
+        """Activate labels and update refs registered from the bound namespace.
+
+        See `Triggon.set_trigger()`. `cond` is evaluated in the bound namespace.
+        """
+
+        self._tg._set_trigger(
+            self._scope,
+            self._get_callsite(),
+            labels,
+            indices,
+            all,
+            cond,
+            after,
+            reschedule,
+            prewarm,
+            propagate,
+        )
+
+    def revert(
+        self,
+        labels: LabelArg | None = None,
+        /,
+        *,
+        all: bool = False,
+        disable: bool = False,
+        cond: str = "",
+        after: int | float = 0,
+        reschedule: bool = False,
+        propagate: bool = False,
+    ) -> None:
+        """Deactivate labels and restore refs registered from the bound namespace.
+
+        See `Triggon.revert()`. `cond` is evaluated in the bound namespace.
+        """
+
+        self._tg._revert(
+            self._scope,
+            self._get_callsite(),
+            labels,
+            all,
+            disable,
+            cond,
+            after,
+            reschedule,
+            propagate,
+        )
+
+    def register_ref(
+        self,
+        label: str,
+        /,
+        name: str,
+        *,
+        index: int | None = None,
+        lazy: bool = False,
+    ) -> None:
+        """Register a name of the bound namespace for a label.
+
+        See `Triggon.register_ref()`.
+        """
+
+        self._tg._register_ref(self._scope, self._get_callsite(), label, name, index, lazy)
+
+    def register_refs(self, label_to_refs: LabelToRefs, /) -> None:
+        """Register multiple names of the bound namespace at once.
+
+        See `Triggon.register_refs()`.
+        """
+
+        self._tg._register_refs(self._scope, self._get_callsite(), label_to_refs)
+
+    def is_registered(
+        self,
+        *names: NameArg,
+        label: str | None = None,
+        match_all: bool = True,
+    ) -> bool:
+        """Return whether names of the bound namespace are registered.
+
+        See `Triggon.is_registered()`.
+        """
+
+        return self._tg._is_registered(self._scope, names, label, match_all)
+
+    def unregister_refs(self, names: NameArg, /, *, labels: LabelArg | None = None) -> None:
+        """Unregister names of the bound namespace from labels.
+
+        See `Triggon.unregister_refs()`.
+        """
+
+        self._tg._unregister_refs(self._scope, self._get_callsite(), names, labels)
+
+    @contextmanager
+    def rollback(self, targets: NameArg, *, track_mutations: bool = False) -> Iterator[None]:
+        """Restore names of the bound namespace when leaving the context.
+
+        Unlike `Triggon.rollback()`, targets must be given explicitly, since
+        no frame or source is inspected. This also works before CPython 3.13.
+
+        Args:
+            targets (str | Sequence[str]):
+                Names or attribute paths in the bound namespace to restore.
+                Undefined names are ignored.
+            track_mutations (bool, optional):
+                If True, in-place changes to container targets are undone on
+                exit. Defaults to False.
+
+        Raises:
+            InvalidArgumentError:
+                If `targets` is empty.
+            AttributeError:
+                If a given attribute path cannot be resolved.
+            UpdateError:
+                If a target cannot be restored when exiting the context.
+        """
+
+        check_str_sequence(arg_name="targets", args=targets)
+        if isinstance(targets, str):
+            targets = (targets,)
+        check_bool(arg_name="track_mutations", arg=track_mutations)
+
+        scope = self._scope
+        name_to_refs = collect_rollback_refs(scope, None, targets, track_mutations=track_mutations)
+        snapshots = snapshot_targets(name_to_refs) if track_mutations else []
+
+        try:
+            yield
+        finally:
+            try:
+                restore_snapshots(snapshots)
+            finally:
+                revert_targets(scope, name_to_refs)
+
+
+def _get_namespace_scope(namespace: ModuleType | MutableMapping[str, Any]) -> TargetScope:
+    if isinstance(namespace, ModuleType):
+        f_globals = vars(namespace)
+    elif isinstance(namespace, MutableMapping):
+        f_globals = namespace
+    else:
+        raise TypeError(
+            f"namespace must be ModuleType or MutableMapping, got {type(namespace).__name__}"
+        )
+
+    # refs registered from a frame are keyed by co_filename, which matches
+    # __file__ for modules imported from source
+    file = f_globals.get("__file__")
+    if not isinstance(file, str):
+        file = f"<namespace {f_globals.get('__name__', hex(id(f_globals)))}>"
+
+    return TargetScope(f_globals, f_globals, file, MODULE_SCOPE)
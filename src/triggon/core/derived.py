@@ -0,0 +1,111 @@
+import threading
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING
+
+from .._internal._types.structs import DerivedLabel
+from .._internal.label_expr import compile_label_expr
+from ..errors.public import InvalidArgumentError
+
+if TYPE_CHECKING:
+    from .._internal._types.aliases import IndexArg, LabelArg
+
+
+class DerivedLabelResolver:
+    _label_is_active: dict[str, bool]
+    _label_is_perm_disabled: dict[str, bool]
+    _derived: dict[str, DerivedLabel]
+    _derived_order: tuple[str, ...]  # derived labels after the ones they depend on
+    _epoch: int
+    _lock: threading.Lock
+
+    if TYPE_CHECKING:
+
+        def resolve_labels_and_idxs(
+            self,
+            labels: LabelArg,
+            idxs: IndexArg | None,
+            allow_symbol: bool = True,
+            is_init: bool = False,
+        ) -> tuple[tuple[str, ...], tuple[int, ...]]: ...
+
+    def add_derived_label(
+        self, label: str, idx: int | None, expr: str
+    ) -> list[tuple[str, int, bool]]:
+        inputs, predicate = compile_label_expr(expr)
+        inputs, _ = self.resolve_labels_and_idxs(inputs, idxs=None, allow_symbol=False)
+        (label,), (idx,) = self.resolve_labels_and_idxs(label, idx)
+
+        with self._lock:
+            derived = {**self._derived, label: DerivedLabel(expr, idx, inputs, predicate)}
+            order = _sort_derived(derived)
+            self._derived = derived
+            self._derived_order = order
+            # the new label is evaluated as if all of its inputs had changed
+            return self.recompute_derived(inputs)
+
+    def recompute_derived(self, changed: Sequence[str]) -> list[tuple[str, int, bool]]:
+        """Update the flags of derived labels that depend on `changed` labels.
+
+        Must be called with the lock held. Only derived labels with a changed
+        input are evaluated, in dependency order, so a flag flipped here is
+        seen by the derived labels after it. Returns the flipped labels with
+        their value index and new state.
+        """
+
+        if not self._derived:
+            return []
+
+        dirty = set(changed)
+        flipped = []
+        for label in self._derived_order:
+            derived = self._derived[label]
+            if dirty.isdisjoint(derived.inputs):
+                continue
+
+            active = derived.predicate(self._label_is_active)
+            if active == self._label_is_active[label]:
+                continue
+            if active and self._label_is_perm_disabled[label]:
+                continue
+
+            self._label_is_active[label] = active
+            self._epoch += 1
+            dirty.add(label)
+            flipped.append((label, derived.idx, active))
+
+        return flipped
+
+    def is_derived(self, label: str) -> bool:
+        return label in self._derived
+
+    def ensure_not_derived(self, labels: Sequence[str]) -> None:
+        for label in labels:
+            if label in self._derived:
+                raise InvalidArgumentError(
+                    f"{label!r} is derived from {self._derived[label].expr!r} "
+                    "and cannot be set directly"
+                )
+
+
+def _sort_derived(derived: Mapping[str, DerivedLabel]) -> tuple[str, ...]:
+    order: list[str] = []
+    # 1: being visited, 2: done
+    state: dict[str, int] = {}
+
+    def visit(label: str, path: tuple[str, ...]) -> None:
+        if state.get(label) == 2:
+            return
+        if state.get(label) == 1:
+            cycle = " -> ".join((*path[path.index(label) :], label))
+            raise InvalidArgumentError(f"derived labels must not depend on themselves: {cycle}")
+
+        state[label] = 1
+        for dep in derived[label].inputs:
+            if dep in derived:
+                visit(dep, (*path, label))
+        state[label] = 2
+        order.append(label)
+
+    for label in derived:
+        visit(label, ())
+    return tuple(order)
@@ -0,0 +1,84 @@
+from contextvars import ContextVar
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any
+
+from ..trigfunc import DEFERRED_ATTR
+
+
+@dataclass(slots=True)
+class EarlyReturnResult:
+    """Result returned by capture_return()."""
+
+    triggered: bool = False
+    value: Any = None
+
+
+class _ReturnSlot:
+    __slots__ = ("owner", "result", "value")
+
+    def __init__(self, owner: "ReturnCapture") -> None:
+        self.owner = owner
+        self.result = EarlyReturnResult()
+        # Initialize the default return value to None
+        self.value: Any = None
+
+
+class _EarlyReturn(Exception):
+    """Internal signal used to perform an early return inside capture_return()."""
+
+    def __init__(self, slot: _ReturnSlot) -> None:
+        super().__init__()
+        self.slot = slot
+
+
+# Every thread and asyncio task sees its own stack. Tuples are never mutated
+# in place, so a task that inherits its parent's context cannot push or pop
+# the parent's slots.
+_return_stack: ContextVar[tuple[_ReturnSlot, ...]] = ContextVar("triggon_return_stack", default=())
+
+
+class ReturnCapture:
+    """Reusable context manager returned by capture_return().
+
+    Entering pushes a slot on the return stack of the current thread or
+    task, so one object can be entered repeatedly, nested, and used
+    concurrently without allocating a generator.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> EarlyReturnResult:
+        slot = _ReturnSlot(self)
+        _return_stack.set(_return_stack.get() + (slot,))
+        return slot.result
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> bool:
+        stack = _return_stack.get()
+        slot = stack[-1]
+        _return_stack.set(stack[:-1])
+
+        # only catch the return aimed at this slot
+        if not isinstance(exc, _EarlyReturn) or exc.slot is not slot:
+            return False
+
+        result = slot.result
+        result.triggered = True
+        value = slot.value
+        if value is not None and hasattr(value, DEFERRED_ATTR):
+            result.value = value._run()
+        else:
+            result.value = value
+        return True
+
+    def find_slot(self) -> _ReturnSlot | None:
+        # innermost capture of this instance in the current thread or task
+        for slot in reversed(_return_stack.get()):
+            if slot.owner is self:
+                return slot
+        return None
@@ -1,13 +1,13 @@
 import logging
-from collections.abc import Mapping, MutableMapping
+from collections.abc import Mapping, MutableMapping, Sequence
 from dataclasses import dataclass
 from threading import Lock, Timer
 from typing import TYPE_CHECKING, Any
 
 from .._internal._types.aliases import DelayKey, RevertMap, TriggerMap
-from .._internal._types.structs import Callsite, DebugConfig, DelayState
-from .._internal.frames import get_callsite, get_target_frame
+from .._internal._types.structs import Callsite, DebugConfig, DelayState, TargetScope
 from .._internal.keys import LOG_VERBOSITY, REVERT, TRIGGER
+from ..trigfunc import DEFERRED_ATTR
 from .value_resolver import evaluate_cond
 
 
@@ -15,9 +15,11 @@ from .value_resolver import evaluate_cond
 class _ToggleAction:
     delay_key: DelayKey
     f_globals: MutableMapping[str, Any]
-    callsite: Callsite
+    file: str
+    callsite: Callsite | None  # only captured when debug logging is on
     set_true: bool
     disable: bool
+    propagate: bool  # update refs of every module, not only `file`
 
 
 class LabelFlagController:
@@ -26,6 +28,8 @@ class LabelFlagController:
     _label_is_active: dict[str, bool]
     _label_delay_state: dict[str, dict[DelayKey, DelayState]]
     _label_is_perm_disabled: dict[str, bool]
+    _epoch: int
+    _new_values: Mapping[str, Sequence[Any]]
     _lock: Lock
 
     if TYPE_CHECKING:
@@ -45,11 +49,18 @@ class LabelFlagController:
             label: str,
             idx: int | None,
             f_globals: MutableMapping[str, Any],
-            callsite: Callsite,
+            file: str,
             is_trigger: bool,
             update_refs: UpdateRefs | None = None,
+            staged: Mapping[int, Any] | None = None,
+            callsite: Callsite | None = None,
+            propagate: bool = False,
         ) -> None: ...
 
+        def drain_work_queue(self, label: str) -> None: ...
+
+        def recompute_derived(self, changed: Sequence[str]) -> list[tuple[str, int, bool]]: ...
+
     def set_label_flags(
         self,
         label_to_idx: TriggerMap | RevertMap,
@@ -57,10 +68,13 @@ class LabelFlagController:
         after: int | float,
         reschedule: bool,
         set_true: bool,
+        scope: TargetScope,
+        callsite: Callsite | None,
         disable: bool = False,
+        prewarm: int | float = 0,
+        propagate: bool = False,
     ) -> None:
-        frame = get_target_frame(depth=2)
-        if cond and not evaluate_cond(frame, cond):
+        if cond and not evaluate_cond(scope, cond):
             return
 
         if set_true:
@@ -68,11 +82,15 @@ class LabelFlagController:
         else:
             delay_key = REVERT
 
-        callsite = get_callsite(frame)
-        f_globals = frame.f_globals
-        frame = None
-
-        toggle_act = _ToggleAction(delay_key, f_globals, callsite, set_true, disable)
+        toggle_act = _ToggleAction(
+            delay_key,
+            scope.f_globals,
+            scope.file,
+            callsite,
+            set_true,
+            disable,
+            propagate,
+        )
 
         if after != 0 or reschedule:
             # remove labels that are already scheduled for a delay
@@ -97,13 +115,26 @@ class LabelFlagController:
                 args=(label_to_idx, toggle_act),
                 kwargs={"label_to_timer_id": label_to_timer_id},
             )
+            if set_true and prewarm != 0:
+                # run deferred values ahead of the deadline
+                prewarm_timer = Timer(
+                    max(0, after - prewarm),
+                    self._prewarm_values,
+                    args=(label_to_idx, timer),
+                )
+            else:
+                prewarm_timer = None
+
             target_labels = tuple(label_to_idx.keys())
             for label in label_to_idx:
                 delay_state = self._label_delay_state[label][delay_key]
                 with self._lock:
                     delay_state.timer = timer
+                    delay_state.prewarm_timer = prewarm_timer
                     delay_state.labels = target_labels
 
+            if prewarm_timer is not None:
+                prewarm_timer.start()
             timer.start()
 
     def _prepare_delay(
@@ -112,13 +143,14 @@ class LabelFlagController:
         toggle_act: _ToggleAction,
         after: int | float,
         reschedule: bool,
-        callsite: Callsite,
+        callsite: Callsite | None,
     ) -> Mapping[str, int]:
         labels = tuple(label_to_idx)
 
         # label_to_idx and label_to_timer_id share the same labels
         label_to_timer_id = {}
         stale_timer = None
+        stale_prewarm_timer = None
         stale_timer_labels = None
         debug_on = self.debug[LOG_VERBOSITY] == 3
 
@@ -142,6 +174,7 @@ class LabelFlagController:
             label_to_timer_id[label] = delay_state.cur_timer_id
             if stale_timer is None:
                 stale_timer = delay_state.timer
+                stale_prewarm_timer = delay_state.prewarm_timer
                 stale_timer_labels = delay_state.labels
 
             if toggle_act.set_true and self._label_is_active[label]:
@@ -149,7 +182,7 @@ class LabelFlagController:
             elif not toggle_act.set_true and not self._label_is_active[label]:
                 continue
 
-            if after != 0 and debug_on:
+            if after != 0 and debug_on and callsite is not None:
                 self.log_label_flag_change(
                     label,
                     callsite,
@@ -161,6 +194,8 @@ class LabelFlagController:
         if stale_timer is not None and stale_timer_labels is not None:
             if all(v in label_to_timer_id.keys() for v in stale_timer_labels):
                 stale_timer.cancel()
+                if stale_prewarm_timer is not None:
+                    stale_prewarm_timer.cancel()
 
         return label_to_timer_id
 
@@ -173,6 +208,7 @@ class LabelFlagController:
         # used only for delayed execution
         labels = tuple(label_to_idx)
 
+        callsite = toggle_act.callsite
         debug_on = self.debug[LOG_VERBOSITY] != 0
 
         try:
@@ -191,6 +227,8 @@ class LabelFlagController:
                         else:
                             continue
 
+                    staged = delay_state.staged
+
                     triggered = self._label_is_active[label]
                     if toggle_act.set_true and not triggered:
                         self._label_is_active[label] = True
@@ -203,10 +241,18 @@ class LabelFlagController:
                     else:
                         toggled = False
 
-                if toggled and debug_on:
+                    if toggled:
+                        # invalidates the cached values of lazy refs
+                        self._epoch += 1
+                        # flipped in the same critical section as the input
+                        derived_flips = self.recompute_derived((label,))
+                    else:
+                        derived_flips = []
+
+                if toggled and debug_on and callsite is not None:
                     self.log_label_flag_change(
                         label,
-                        toggle_act.callsite,
+                        callsite,
                         toggle_act.set_true,
                         disable=toggle_act.disable,
                     )
@@ -215,8 +261,22 @@ class LabelFlagController:
                     label,
                     i,
                     toggle_act.f_globals,
-                    toggle_act.callsite,
+                    toggle_act.file,
                     toggle_act.set_true,
+                    staged=staged,
+                    callsite=callsite,
+                    propagate=toggle_act.propagate,
+                )
+
+                if toggled and toggle_act.set_true:
+                    self.drain_work_queue(label)
+
+                self.apply_derived_flips(
+                    derived_flips,
+                    toggle_act.f_globals,
+                    toggle_act.file,
+                    callsite,
+                    toggle_act.propagate,
                 )
         except Exception as e:
             if delay_state.is_delay:
@@ -231,6 +291,63 @@ class LabelFlagController:
                 delay_key=toggle_act.delay_key,
             )
 
+    def apply_derived_flips(
+        self,
+        flips: Sequence[tuple[str, int, bool]],
+        f_globals: MutableMapping[str, Any],
+        file: str,
+        callsite: Callsite | None,
+        propagate: bool,
+    ) -> None:
+        debug_on = self.debug[LOG_VERBOSITY] != 0
+
+        for label, idx, set_true in flips:
+            if debug_on and callsite is not None:
+                self.log_label_flag_change(label, callsite, set_true)
+
+            self.update_values(
+                label,
+                idx,
+                f_globals,
+                file,
+                set_true,
+                callsite=callsite,
+                propagate=propagate,
+            )
+
+            if set_true:
+                self.drain_work_queue(label)
+
+    def _prewarm_values(self, label_to_idx: TriggerMap, timer: Timer) -> None:
+        for label, i in label_to_idx.items():
+            value = self._new_values[label][i]
+            if not hasattr(value, DEFERRED_ATTR):
+                continue
+
+            with self._lock:
+                if self._label_delay_state[label][TRIGGER].timer is not timer:
+                    # skip stale prewarm callbacks
+                    continue
+
+            # run outside the lock so the activation itself stays cheap
+            try:
+                result = value._run()
+            except Exception as e:
+                # the value is executed again when the label is activated
+                if self._logger is not None:
+                    self._logger.exception(e)
+                continue
+
+            with self._lock:
+                delay_state = self._label_delay_state[label][TRIGGER]
+                if delay_state.timer is not timer:
+                    # rescheduled or already activated
+                    continue
+
+                if delay_state.staged is None:
+                    delay_state.staged = {}
+                delay_state.staged[i] = result
+
     def _clear_delay_state(
         self,
         label_to_timer_id: Mapping[str, int] | None,
@@ -244,5 +361,7 @@ class LabelFlagController:
             delay_state = self._label_delay_state[label][delay_key]
             with self._lock:
                 if delay_state.cur_timer_id == label_to_timer_id[label]:
+                    if delay_state.prewarm_timer is not None:
+                        delay_state.prewarm_timer.cancel()
                     # initialize
                     self._label_delay_state[label][delay_key] = DelayState()
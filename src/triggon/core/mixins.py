@@ -1,7 +1,19 @@
+from .derived import DerivedLabelResolver
 from .flag_switch import LabelFlagController
+from .refs.lazy import LazyRefRegistrar
 from .refs.registry import RefRegistrar
+from .value_budget import ValueBudget
 from .value_update import ValueUpdater
+from .work_queue import WorkQueueDispatcher
 
 
-class _Core(LabelFlagController, ValueUpdater, RefRegistrar):
-    """Core mixin bundle."""
\ No newline at end of file
+class _Core(
+    LabelFlagController,
+    ValueUpdater,
+    RefRegistrar,
+    LazyRefRegistrar,
+    WorkQueueDispatcher,
+    ValueBudget,
+    DerivedLabelResolver,
+):
+    """Core mixin bundle."""
@@ -0,0 +1,275 @@
+import operator
+from collections.abc import Callable, Iterator, MutableMapping, Sequence
+from typing import TYPE_CHECKING, Any, cast
+
+from ..._internal._types.structs import Callsite, DebugConfig, TargetScope
+from ..._internal.keys import LOG_VERBOSITY
+from ..._internal.lock import UPDATE_LOCK
+from ...errors.public import InvalidArgumentError
+from ...trigfunc import DEFERRED_ATTR
+from ..value_resolver import VarResult, resolve_ref_info
+
+if TYPE_CHECKING:
+    from ...api import Triggon
+
+_STALE = (-1, None)
+
+
+class LazyRef:
+    """Proxy that stands in for a lazily registered global variable.
+
+    Created by `Triggon.register_ref(..., lazy=True)`. The value is resolved
+    on access from the first active label, or the original value when no
+    label is active, and cached until any label of the instance is
+    activated or deactivated. Attribute access, calls, operators, and
+    conversions are forwarded to the resolved value, but `type()` and
+    `isinstance()` see the proxy; use `resolve()` to get the value itself.
+
+    In-place operators such as `+=` change a mutable resolved value in
+    place and keep the proxy. For an immutable value they return a plain
+    result, so the name is rebound and no longer follows the labels.
+    """
+
+    __slots__ = ("_tg", "_orig", "_choices", "_state")
+
+    def __init__(self, tg: "Triggon", orig_val: Any) -> None:
+        object.__setattr__(self, "_tg", tg)
+        object.__setattr__(self, "_orig", orig_val)
+        object.__setattr__(self, "_choices", {})
+        # (epoch, resolved value), replaced as one object
+        object.__setattr__(self, "_state", _STALE)
+
+    def resolve(self) -> Any:
+        """Return the value the proxied name currently stands for."""
+
+        tg = self._tg
+        epoch = tg._epoch
+        state_epoch, value = self._state
+        if state_epoch == epoch:
+            return value
+
+        value = self._orig
+        for label, idx in tuple(self._choices.items()):
+            if tg._label_is_active.get(label, False):
+                value = tg._new_values[label][idx]
+                if hasattr(value, DEFERRED_ATTR):
+                    value = value._run()
+                break
+
+        # a flag flipped while resolving leaves the cache stale, so the
+        # epoch read before resolving is stored
+        object.__setattr__(self, "_state", (epoch, value))
+        return value
+
+    def _set_choice(self, label: str, idx: int) -> None:
+        self._choices[label] = idx
+        object.__setattr__(self, "_state", _STALE)
+
+    def _reset_choices(self, choices: dict[str, int]) -> None:
+        self._choices.clear()
+        self._choices.update(choices)
+        object.__setattr__(self, "_state", _STALE)
+
+    def _drop_choices(self, labels: Sequence[str]) -> None:
+        for label in labels:
+            self._choices.pop(label, None)
+        object.__setattr__(self, "_state", _STALE)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self.resolve(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self.resolve(), name)
+
+    def __repr__(self) -> str:
+        return repr(self.resolve())
+
+    def __str__(self) -> str:
+        return str(self.resolve())
+
+    def __format__(self, format_spec: str) -> str:
+        return format(self.resolve(), format_spec)
+
+    def __hash__(self) -> int:
+        return hash(self.resolve())
+
+    def __bool__(self) -> bool:
+        return bool(self.resolve())
+
+    def __int__(self) -> int:
+        return int(self.resolve())
+
+    def __float__(self) -> float:
+        return float(self.resolve())
+
+    def __complex__(self) -> complex:
+        return complex(self.resolve())
+
+    def __index__(self) -> int:
+        return operator.index(self.resolve())
+
+    def __round__(self, ndigits: int | None = None) -> Any:
+        return round(self.resolve(), ndigits)
+
+    def __len__(self) -> int:
+        return len(self.resolve())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.resolve())
+
+    def __contains__(self, item: object) -> bool:
+        return item in self.resolve()
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.resolve()[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.resolve()[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self.resolve()[key]
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+
+def _unwrap(value: Any) -> Any:
+    return value.resolve() if isinstance(value, LazyRef) else value
+
+
+def _binary(op: Callable[[Any, Any], Any]) -> Callable[[LazyRef, Any], Any]:
+    def method(self: LazyRef, other: Any) -> Any:
+        return op(self.resolve(), _unwrap(other))
+
+    return method
+
+
+def _reflected(op: Callable[[Any, Any], Any]) -> Callable[[LazyRef, Any], Any]:
+    def method(self: LazyRef, other: Any) -> Any:
+        return op(_unwrap(other), self.resolve())
+
+    return method
+
+
+def _inplace(op: Callable[[Any, Any], Any]) -> Callable[[LazyRef, Any], Any]:
+    def method(self: LazyRef, other: Any) -> Any:
+        value = self.resolve()
+        result = op(value, _unwrap(other))
+        # keep the name bound to the proxy when the value was changed in place
+        return self if result is value else result
+
+    return method
+
+
+def _unary(op: Callable[[Any], Any]) -> Callable[[LazyRef], Any]:
+    def method(self: LazyRef) -> Any:
+        return op(self.resolve())
+
+    return method
+
+
+for _name in "add sub mul matmul truediv floordiv mod pow lshift rshift and or xor".split():
+    _op = getattr(operator, f"{_name}_" if _name in ("and", "or") else _name)
+    setattr(LazyRef, f"__{_name}__", _binary(_op))
+    setattr(LazyRef, f"__r{_name}__", _reflected(_op))
+    setattr(LazyRef, f"__i{_name}__", _inplace(getattr(operator, f"i{_name}")))
+
+for _name in ("eq", "ne", "lt", "le", "gt", "ge"):
+    setattr(LazyRef, f"__{_name}__", _binary(getattr(operator, _name)))
+
+for _name in ("neg", "pos", "abs", "invert"):
+    setattr(LazyRef, f"__{_name}__", _unary(getattr(operator, _name)))
+
+
+class LazyRefRegistrar:
+    debug: DebugConfig
+    # proxies placed in namespaces, keyed by (id(namespace), name)
+    _lazy_proxies: dict[tuple[int, str], tuple[MutableMapping[str, Any], str, LazyRef]]
+
+    if TYPE_CHECKING:
+
+        def log_registered_name(
+            self,
+            target_name: str,
+            label: str,
+            callsite: Callsite,
+        ) -> None: ...
+
+        def log_unregistered_name(
+            self, target_name: str, label: str, callsite: Callsite
+        ) -> None: ...
+
+    def register_lazy_ref(
+        self,
+        label: str,
+        idx: int,
+        name: str,
+        scope: TargetScope,
+        callsite: Callsite | None,
+    ) -> None:
+        f_globals = scope.f_globals
+        if "." in name or name not in f_globals:
+            raise InvalidArgumentError(
+                f"name: lazy refs must be global variable names, got {name!r}"
+            )
+
+        ref = resolve_ref_info(name, scope)
+        if not isinstance(ref, VarResult):
+            raise InvalidArgumentError(
+                f"name: lazy refs must be global variable names, got {name!r}"
+            )
+
+        with UPDATE_LOCK:
+            proxy = self._get_own_proxy(f_globals, name)
+            if proxy is None:
+                proxy = LazyRef(cast("Triggon", self), f_globals[name])
+                f_globals[name] = proxy
+                self._lazy_proxies[(id(f_globals), name)] = (f_globals, name, proxy)
+            proxy._set_choice(label, idx)
+
+        if self.debug[LOG_VERBOSITY] == 3 and callsite is not None:
+            self.log_registered_name(name, label, callsite)
+
+    def unregister_lazy_refs(
+        self,
+        names: Sequence[str],
+        labels: Sequence[str],
+        f_globals: MutableMapping[str, Any],
+        callsite: Callsite | None,
+    ) -> None:
+        for name in names:
+            with UPDATE_LOCK:
+                proxy = self._get_own_proxy(f_globals, name)
+                if proxy is None:
+                    continue
+
+                dropped = [label for label in labels if label in proxy._choices]
+                proxy._drop_choices(dropped)
+                if not proxy._choices:
+                    # put the original value back in place of the proxy
+                    f_globals[name] = proxy._orig
+                    del self._lazy_proxies[(id(f_globals), name)]
+
+            if self.debug[LOG_VERBOSITY] == 3 and callsite is not None:
+                for label in dropped:
+                    self.log_unregistered_name(name, label, callsite)
+
+    def is_lazy_registered(
+        self,
+        name: str,
+        label: str | None,
+        f_globals: MutableMapping[str, Any],
+    ) -> bool:
+        proxy = self._get_own_proxy(f_globals, name)
+        if proxy is None:
+            return False
+        return label is None or label in proxy._choices
+
+    def _get_own_proxy(self, f_globals: MutableMapping[str, Any], name: str) -> LazyRef | None:
+        value = f_globals.get(name)
+        if isinstance(value, LazyRef) and value._tg is self:
+            return value
+        return None
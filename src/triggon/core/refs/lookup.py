@@ -1,4 +1,5 @@
-from typing import cast
+from collections.abc import MutableMapping
+from typing import Any, cast
 
 from ..._internal._types.aliases import UpdateRefs
 from ..._internal._types.structs import AttrRef, RefMeta, RefsByKind, VarRef
@@ -78,3 +79,37 @@ class RefLookup:
             update_refs.append(ref)
 
         return update_refs
+
+    def group_update_refs(
+        self,
+        label: str,
+        file: str,
+        f_globals: MutableMapping[str, Any],
+    ) -> list[tuple[MutableMapping[str, Any] | None, UpdateRefs]]:
+        # group all refs of the label by the module they were registered from,
+        # paired with that module's globals (None once it is unloaded)
+        label_refs = self._label_refs[label]
+        groups: dict[str, tuple[MutableMapping[str, Any] | None, UpdateRefs]] = {}
+
+        for kind in (GLOB_VAR, ATTR):
+            for ref in label_refs[kind]:
+                meta = self._id_meta[ref.ref_id]
+                group = groups.get(meta.file)
+                if group is None:
+                    if meta.file == file:
+                        namespace = f_globals
+                    else:
+                        namespace = _get_module_globals(meta)
+                    group = groups[meta.file] = (namespace, [])
+                group[1].append(ref)
+
+        return list(groups.values())
+
+
+def _get_module_globals(meta: RefMeta) -> MutableMapping[str, Any] | None:
+    if meta.module_ref is None:
+        return None
+    module = meta.module_ref()
+    if module is None:
+        return None
+    return vars(module)
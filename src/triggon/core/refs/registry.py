@@ -1,5 +1,7 @@
 import threading
-from collections.abc import MutableMapping, Sequence
+import weakref
+from collections import deque
+from collections.abc import Callable, Mapping, MutableMapping, Sequence
 from typing import TYPE_CHECKING, Any
 
 from ..._internal._types.aliases import LabelToRefs
@@ -8,10 +10,11 @@ from ..._internal._types.structs import (
     Callsite,
     DebugConfig,
     RefMeta,
+    TargetScope,
     VarRef,
 )
-from ..._internal.frames import get_callsite, get_target_frame
 from ..._internal.keys import ATTR, GLOB_VAR, LOG_VERBOSITY, MODULE_SCOPE
+from ..._internal.utils import find_module
 from ..value_resolver import AttrResult, VarResult, resolve_ref_info
 from .lookup import RefLookup
 
@@ -19,6 +22,8 @@ from .lookup import RefLookup
 class RefRegistrar(RefLookup):
     debug: DebugConfig
     _label_is_active: dict[str, bool]
+    _dead_refs: deque[tuple[str, int]]
+    _inplace_data: dict[int, Any]
     _lock: threading.Lock
 
     if TYPE_CHECKING:
@@ -40,17 +45,24 @@ class RefRegistrar(RefLookup):
             label: str,
             idx: int | None,
             f_globals: MutableMapping[str, Any],
-            callsite: Callsite,
+            file: str,
             set_true: bool,
             update_refs: UpdateRefs | None = None,
+            staged: Mapping[int, Any] | None = None,
+            callsite: Callsite | None = None,
         ) -> None: ...
 
-    def register_target_refs(self, label_to_refs: LabelToRefs) -> None:
-        frame = get_target_frame(depth=2)
-        f_globals = frame.f_globals
-        callsite = get_callsite(frame)
+    def register_target_refs(
+        self,
+        label_to_refs: LabelToRefs,
+        scope: TargetScope,
+        callsite: Callsite | None,
+    ) -> None:
+        self.purge_dead_refs()
 
-        target_ids = self.get_ids_by_file(callsite.file)
+        target_ids = self.get_ids_by_file(scope.file)
+        module = find_module(scope.f_globals)
+        module_ref = None if module is None else weakref.ref(module)
 
         for label, name_to_idx in label_to_refs.items():
             target_var_refs, target_attr_refs = self.get_refs(label)
@@ -62,12 +74,12 @@ class RefRegistrar(RefLookup):
                         target_ids,
                         target_var_refs,
                         target_attr_refs,
-                        callsite.scope_name,
+                        scope.scope_name,
                     )
                     if registered:
                         continue
 
-                    ref = resolve_ref_info(name, frame)
+                    ref = resolve_ref_info(name, scope)
 
                     if isinstance(ref, VarResult):
                         save_ref = VarRef(ref_id=self._latest_id, var_name=name)
@@ -76,7 +88,9 @@ class RefRegistrar(RefLookup):
                         save_ref = AttrRef(
                             ref_id=self._latest_id,
                             attr_name=ref.attr_name,
-                            parent_obj=ref.parent_obj,
+                            parent_ref=self._make_parent_ref(
+                                ref.parent_obj, label, self._latest_id
+                            ),
                             full_name=name,
                         )
                         self._label_refs[label][ATTR].append(save_ref)
@@ -84,27 +98,80 @@ class RefRegistrar(RefLookup):
                         raise AssertionError(f"unreachable ref type: {type(ref)!r}")
 
                     self._id_meta[self._latest_id] = RefMeta(
-                        callsite.file,
+                        scope.file,
                         ref.scope_name,
                         orig_val=ref.value,
+                        module_ref=module_ref,
                     )
                     self._latest_id += 1
 
-                if self.debug[LOG_VERBOSITY] == 3:
+                if self.debug[LOG_VERBOSITY] == 3 and callsite is not None:
                     self.log_registered_name(name, label, callsite)
 
                 if self._label_is_active[label]:
                     self.update_values(
                         label,
                         idx,
-                        f_globals,
-                        callsite,
+                        scope.f_globals,
+                        scope.file,
                         set_true=True,
                         update_refs=[save_ref],
+                        callsite=callsite,
                     )
 
+    def _make_parent_ref(self, parent_obj: Any, label: str, ref_id: int) -> Callable[[], Any]:
+        # the callback must not keep this instance alive
+        self_ref = weakref.ref(self)
+
+        def on_collected(_: weakref.ref[Any]) -> None:
+            tg = self_ref()
+            if tg is not None:
+                tg._on_parent_collected(label, ref_id)
+
+        try:
+            return weakref.ref(parent_obj, on_collected)
+        except TypeError:
+            # e.g. ints, or classes with __slots__ but no __weakref__
+            return _StrongRef(parent_obj)
+
+    def _on_parent_collected(self, label: str, ref_id: int) -> None:
+        # runs inside garbage collection, possibly on a thread that already
+        # holds the lock, so the purge is deferred when the lock is busy
+        self._dead_refs.append((label, ref_id))
+        if self._lock.acquire(blocking=False):
+            try:
+                self._drop_dead_refs()
+            finally:
+                self._lock.release()
+
+    def purge_dead_refs(self) -> None:
+        # drop refs whose parent was collected while the lock was busy
+        if self._dead_refs:
+            with self._lock:
+                self._drop_dead_refs()
+
+    def _drop_dead_refs(self) -> None:
+        label_to_ids: dict[str, set[int]] = {}
+        while self._dead_refs:
+            label, ref_id = self._dead_refs.popleft()
+            label_to_ids.setdefault(label, set()).add(ref_id)
+
+        for label, ref_ids in label_to_ids.items():
+            for ref_id in ref_ids:
+                self._id_meta.pop(ref_id, None)
+                self._inplace_data.pop(ref_id, None)
+
+            label_refs = self._label_refs.get(label)
+            if label_refs is not None:
+                label_refs[ATTR] = [ref for ref in label_refs[ATTR] if ref.ref_id not in ref_ids]
+
     def unregister_target_refs(
-        self, label: str, target_names: Sequence[str], target_ids: set[int], callsite: Callsite
+        self,
+        label: str,
+        target_names: Sequence[str],
+        target_ids: set[int],
+        scope_name: str,
+        callsite: Callsite | None,
     ) -> None:
         label_refs = self._label_refs[label]
         target_name_set = set(target_names)
@@ -118,13 +185,14 @@ class RefRegistrar(RefLookup):
                 new_attr_refs.append(ref)
                 continue
 
-            scope_name = self._id_meta[ref.ref_id].scope_name
-            if scope_name != callsite.scope_name and scope_name != MODULE_SCOPE:
+            ref_scope_name = self._id_meta[ref.ref_id].scope_name
+            if ref_scope_name != scope_name and ref_scope_name != MODULE_SCOPE:
                 new_attr_refs.append(ref)
                 continue
 
             del self._id_meta[ref.ref_id]
-            if self.debug[LOG_VERBOSITY] == 3:
+            self._inplace_data.pop(ref.ref_id, None)
+            if self.debug[LOG_VERBOSITY] == 3 and callsite is not None:
                 self.log_unregistered_name(ref.full_name, label, callsite)
 
         label_refs[ATTR] = new_attr_refs
@@ -139,7 +207,20 @@ class RefRegistrar(RefLookup):
                 continue
 
             del self._id_meta[ref.ref_id]
-            if self.debug[LOG_VERBOSITY] == 3:
+            self._inplace_data.pop(ref.ref_id, None)
+            if self.debug[LOG_VERBOSITY] == 3 and callsite is not None:
                 self.log_unregistered_name(ref.var_name, label, callsite)
 
         label_refs[GLOB_VAR] = new_var_refs
+
+
+class _StrongRef:
+    """Callable holder used like a weakref for objects that cannot be weakly referenced."""
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj: Any) -> None:
+        self._obj = obj
+
+    def __call__(self) -> Any:
+        return self._obj
@@ -0,0 +1,263 @@
+import sys
+from collections.abc import MutableMapping
+from threading import Timer
+from types import TracebackType
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .._internal._types.structs import AttrRef, DelayState, DerivedLabel, RefMeta, VarRef
+from .._internal.buffers import copy_into
+from .._internal.keys import ATTR, GLOB_VAR
+from .._internal.lock import UPDATE_LOCK
+from .._internal.sentinel import _NO_VALUE
+from ..errors.public import UpdateError
+from .refs.lazy import LazyRef
+
+if TYPE_CHECKING:
+    from ..api import Triggon
+
+
+class _SavedRef(NamedTuple):
+    ref: VarRef | AttrRef
+    namespace: MutableMapping[str, Any] | None  # module globals of a VarRef
+    value: Any
+
+
+class _SavedState(NamedTuple):
+    labels: frozenset[str]
+    is_active: dict[str, bool]
+    is_perm_disabled: dict[str, bool]
+    timers: frozenset[Timer]
+    latest_id: int
+    # replaced as a whole on change, so the objects themselves are kept
+    derived: dict[str, DerivedLabel]
+    derived_order: tuple[str, ...]
+    inplace_ids: frozenset[int]  # refs with a buffer switched in place
+    label_refs: dict[str, tuple[list[VarRef], list[AttrRef]]]
+    id_meta: dict[int, RefMeta]
+    lazy_proxies: tuple[tuple[MutableMapping[str, Any], str, LazyRef, dict[str, int]], ...]
+
+
+class Sandbox:
+    """Snapshot the state of one Triggon instance and restore it on exit.
+
+    On entry, label flags and scheduled timers are recorded. Registered
+    variables and attributes record their value when they are first
+    switched inside. On exit, only those targets and the changed flags are
+    restored, timers started inside are cancelled, and labels and refs added
+    inside are removed.
+    """
+
+    __slots__ = ("_tg", "_saved", "_written")
+
+    def __init__(self, tg: "Triggon") -> None:
+        self._tg = tg
+        self._saved: _SavedState | None = None
+        # values of targets before their first switch inside, keyed by target
+        self._written: dict[tuple[int, str], _SavedRef] = {}
+
+    def __enter__(self) -> "Triggon":
+        tg = self._tg
+        with tg._lock:
+            labels = frozenset(tg._new_values)
+            is_active = dict(tg._label_is_active)
+            is_perm_disabled = dict(tg._label_is_perm_disabled)
+            timers = frozenset(
+                timer
+                for states in tg._label_delay_state.values()
+                for state in states.values()
+                for timer in (state.timer, state.prewarm_timer)
+                if timer is not None
+            )
+            latest_id = tg._latest_id
+            derived = tg._derived
+            derived_order = tg._derived_order
+            inplace_ids = frozenset(tg._inplace_data)
+
+        with UPDATE_LOCK:
+            lazy_proxies = tuple(
+                (namespace, name, proxy, dict(proxy._choices))
+                for namespace, name, proxy in tg._lazy_proxies.values()
+            )
+            label_refs = {
+                label: (list(refs[GLOB_VAR]), list(refs[ATTR]))
+                for label, refs in tg._label_refs.items()
+            }
+            self._written.clear()
+            self._saved = _SavedState(
+                labels,
+                is_active,
+                is_perm_disabled,
+                timers,
+                latest_id,
+                derived,
+                derived_order,
+                inplace_ids,
+                label_refs,
+                dict(tg._id_meta),
+                lazy_proxies,
+            )
+            # switches from here on record the targets they write
+            tg._sandboxes.append(self)
+        return tg
+
+    def _record_write(
+        self,
+        ref: VarRef | AttrRef,
+        namespace: MutableMapping[str, Any] | None,
+        value: Any,
+    ) -> None:
+        # called under UPDATE_LOCK; the first value seen is the one restored
+        if isinstance(ref, AttrRef):
+            key = (id(ref.parent_obj), ref.attr_name)
+        else:
+            key = (id(namespace), ref.var_name)
+        if key not in self._written:
+            self._written[key] = _SavedRef(ref, namespace, value)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        saved, self._saved = self._saved, None
+        if saved is None:
+            raise RuntimeError("sandbox was exited without being entered")
+
+        tg = self._tg
+        with UPDATE_LOCK:
+            tg._sandboxes.remove(self)
+            written, self._written = self._written, {}
+
+        self._cancel_new_timers(saved)
+        self._restore_lazy_proxies(saved)
+        self._restore_ref_values(saved, written)
+        self._remove_new_entries(saved)
+
+        with tg._lock:
+            for label, active in saved.is_active.items():
+                if tg._label_is_active.get(label, active) != active:
+                    tg._label_is_active[label] = active
+            for label, disabled in saved.is_perm_disabled.items():
+                if tg._label_is_perm_disabled.get(label, disabled) != disabled:
+                    tg._label_is_perm_disabled[label] = disabled
+            tg._derived = saved.derived
+            tg._derived_order = saved.derived_order
+            tg._epoch += 1
+
+    def _cancel_new_timers(self, saved: _SavedState) -> None:
+        tg = self._tg
+        with tg._lock:
+            for states in tg._label_delay_state.values():
+                for key, state in states.items():
+                    new_timers = [
+                        timer
+                        for timer in (state.timer, state.prewarm_timer)
+                        if timer is not None and timer not in saved.timers
+                    ]
+                    if not new_timers:
+                        continue
+
+                    for timer in new_timers:
+                        timer.cancel()
+                    # a timer started inside may have replaced one from outside
+                    # (reschedule), which was cancelled at that point
+                    states[key] = DelayState()
+
+    def _restore_lazy_proxies(self, saved: _SavedState) -> None:
+        tg = self._tg
+        with UPDATE_LOCK:
+            kept = {}
+            for namespace, name, proxy, choices in saved.lazy_proxies:
+                proxy._reset_choices(choices)
+                namespace[name] = proxy
+                kept[(id(namespace), name)] = (namespace, name, proxy)
+
+            # proxies placed inside are replaced by their original value
+            for key, (namespace, name, proxy) in tg._lazy_proxies.items():
+                if key not in kept and namespace.get(name) is proxy:
+                    namespace[name] = proxy._orig
+            tg._lazy_proxies = kept
+
+    def _restore_ref_values(
+        self, saved: _SavedState, written: dict[tuple[int, str], _SavedRef]
+    ) -> None:
+        tg = self._tg
+        with UPDATE_LOCK:
+            # buffers switched in place inside get their contents back
+            for ref_id in [i for i in tg._inplace_data if i not in saved.inplace_ids]:
+                copy_into(tg._id_meta[ref_id].orig_val, tg._inplace_data.pop(ref_id))
+
+            for item in written.values():
+                _restore_ref(item.ref, item.namespace, item.value)
+
+            # refs registered inside are put back to their original value
+            with tg._lock:
+                new_refs = [
+                    (ref, tg._id_meta[ref.ref_id])
+                    for refs in tg._label_refs.values()
+                    for kind in (GLOB_VAR, ATTR)
+                    for ref in refs[kind]
+                    if ref.ref_id >= saved.latest_id
+                ]
+            for ref, meta in new_refs:
+                _restore_ref(ref, _find_module_globals(meta), meta.orig_val)
+
+    def _remove_new_entries(self, saved: _SavedState) -> None:
+        tg = self._tg
+        with tg._lock:
+            for label in tuple(tg._new_values):
+                if label in saved.labels:
+                    continue
+                del tg._new_values[label]
+                del tg._label_is_active[label]
+                del tg._label_is_perm_disabled[label]
+                for state in tg._label_delay_state.pop(label).values():
+                    for timer in (state.timer, state.prewarm_timer):
+                        if timer is not None:
+                            timer.cancel()
+                del tg._label_refs[label]
+
+            # refs added inside are dropped, and refs unregistered inside return
+            for label, (var_refs, attr_refs) in saved.label_refs.items():
+                refs = tg._label_refs[label]
+                refs[GLOB_VAR] = list(var_refs)
+                # refs whose parent was collected meanwhile are not restored
+                refs[ATTR] = [ref for ref in attr_refs if ref.parent_obj is not None]
+            for ref_id in [i for i in tg._id_meta if i >= saved.latest_id]:
+                del tg._id_meta[ref_id]
+            for refs in tg._label_refs.values():
+                for kind in (GLOB_VAR, ATTR):
+                    for ref in refs[kind]:
+                        tg._id_meta.setdefault(ref.ref_id, saved.id_meta[ref.ref_id])
+
+
+def _restore_ref(
+    ref: VarRef | AttrRef,
+    namespace: MutableMapping[str, Any] | None,
+    value: Any,
+) -> None:
+    # compare by identity so that restoring never calls __eq__
+    if isinstance(ref, AttrRef):
+        parent_obj = ref.parent_obj
+        if parent_obj is None or getattr(parent_obj, ref.attr_name, _NO_VALUE) is value:
+            return
+        try:
+            setattr(parent_obj, ref.attr_name, value)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise UpdateError(ref.full_name, e) from None
+    elif namespace is not None:
+        if namespace.get(ref.var_name, _NO_VALUE) is not value:
+            namespace[ref.var_name] = value
+
+
+def _find_module_globals(meta: RefMeta) -> MutableMapping[str, Any] | None:
+    if meta.module_ref is not None:
+        module = meta.module_ref()
+        return None if module is None else vars(module)
+
+    # refs without a module reference only keep the file they were registered from
+    for module in tuple(sys.modules.values()):
+        if getattr(module, "__file__", None) == meta.file:
+            return vars(module)
+    return None
@@ -0,0 +1,62 @@
+import threading
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, cast
+
+from .._internal._types.aliases import DelayKey
+from .._internal._types.structs import DelayState
+from .._internal.keys import TRIGGER
+from ..lazy_value import LazyValue
+
+if TYPE_CHECKING:
+    from ..api import Triggon
+
+
+class ValueBudget:
+    _label_is_active: dict[str, bool]
+    _label_delay_state: dict[str, dict[DelayKey, DelayState]]
+    _lazy_values: dict[LazyValue, set[str]]  # labels each value is used by
+    _value_budget: int | None
+    _lock: threading.Lock
+
+    def track_lazy_values(self, label: str, values: Iterable[Any]) -> None:
+        for value in values:
+            if not isinstance(value, LazyValue):
+                continue
+
+            with self._lock:
+                self._lazy_values.setdefault(value, set()).add(label)
+            value._owners.add(cast("Triggon", self))
+
+    def enforce_value_budget(self) -> None:
+        budget = self._value_budget
+        if budget is None:
+            return
+
+        with self._lock:
+            loaded = [
+                (value, labels) for value, labels in self._lazy_values.items() if value.is_loaded
+            ]
+            total = sum(value.loaded_size for value, _ in loaded)
+            if total <= budget:
+                return
+
+            # values of active labels are in use, and values of labels with a
+            # scheduled activation may have just been prewarmed
+            evictable = [
+                value
+                for value, labels in loaded
+                if not any(self._is_in_use(label) for label in labels)
+            ]
+            evictable.sort(key=lambda value: value._last_used)
+
+            for value in evictable:
+                if total <= budget:
+                    break
+                total -= value.loaded_size
+                value._evict()
+
+    def _is_in_use(self, label: str) -> bool:
+        if self._label_is_active.get(label, False):
+            return True
+        delay_state = self._label_delay_state.get(label)
+        return delay_state is not None and delay_state[TRIGGER].timer is not None
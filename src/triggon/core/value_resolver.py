@@ -1,9 +1,9 @@
 import ast
 import inspect
-from types import FrameType
 from typing import Any, NamedTuple
 
 from .._internal._types.aliases import VarKey
+from .._internal._types.structs import TargetScope
 from .._internal.keys import GLOB_VAR, LOC_VAR, MODULE_SCOPE
 from .._internal.sentinel import _NO_VALUE
 from ..errors.public import InvalidArgumentError
@@ -82,7 +82,7 @@ DISALLOWED_NODES = (
 )
 
 
-def evaluate_cond(frame: FrameType, expr: str) -> bool:
+def evaluate_cond(scope: TargetScope, expr: str) -> bool:
     try:
         tree = ast.parse(expr, mode="eval")
     except SyntaxError:
@@ -99,7 +99,7 @@ def evaluate_cond(frame: FrameType, expr: str) -> bool:
             raise InvalidArgumentError("cond: unsupported expression syntax")
 
         if isinstance(node, ast.Name):
-            value = _lookup_value_for_eval(frame, node.id)
+            value = _lookup_value_for_eval(scope, node.id)
             if value is _NO_VALUE:
                 continue
             var_scope[node.id] = value
@@ -109,7 +109,7 @@ def evaluate_cond(frame: FrameType, expr: str) -> bool:
                 v = v.value
 
             if isinstance(v, ast.Name):
-                value = _lookup_value_for_eval(frame, v.id)
+                value = _lookup_value_for_eval(scope, v.id)
                 if value is _NO_VALUE:
                     continue
                 var_scope[v.id] = value
@@ -133,15 +133,15 @@ def evaluate_cond(frame: FrameType, expr: str) -> bool:
         return result
 
 
-def _lookup_value_for_eval(frame: FrameType, name: str) -> Any:
+def _lookup_value_for_eval(scope: TargetScope, name: str) -> Any:
     if name in ALLOWED_FUNCS:
         return _NO_VALUE
 
     try:
-        return frame.f_locals[name]
+        return scope.f_locals[name]
     except KeyError:
         try:
-            return frame.f_globals[name]
+            return scope.f_globals[name]
         except KeyError:
             raise NameError(f"cond: {name!r} is not defined") from None
 
@@ -162,7 +162,7 @@ def _ensure_allowed_call(node: ast.Call) -> None:
 
 def resolve_ref_info(
     target_name: str,
-    frame: FrameType,
+    scope: TargetScope,
     allow_loc_var: bool = False,
 ) -> VarResult | AttrResult:
     if "." in target_name:
@@ -174,18 +174,18 @@ def resolve_ref_info(
     else:
         has_attr_chain = False
 
-    value = frame.f_locals.get(target_name, _NO_VALUE)
-    scope_name = frame.f_code.co_name
+    value = scope.f_locals.get(target_name, _NO_VALUE)
+    scope_name = scope.scope_name
 
     if value is not _NO_VALUE and not has_attr_chain:
         if not allow_loc_var:
-            if frame.f_globals is not frame.f_locals:
+            if scope.f_globals is not scope.f_locals:
                 raise InvalidArgumentError(f"local variables cannot be registered: {target_name!r}")
         else:
             return VarResult(kind=LOC_VAR, value=value, scope_name=scope_name)
     if value is _NO_VALUE:
         scope_name = MODULE_SCOPE
-        value = frame.f_globals.get(target_name, _NO_VALUE)
+        value = scope.f_globals.get(target_name, _NO_VALUE)
         if value is _NO_VALUE:
             raise NameError(f"{target_name!r} is not defined")
 
@@ -1,4 +1,4 @@
-from collections.abc import Mapping, MutableMapping
+from collections.abc import Mapping, MutableMapping, Sequence
 from typing import TYPE_CHECKING, Any
 
 from .._internal._types.aliases import UpdateRefs
@@ -9,16 +9,27 @@ from .._internal._types.structs import (
     RefMeta,
     VarRef,
 )
+from .._internal.buffers import copy_into, is_array_like, is_buffer_target, snapshot_buffer
 from .._internal.keys import LOG_VERBOSITY
 from .._internal.lock import UPDATE_LOCK
 from ..errors.public import UpdateError
-from ..trigfunc import TRIGFUNC_ATTR
+from ..lazy_value import LazyValue
+from ..trigfunc import DEFERRED_ATTR
+
+if TYPE_CHECKING:
+    from .sandbox import Sandbox
+
+# sentinels returned by ValueUpdater._get_assigned_value()
+_UNCHANGED = object()
+_COPIED = object()
 
 
 class ValueUpdater:
     debug: DebugConfig
-    _new_values: Mapping[str, tuple[Any, ...]]
+    _new_values: Mapping[str, Sequence[Any]]
     _id_meta: dict[int, RefMeta]
+    _inplace_data: dict[int, Any]  # buffer contents before an in-place switch
+    _sandboxes: list["Sandbox"]  # entered sandboxes, innermost last
 
     if TYPE_CHECKING:
 
@@ -34,78 +45,184 @@ class ValueUpdater:
 
         def find_update_refs(self, label: str, file: str) -> UpdateRefs: ...
 
+        def group_update_refs(
+            self,
+            label: str,
+            file: str,
+            f_globals: MutableMapping[str, Any],
+        ) -> list[tuple[MutableMapping[str, Any] | None, UpdateRefs]]: ...
+
     def update_values(
         self,
         label: str,
         idx: int | None,
         f_globals: MutableMapping[str, Any],
-        callsite: Callsite,
+        file: str,
         set_true: bool,
         update_refs: UpdateRefs | None = None,
+        staged: Mapping[int, Any] | None = None,
+        callsite: Callsite | None = None,
+        propagate: bool = False,
     ) -> None:
         debug_on = self.debug[LOG_VERBOSITY] > 1
         label_value = self._new_values[label]
 
-        if update_refs is None:
-            update_refs = self.find_update_refs(label, callsite.file)
+        groups: list[tuple[MutableMapping[str, Any] | None, UpdateRefs]]
+        if update_refs is not None:
+            groups = [(f_globals, update_refs)]
+        elif propagate:
+            groups = self.group_update_refs(label, file, f_globals)
+        else:
+            groups = [(f_globals, self.find_update_refs(label, file))]
 
-        for ref in update_refs:
-            new_value, label_idx = self._get_new_value_and_idx(
-                set_true,
-                label_value,
-                idx,
-                ref.ref_id,
-            )
+        if set_true and idx is not None and any(refs for _, refs in groups):
+            staged = _stage_lazy_value(label_value[idx], idx, staged)
 
-            # use a global lock for value assignment
+        for namespace, refs in groups:
+            # use a global lock for value assignment, held once per module
             with UPDATE_LOCK:
-                if isinstance(ref, AttrRef):
-                    # update attributes
-                    try:
-                        prev_value = getattr(ref.parent_obj, ref.attr_name)
-                        if prev_value == new_value:
-                            continue
-
-                        if set_true and hasattr(new_value, TRIGFUNC_ATTR):
-                            setattr(ref.parent_obj, ref.attr_name, new_value._run())
-                        else:
-                            setattr(ref.parent_obj, ref.attr_name, new_value)
-                    except (AttributeError, TypeError, ValueError) as e:
-                        raise UpdateError(ref.full_name, e) from None
-                    else:
-                        target_name = ref.full_name
-                elif isinstance(ref, VarRef):
-                    # update global variables
-                    try:
-                        prev_value = f_globals[ref.var_name]
-                        if prev_value == new_value:
-                            continue
-
-                        if set_true and hasattr(new_value, TRIGFUNC_ATTR):
-                            f_globals[ref.var_name] = new_value._run()
-                        else:
-                            f_globals[ref.var_name] = new_value
-                    except KeyError as e:
-                        raise UpdateError(ref.var_name, e) from None
-                    else:
-                        target_name = ref.var_name
-                else:
-                    raise AssertionError(f"unreachable ref class: {ref!r}")
-
-                if debug_on:
-                    self.log_value_update(
+                for ref in refs:
+                    self._update_ref(
+                        ref,
+                        namespace,
                         label,
-                        label_idx,
-                        prev_value,
-                        new_value,
-                        callsite,
-                        target_name,
+                        label_value,
+                        idx,
+                        set_true,
+                        staged,
+                        callsite if debug_on else None,
                     )
 
+    def _record_write(
+        self,
+        ref: VarRef | AttrRef,
+        f_globals: MutableMapping[str, Any] | None,
+        prev_value: Any,
+    ) -> None:
+        # sandboxes keep the value each target had before its first switch
+        for sandbox in self._sandboxes:
+            sandbox._record_write(ref, f_globals, prev_value)
+
+    def _update_ref(
+        self,
+        ref: VarRef | AttrRef,
+        f_globals: MutableMapping[str, Any] | None,
+        label: str,
+        label_value: Sequence[Any],
+        idx: int | None,
+        set_true: bool,
+        staged: Mapping[int, Any] | None,
+        callsite: Callsite | None,
+    ) -> None:
+        new_value, label_idx = self._get_new_value_and_idx(
+            set_true,
+            label_value,
+            idx,
+            ref.ref_id,
+        )
+
+        if isinstance(ref, AttrRef):
+            parent_obj = ref.parent_obj
+            if parent_obj is None:
+                # the parent was collected and the ref is waiting to be purged
+                return
+
+            # update attributes
+            try:
+                prev_value = getattr(parent_obj, ref.attr_name)
+                value = self._get_assigned_value(
+                    ref.ref_id, prev_value, new_value, set_true, label_idx, staged
+                )
+                if value is _UNCHANGED:
+                    return
+                if value is not _COPIED:
+                    self._record_write(ref, None, prev_value)
+                    setattr(parent_obj, ref.attr_name, value)
+            except (AttributeError, TypeError, ValueError) as e:
+                raise UpdateError(ref.full_name, e) from None
+            else:
+                target_name = ref.full_name
+        elif isinstance(ref, VarRef):
+            if f_globals is None:
+                # the module of a propagated ref has been unloaded
+                return
+
+            # update global variables
+            try:
+                prev_value = f_globals[ref.var_name]
+                value = self._get_assigned_value(
+                    ref.ref_id, prev_value, new_value, set_true, label_idx, staged
+                )
+                if value is _UNCHANGED:
+                    return
+                if value is not _COPIED:
+                    self._record_write(ref, f_globals, prev_value)
+                    f_globals[ref.var_name] = value
+            except KeyError as e:
+                raise UpdateError(ref.var_name, e) from None
+            else:
+                target_name = ref.var_name
+        else:
+            raise AssertionError(f"unreachable ref class: {ref!r}")
+
+        if callsite is not None:
+            self.log_value_update(
+                label,
+                label_idx,
+                prev_value,
+                new_value,
+                callsite,
+                target_name,
+            )
+
+    def _get_assigned_value(
+        self,
+        ref_id: int,
+        prev_value: Any,
+        new_value: Any,
+        set_true: bool,
+        label_idx: int | None,
+        staged: Mapping[int, Any] | None,
+    ) -> Any:
+        # return the value to assign, or _UNCHANGED / _COPIED when the
+        # target needs no assignment
+        meta = self._id_meta[ref_id]
+
+        if not set_true:
+            saved = self._inplace_data.pop(ref_id, None)
+            if saved is not None:
+                # undo the in-place switch; edits made after it are not kept
+                copy_into(meta.orig_val, saved)
+                return _COPIED if prev_value is meta.orig_val else meta.orig_val
+
+        # only the registered buffer itself is switched in place
+        in_place = set_true and prev_value is meta.orig_val and is_buffer_target(prev_value)
+
+        if is_array_like(prev_value) or is_array_like(new_value):
+            # arrays are compared by identity, never elementwise
+            if prev_value is new_value:
+                return _UNCHANGED
+        elif prev_value == new_value:
+            return _UNCHANGED
+
+        if set_true and hasattr(new_value, DEFERRED_ATTR):
+            new_value = _run_or_staged(new_value, label_idx, staged)
+
+        # copy into the registered buffer so that existing views see the change
+        if in_place:
+            # keep the contents from before the first in-place switch
+            saved = self._inplace_data.get(ref_id)
+            if saved is None:
+                saved = snapshot_buffer(prev_value)
+            if saved is not None and copy_into(prev_value, new_value):
+                self._inplace_data[ref_id] = saved
+                return _COPIED
+        return new_value
+
     def _get_new_value_and_idx(
         self,
         set_true: bool,
-        label_value: tuple[Any, ...],
+        label_value: Sequence[Any],
         idx: int | None,
         ref_id: int,
     ) -> tuple[Any, int | None]:
@@ -117,3 +234,20 @@ class ValueUpdater:
             new_value = label_value[idx]
 
         return new_value, idx
+
+
+def _stage_lazy_value(
+    value: Any, idx: int, staged: Mapping[int, Any] | None
+) -> Mapping[int, Any] | None:
+    # load before the global lock is taken, so a slow loader does not
+    # block the updates of other instances
+    if not isinstance(value, LazyValue) or (staged is not None and idx in staged):
+        return staged
+    return {**(staged or {}), idx: value._run()}
+
+
+def _run_or_staged(value: Any, idx: int | None, staged: Mapping[int, Any] | None) -> Any:
+    # prewarmed results make the activation a plain assignment
+    if staged is not None and idx in staged:
+        return staged[idx]
+    return value._run()
@@ -0,0 +1,155 @@
+import logging
+import queue
+import threading
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+from typing import Any
+
+from ..trigfunc import TrigFunc
+from ..trigfunc.trigfunc import _run_deferred
+
+type WorkItem = tuple[TrigFunc | Callable[[], Any], Future[Any]]
+
+DEFAULT_MAXSIZE = 1024
+DEFAULT_BATCH_SIZE = 64
+
+
+class LabelQueue:
+    """Bounded queue of work waiting for one label to become active."""
+
+    __slots__ = ("maxsize", "batch_size", "executor", "_items", "_cond")
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        executor: Executor | None = None,
+    ) -> None:
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.executor = executor
+        self._items: deque[WorkItem] = deque()
+        self._cond = threading.Condition(threading.Lock())
+
+    def configure(self, executor: Executor | None, maxsize: int, batch_size: int) -> None:
+        with self._cond:
+            self.executor = executor
+            self.maxsize = maxsize
+            self.batch_size = batch_size
+            # a larger maxsize may release waiting producers
+            self._cond.notify_all()
+
+    def put(self, item: WorkItem, block: bool, timeout: int | float | None) -> None:
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                if not block:
+                    raise queue.Full
+                # backpressure: wait until a drain frees a slot
+                if not self._cond.wait_for(lambda: len(self._items) < self.maxsize, timeout):
+                    raise queue.Full
+            self._items.append(item)
+
+    def take_batch(self) -> list[WorkItem]:
+        with self._cond:
+            n = min(self.batch_size, len(self._items))
+            batch = [self._items.popleft() for _ in range(n)]
+            if batch:
+                self._cond.notify_all()
+        return batch
+
+
+class WorkQueueDispatcher:
+    _logger: logging.Logger | None
+    _label_is_active: dict[str, bool]
+    _work_queues: dict[str, LabelQueue]
+    _lock: threading.Lock
+
+    def get_work_queue(self, label: str) -> LabelQueue:
+        label_queue = self._work_queues.get(label)
+        if label_queue is not None:
+            return label_queue
+
+        with self._lock:
+            label_queue = self._work_queues.get(label)
+            if label_queue is None:
+                label_queue = LabelQueue()
+                self._work_queues[label] = label_queue
+        return label_queue
+
+    def enqueue_work(
+        self,
+        label: str,
+        target: TrigFunc | Callable[[], Any],
+        block: bool,
+        timeout: int | float | None,
+    ) -> Future[Any]:
+        future: Future[Any] = Future()
+        self.get_work_queue(label).put((target, future), block, timeout)
+
+        if self._label_is_active[label]:
+            # the label may have become active before the item was queued
+            self.drain_work_queue(label)
+        return future
+
+    def drain_work_queue(self, label: str) -> None:
+        label_queue = self._work_queues.get(label)
+        if label_queue is None:
+            return
+
+        # stop between batches if the label is reverted while draining
+        while self._label_is_active[label]:
+            batch = label_queue.take_batch()
+            if not batch:
+                return
+
+            for target, future in batch:
+                self._dispatch_work(target, future, label_queue.executor)
+
+    def _dispatch_work(
+        self,
+        target: TrigFunc | Callable[[], Any],
+        future: Future[Any],
+        executor: Executor | None,
+    ) -> None:
+        if not future.set_running_or_notify_cancel():
+            # cancelled while waiting in the queue
+            return
+
+        if executor is None:
+            try:
+                if isinstance(target, TrigFunc):
+                    result = target._run()
+                else:
+                    result = target()
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            return
+
+        try:
+            if isinstance(target, TrigFunc):
+                inner = executor.submit(_run_deferred, target)
+            else:
+                inner = executor.submit(target)
+        except Exception as e:
+            # e.g. the executor was shut down
+            future.set_exception(e)
+            if self._logger is not None:
+                self._logger.exception(e)
+            return
+
+        inner.add_done_callback(lambda done: _copy_future_state(done, future))
+
+
+def _copy_future_state(source: Future[Any], dest: Future[Any]) -> None:
+    if source.cancelled():
+        dest.set_exception(RuntimeError("queued work was cancelled by the executor"))
+        return
+
+    exc = source.exception()
+    if exc is None:
+        dest.set_result(source.result())
+    else:
+        dest.set_exception(exc)
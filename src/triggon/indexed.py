@@ -0,0 +1,155 @@
+import mmap
+import os
+from collections.abc import Mapping, Sequence
+from typing import Any, overload
+
+from ._internal.sentinel import _NO_VALUE
+from .errors.public import InvalidArgumentError
+
+
+class IndexedValues(Sequence[Any]):
+    """Indexed values of a label backed by compact or sparse storage.
+
+    Pass an instance as the value of a label to keep its indexed values in
+    the given storage instead of a tuple. Values are read by index when a
+    label is applied, so no Python object is created per element up front.
+
+    Args:
+        data (Sequence[Any] | Mapping[int, Any]):
+            The backing storage, such as an `array.array`, a `memoryview`,
+            or a one-dimensional NumPy array. A mapping from index to value
+            stores sparse indexed values.
+        size (int | None, optional):
+            The number of indices of sparse values. Defaults to the largest
+            index plus one. Ignored for dense storage.
+        default (Any, optional):
+            The value of sparse indices missing from `data`. If omitted,
+            missing indices are out of range.
+
+    Raises:
+        InvalidArgumentError:
+            If `data` is empty, or if a sparse index is negative or not
+            smaller than `size`.
+        TypeError:
+            If `data` cannot be indexed, or if a sparse index is not an int.
+
+    Examples:
+        >>> limits = IndexedValues(array.array("i", range(50_000)))
+        >>> tg = Triggon.from_label("limit", new_values=limits)
+        >>> tg.switch_lit("limit", 0, indices=42_000)
+        42000
+    """
+
+    __slots__ = ("_data", "_size", "_default", "_sparse", "_scalar")
+
+    def __init__(
+        self,
+        data: Sequence[Any] | Mapping[int, Any],
+        /,
+        *,
+        size: int | None = None,
+        default: Any = _NO_VALUE,
+    ) -> None:
+        if isinstance(data, Mapping):
+            self._init_sparse(data, size)
+            self._sparse = True
+        else:
+            if not hasattr(data, "__getitem__") or not hasattr(data, "__len__"):
+                raise TypeError(f"data must be indexable, got {type(data).__name__}")
+            self._size = len(data)
+            self._sparse = False
+
+        if self._size == 0:
+            raise InvalidArgumentError("data must not be empty")
+
+        self._data: Any = data
+        self._default = default
+        # NumPy scalars are converted to Python objects on access
+        self._scalar = getattr(data, "ndim", None) == 1 and hasattr(data, "dtype")
+
+    def _init_sparse(self, data: Mapping[int, Any], size: int | None) -> None:
+        for idx in data:
+            if not isinstance(idx, int) or isinstance(idx, bool):
+                raise TypeError(f"sparse indices must be int, got {type(idx).__name__}")
+            if idx < 0:
+                raise InvalidArgumentError(f"sparse index must not be negative: {idx}")
+
+        if size is None:
+            size = max(data, default=-1) + 1
+        elif any(idx >= size for idx in data):
+            raise InvalidArgumentError(f"sparse indices must be smaller than size {size}")
+        self._size = size
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | os.PathLike[str],
+        /,
+        typecode: str,
+        *,
+        offset: int = 0,
+    ) -> "IndexedValues":
+        """Return values backed by a read-only memory-mapped file.
+
+        The file is read as a packed array of `typecode` items (as in the
+        `array` module), starting at byte `offset`. Pages are loaded by the
+        operating system only when their indices are accessed.
+
+        Raises:
+            InvalidArgumentError:
+                If the file is empty, if `typecode` is invalid, or if the
+                size of the mapped data is not a multiple of the item size.
+        """
+
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap cannot map an empty file
+                raise InvalidArgumentError(f"cannot map {os.fspath(path)!r}: the file is empty")
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        base = memoryview(mapped)
+        view = base[offset:]
+        try:
+            values = view.cast(typecode)
+        except (TypeError, ValueError) as e:
+            view.release()
+            base.release()
+            mapped.close()
+            raise InvalidArgumentError(
+                f"cannot read {os.fspath(path)!r} as {typecode!r}: {e}"
+            ) from None
+
+        return cls(values)
+
+    def has_index(self, idx: int) -> bool:
+        if not 0 <= idx < self._size:
+            return False
+        if self._sparse and self._default is _NO_VALUE:
+            return idx in self._data
+        return True
+
+    def __len__(self) -> int:
+        return self._size
+
+    @overload
+    def __getitem__(self, idx: int) -> Any: ...
+    @overload
+    def __getitem__(self, idx: slice) -> tuple[Any, ...]: ...
+
+    def __getitem__(self, idx: int | slice) -> Any:
+        if isinstance(idx, slice):
+            return tuple(self[i] for i in range(*idx.indices(self._size)))
+
+        if self._sparse:
+            if 0 <= idx < self._size:
+                value = self._data.get(idx, self._default)
+                if value is not _NO_VALUE:
+                    return value
+            raise IndexError(f"index {idx} is out of range")
+
+        value = self._data[idx]
+        return value.item() if self._scalar else value
+
+    def __repr__(self) -> str:
+        kind = "sparse" if self._sparse else type(self._data).__name__
+        return f"IndexedValues(<{kind}>, size={self._size})"
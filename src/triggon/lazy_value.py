@@ -0,0 +1,100 @@
+import itertools
+import sys
+import threading
+import weakref
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from ._internal import check_non_negative_int
+from .trigfunc import DEFERRED_ATTR
+
+if TYPE_CHECKING:
+    from .api import Triggon
+
+_NOT_LOADED: Any = object()
+_clock = itertools.count()
+
+
+class LazyValue:
+    """Label value that is built on first use.
+
+    Use it for heavy values, such as alternate model weights or large
+    lookup tables, so they are not built when the labels are registered.
+    The loader runs the first time the value is applied or read while its
+    label is active, and its result is reused until the value is evicted.
+    One instance may be placed at several indices or labels and is loaded
+    only once.
+
+    When a memory budget is set with `Triggon.configure_value_budget()`,
+    loaded values of inactive labels are evicted, least recently used
+    first, and loaded again on the next use.
+
+    Args:
+        loader (Callable[[], Any]):
+            A function without arguments that builds the value.
+        size_hint (int | None, optional):
+            The size of the loaded value in bytes, counted against the
+            budget. If omitted, `sys.getsizeof()` of the loaded value is
+            used, which does not include referenced objects.
+
+    Raises:
+        TypeError:
+            If `loader` is not callable.
+        InvalidArgumentError:
+            If `size_hint` is negative.
+    """
+
+    __slots__ = ("_loader", "_size_hint", "_value", "_size", "_last_used", "_lock", "_owners")
+
+    def __init__(self, loader: Callable[[], Any], /, *, size_hint: int | None = None) -> None:
+        if not callable(loader):
+            raise TypeError(f"loader must be callable, got {type(loader).__name__}")
+        if size_hint is not None:
+            check_non_negative_int(size_hint, arg_name="size_hint")
+
+        self._loader = loader
+        self._size_hint = size_hint
+        self._value = _NOT_LOADED
+        self._size = 0
+        self._last_used = 0
+        self._lock = threading.Lock()
+        self._owners: weakref.WeakSet["Triggon"] = weakref.WeakSet()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._value is not _NOT_LOADED
+
+    @property
+    def loaded_size(self) -> int:
+        # 0 while not loaded
+        return self._size
+
+    def _run(self) -> Any:
+        # loaders run under the value's own lock, never the instance lock,
+        # so concurrent first uses load once without blocking other calls
+        with self._lock:
+            value = self._value
+            loaded = value is _NOT_LOADED
+            if loaded:
+                value = self._loader()
+                self._value = value
+                self._size = sys.getsizeof(value) if self._size_hint is None else self._size_hint
+            self._last_used = next(_clock)
+
+        if loaded:
+            for owner in tuple(self._owners):
+                owner.enforce_value_budget()
+        return value
+
+    def _evict(self) -> None:
+        with self._lock:
+            self._value = _NOT_LOADED
+            self._size = 0
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyValue {getattr(self._loader, '__qualname__', self._loader)!r} ({state})>"
+
+
+# executed via _run() when applied, like values deferred by TrigFunc
+setattr(LazyValue, DEFERRED_ATTR, True)
@@ -0,0 +1,27 @@
+"""pytest plugin that isolates Triggon state between tests.
+
+The plugin is registered through the `pytest11` entry point and provides
+the `triggon_sandbox` fixture. Request it in a test, or make it autouse in
+a `conftest.py`, to restore every live `Triggon` instance after the test:
+
+    @pytest.fixture(autouse=True)
+    def _isolate(triggon_sandbox):
+        yield
+"""
+
+from collections.abc import Iterator
+from contextlib import ExitStack
+
+import pytest
+
+from .api import Triggon
+
+
+@pytest.fixture
+def triggon_sandbox() -> Iterator[None]:
+    """Sandbox every Triggon instance that exists when the test starts."""
+
+    with ExitStack() as stack:
+        for tg in list(Triggon._instances):
+            stack.enter_context(tg.sandbox())
+        yield
@@ -0,0 +1,59 @@
+from collections.abc import Sequence
+from typing import Any
+
+from ._internal.sentinel import _NO_VALUE
+from .errors.public import InvalidArgumentError
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "switch_array() requires NumPy; install it with 'pip install triggon[numpy]'"
+        ) from None
+    return numpy
+
+
+def select_array(values: Sequence[Any], choices: Any, originals: Any) -> Any:
+    """Return a new array with the value of the chosen label per element.
+
+    `values` holds the value of each candidate label in priority order, or
+    `_NO_VALUE` for an inactive label. Each step below is one vectorized pass
+    over the elements, repeated only for active labels.
+    """
+
+    np = _import_numpy()
+    choices = np.asarray(choices)
+    originals = np.asarray(originals)
+    num_labels = len(values)
+
+    if choices.dtype == np.bool_:
+        # one mask per label, where the first active label with True wins
+        if choices.ndim == 0 or choices.shape[0] != num_labels:
+            raise InvalidArgumentError(
+                f"choices: expected {num_labels} masks (one per label), got shape {choices.shape}"
+            )
+        masks = choices
+        shape = np.broadcast_shapes(masks.shape[1:], originals.shape)
+        result = originals
+        for i in reversed(range(num_labels)):
+            if values[i] is not _NO_VALUE:
+                result = np.where(masks[i], values[i], result)
+    elif np.issubdtype(choices.dtype, np.integer):
+        # negative ids select the original value
+        if choices.size and choices.max() >= num_labels:
+            raise InvalidArgumentError(
+                f"choices: label ids must be smaller than {num_labels}, got {choices.max()}"
+            )
+        shape = np.broadcast_shapes(choices.shape, originals.shape)
+        result = originals
+        for i, value in enumerate(values):
+            if value is not _NO_VALUE:
+                result = np.where(choices == i, value, result)
+    else:
+        raise TypeError(f"choices must be an integer or boolean array, got dtype {choices.dtype}")
+
+    if result is originals:
+        result = np.broadcast_to(result, shape).copy()
+    return result
@@ -0,0 +1,65 @@
+from typing import TYPE_CHECKING, Any, Self, overload
+
+from .trigfunc import DEFERRED_ATTR
+
+if TYPE_CHECKING:
+    from .api import Triggon
+
+
+class SwitchAttr:
+    """Class attribute whose value follows the state of labels.
+
+    Created by `Triggon.attr()`. Reading the attribute from an instance
+    returns the value of the first active label, or the default when no
+    label is active. Nothing is stored per instance, so activating a label
+    costs the same no matter how many instances exist.
+
+    Assigning the attribute on an instance stores a plain instance
+    attribute, which then takes precedence over the switched value.
+    """
+
+    __slots__ = ("_tg", "_choices", "_default", "_name")
+
+    def __init__(
+        self,
+        tg: "Triggon",
+        choices: tuple[tuple[str, int], ...],
+        default: Any,
+    ) -> None:
+        self._tg = tg
+        self._choices = choices
+        self._default = default
+        self._name: str | None = None
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    @overload
+    def __get__(self, instance: None, owner: type | None = None) -> Self: ...
+    @overload
+    def __get__(self, instance: object, owner: type | None = None) -> Any: ...
+
+    def __get__(self, instance: object | None, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+
+        tg = self._tg
+        for label, idx in self._choices:
+            if tg._label_is_active[label]:
+                value = tg._new_values[label][idx]
+                if hasattr(value, DEFERRED_ATTR):
+                    value = value._run()
+                return value
+
+        return self._default
+
+    @property
+    def labels(self) -> tuple[str, ...]:
+        return tuple(label for label, _ in self._choices)
+
+    @property
+    def default(self) -> Any:
+        return self._default
+
+    def __repr__(self) -> str:
+        return f"<SwitchAttr {self._name or '?'} labels={self.labels!r}>"
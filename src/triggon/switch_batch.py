@@ -0,0 +1,57 @@
+from collections.abc import Hashable
+from typing import TYPE_CHECKING, Any
+
+from .trigfunc import DEFERRED_ATTR
+
+if TYPE_CHECKING:
+    from .api import Triggon
+
+type _Item = tuple[tuple[tuple[str, int], ...], Any]
+
+
+class SwitchBatch:
+    """Validated form of a `switch_many()` spec.
+
+    Created by `Triggon.compile_switches()`. Labels and indices are resolved
+    once, so passing the batch to `switch_many()` skips all validation.
+    """
+
+    __slots__ = ("_tg", "_keys", "_items", "_labels")
+
+    def __init__(
+        self,
+        tg: "Triggon",
+        keys: tuple[Hashable, ...] | None,
+        items: tuple[_Item, ...],
+    ) -> None:
+        self._tg = tg
+        self._keys = keys  # None when the spec was a sequence
+        self._items = items
+        self._labels = tuple(dict.fromkeys(label for choices, _ in items for label, _ in choices))
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def resolve(self) -> dict[Hashable, Any] | tuple[Any, ...]:
+        tg = self._tg
+        # read every flag at once, so the batch sees one consistent state
+        with tg._lock:
+            active = {label: tg._label_is_active[label] for label in self._labels}
+
+        results = []
+        for choices, orig_val in self._items:
+            value = orig_val
+            for label, idx in choices:
+                if active[label]:
+                    value = tg._new_values[label][idx]
+                    if hasattr(value, DEFERRED_ATTR):
+                        value = value._run()
+                    break
+            results.append(value)
+
+        if self._keys is None:
+            return tuple(results)
+        return dict(zip(self._keys, results))
+
+    def __repr__(self) -> str:
+        return f"<SwitchBatch items={len(self._items)} labels={len(self._labels)}>"
@@ -0,0 +1,61 @@
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from .trigfunc import DEFERRED_ATTR
+
+if TYPE_CHECKING:
+    from .api import Triggon
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+def stream_chunks(
+    tg: "Triggon",
+    choices: tuple[tuple[str, int], ...],
+    iterable: Iterable[Any],
+    default: Callable[[Any], Any] | None,
+    chunk_size: int,
+) -> Iterator[Any]:
+    """Yield transformed items, choosing the transform once per chunk."""
+
+    labels = tuple(label for label, _ in choices)
+    items = iter(iterable)
+
+    while True:
+        chunk = tuple(islice(items, chunk_size))
+        if not chunk:
+            return
+
+        with tg._lock:
+            active = [tg._label_is_active[label] for label in labels]
+        transform = _get_transform(tg, choices, active, default)
+
+        if transform is None:
+            yield from chunk
+        else:
+            for item in chunk:
+                yield transform(item)
+
+
+def _get_transform(
+    tg: "Triggon",
+    choices: tuple[tuple[str, int], ...],
+    active: list[bool],
+    default: Callable[[Any], Any] | None,
+) -> Callable[[Any], Any] | None:
+    for is_active, (label, idx) in zip(active, choices):
+        if not is_active:
+            continue
+
+        transform = tg._new_values[label][idx]
+        if hasattr(transform, DEFERRED_ATTR):
+            transform = transform._run()
+        if not callable(transform):
+            raise TypeError(
+                f"value of label {label!r} must be callable to transform items, "
+                f"got {type(transform).__name__}"
+            )
+        return transform
+
+    return default
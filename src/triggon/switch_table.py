@@ -0,0 +1,92 @@
+from typing import TYPE_CHECKING, Any
+
+from .trigfunc import DEFERRED_ATTR
+
+if TYPE_CHECKING:
+    from .api import Triggon
+
+NEGATION = "!"
+
+_NO_MATCH = -1
+
+
+class SwitchTable:
+    """Value chosen by which combination of labels is active.
+
+    Created by `Triggon.switch_table()`. Each rule is compiled into a mask
+    of labels that must be active and a mask of labels that must not be.
+    The active labels of the table are read into one bitmask, and the rule
+    matching each bitmask is found once and stored, so resolving a known
+    combination is a dict lookup. The result is also kept until any label
+    of the instance is activated or deactivated.
+    """
+
+    __slots__ = ("_tg", "_labels", "_rules", "_values", "_default", "_lookup", "_state")
+
+    def __init__(
+        self,
+        tg: "Triggon",
+        labels: tuple[str, ...],
+        rules: tuple[tuple[int, int], ...],
+        values: tuple[Any, ...],
+        default: Any,
+    ) -> None:
+        self._tg = tg
+        self._labels = labels
+        self._rules = rules  # (required mask, forbidden mask) per rule
+        self._values = values
+        self._default = default
+        self._lookup: dict[int, int] = {}
+        self._state = (-1, _NO_MATCH)  # (epoch, matched rule), replaced as one object
+
+    def resolve(self) -> Any:
+        """Return the value of the first rule that matches the active labels.
+
+        If the value is deferred by `TrigFunc`, it is executed and its
+        result is returned.
+        """
+
+        tg = self._tg
+        epoch = tg._epoch
+        state_epoch, rule = self._state
+        if state_epoch != epoch:
+            with tg._lock:
+                mask = 0
+                for bit, label in enumerate(self._labels):
+                    if tg._label_is_active[label]:
+                        mask |= 1 << bit
+
+            rule = self._lookup.get(mask)
+            if rule is None:
+                rule = self._lookup[mask] = self._match(mask)
+            # a flag flipped while resolving leaves the result stale, so the
+            # epoch read before resolving is stored
+            self._state = (epoch, rule)
+
+        if rule == _NO_MATCH:
+            return self._default
+
+        value = self._values[rule]
+        if hasattr(value, DEFERRED_ATTR):
+            value = value._run()
+        return value
+
+    def _match(self, mask: int) -> int:
+        for i, (required, forbidden) in enumerate(self._rules):
+            if mask & required == required and not mask & forbidden:
+                return i
+        return _NO_MATCH
+
+    @property
+    def labels(self) -> tuple[str, ...]:
+        return self._labels
+
+    @property
+    def default(self) -> Any:
+        return self._default
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def __repr__(self) -> str:
+        return f"<SwitchTable rules={len(self._rules)} labels={self._labels!r}>"
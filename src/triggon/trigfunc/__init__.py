@@ -1,3 +1,3 @@
-from .trigfunc import TRIGFUNC_ATTR, TrigFunc
+from .trigfunc import DEFERRED_ATTR, TRIGFUNC_ATTR, TrigFunc
 
-__all__ = ["TrigFunc", "TRIGFUNC_ATTR"]
+__all__ = ["TrigFunc", "DEFERRED_ATTR", "TRIGFUNC_ATTR"]
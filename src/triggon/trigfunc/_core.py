@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import builtins
+import weakref
 from collections.abc import Callable, Mapping
 from dataclasses import dataclass
-from types import FrameType
+from types import FrameType, ModuleType
 from typing import Any, Literal, cast
 
 from .._internal.frames import get_target_frame
+from .._internal.rate_limit import TokenBucket
 from .._internal.sentinel import _NO_VALUE
 
 type AttrArg = tuple[Literal["attr"], str]
@@ -19,6 +21,20 @@ class _Core:
     _trigcall: _TrigCall | None
     _f_locals: Mapping[str, Any]
     _f_globals: Mapping[str, Any]
+    _module_ref: weakref.ref[ModuleType] | None
+    _bucket: TokenBucket | None
+    _fallback: Any
+
+    def _get_globals(self) -> Mapping[str, Any]:
+        if self._module_ref is None:
+            return self._f_globals
+
+        module = self._module_ref()
+        if module is None:
+            # the module was unloaded; names then raise NameError, and _run()
+            # retries them in the current user frame
+            return {}
+        return vars(module)
 
     def _resolve_value(
         self,
@@ -28,7 +44,7 @@ class _Core:
     ) -> Any:
         if frame is None:
             f_locals = self._f_locals
-            f_globals = self._f_globals
+            f_globals = self._get_globals()
         else:
             f_locals = frame.f_locals
             f_globals = frame.f_globals
@@ -48,12 +64,23 @@ class _Core:
 
         return value
 
-    def _run(self) -> Any:
+    def _resolve_root(self) -> Any:
+        # the object the chain starts from, or _NO_VALUE if it is not defined
+        assert self._trigcall is not None
+        try:
+            return self._resolve_value(self._trigcall.target[0][1])
+        except NameError:
+            return _NO_VALUE
+
+    def _run(self, use_bucket: bool = True) -> Any:
         if self._trigcall is None:
             raise TypeError("no deferred target to execute")
         if self._trigcall.target[-1][0] != "call":
             raise TypeError("deferred target must end with a function or method call")
 
+        if use_bucket and self._bucket is not None and not self._bucket.try_acquire():
+            return self._fallback
+
         obj = _NO_VALUE
 
         for v in self._trigcall.target:
@@ -86,14 +113,30 @@ class _Core:
 @dataclass(frozen=True, slots=True)
 class _TrigCall:
     target: tuple[AttrArg | CallArg, ...]
-    name: str  # only for debug
+
+    @property
+    def name(self) -> str:
+        # only for debug; built on demand because repr() of large
+        # arguments is expensive
+        parts = []
+        for v in self.target:
+            if v[0] == "attr":
+                parts.append(f".{v[1]}" if parts else v[1])
+            else:
+                arg_parts = [repr(arg) for arg in v[1]]
+                kwarg_parts = [f"{k}={val!r}" for k, val in v[2].items()]
+                parts.append(f"({', '.join(arg_parts + kwarg_parts)})")
+
+        return "".join(parts)
+
+    @property
+    def path(self) -> tuple[str, ...]:
+        # attribute names with call markers, used to identify the target
+        return tuple(v[1] if v[0] == "attr" else "()" for v in self.target)
 
     def add_attr(self, name: str) -> _TrigCall:
         attr_arg: AttrArg = ("attr", name)
-        return _TrigCall(
-            self.target + (attr_arg,),
-            f"{self.name}.{name}",
-        )
+        return _TrigCall(self.target + (attr_arg,))
 
     def add_call(
         self,
@@ -101,12 +144,4 @@ class _TrigCall:
         kwargs: dict[str, Any],
     ) -> _TrigCall:
         call_arg: CallArg = ("call", args, dict(kwargs))
-
-        arg_parts = [repr(arg) for arg in args]
-        kwarg_parts = [f"{k}={v!r}" for k, v in kwargs.items()]
-        joined = ", ".join(arg_parts + kwarg_parts)
-
-        return _TrigCall(
-            self.target + (call_arg,),
-            f"{self.name}({joined})",
-        )
+        return _TrigCall(self.target + (call_arg,))
@@ -1,10 +1,24 @@
+import copy
+import importlib
+import pickle
+import weakref
 from collections.abc import Mapping
+from types import MappingProxyType, ModuleType
 from typing import Any, Self
 
-from ._core import _Core, _TrigCall
+from ._core import AttrArg, CallArg, _Core, _TrigCall
 from .._internal.frames import get_target_frame
+from .._internal.rate_limit import TokenBucket
+from .._internal.utils import find_module
+from .._internal.validators import check_bool, check_rate
+from ..errors.public import InvalidArgumentError
 
 TRIGFUNC_ATTR = "__trigfunc__"
+# marks values that are executed via _run() when applied, such as TrigFunc
+# and LazyValue
+DEFERRED_ATTR = "__triggon_deferred__"
+
+_EMPTY_NAMESPACE: Mapping[str, Any] = MappingProxyType({})
 
 
 class TrigFunc(_Core):
@@ -14,13 +28,51 @@ class TrigFunc(_Core):
     executing them while the chain is being built. The recorded chain can be
     passed to APIs that execute deferred targets later.
 
+    By default, root names are resolved from the locals and globals of the
+    frame that created the instance, which keeps those locals alive as long
+    as the chain exists. Pass `namespace` to resolve names from an explicit
+    module or mapping without capturing the frame, or `weak=True` to capture
+    only a weak reference to the creating module.
+
+    When `rate` is given, every chain built from the instance shares one
+    token bucket. Once the bucket is empty, executing a chain returns
+    `fallback` instead of running the target. A `rate` passed to
+    `Triggon.trigger_call()` replaces this limit for that call.
+
+    A chain can be pickled, e.g. to run it in a process pool, when its root
+    name refers to a module or to an object reachable by an importable
+    `module:qualname` reference, and its arguments are picklable. The
+    unpickled chain resolves its root by importing it and does not carry the
+    rate limit.
+
+    Args:
+        namespace (ModuleType | Mapping[str, Any] | None, optional):
+            The module or mapping used to resolve root names. If omitted,
+            the creating frame is captured.
+        weak (bool, optional):
+            If True, local variables are not captured and the module is
+            referenced weakly. Names that cannot be resolved are looked up in
+            the frame that executes the chain.
+        rate (int | float | None, optional):
+            Maximum number of executions per second. If omitted, executions
+            are not limited.
+        burst (int, optional):
+            Number of executions allowed back to back before `rate` applies.
+        fallback (Any, optional):
+            The value returned when an execution is throttled.
+
     Examples:
         >>> chain_1 = TrigFunc().func()
         >>> f = TrigFunc()
         >>> chain_2 = f.obj.method(10)
         >>> chain_3 = f.A(10).method(20)
+        >>> flush = TrigFunc(rate=2).cache.flush()
+        >>> dump = TrigFunc(namespace=metrics).dump()
 
     Raises:
+        InvalidArgumentError:
+            If `rate` or `burst` is not positive, or if `weak` is combined
+            with a mapping namespace.
         TypeError:
             If a call is recorded before any target is bound, or if the
             deferred chain is executed before a target is bound or does not end
@@ -36,50 +88,146 @@ class TrigFunc(_Core):
     _trigcall: _TrigCall | None
     _f_locals: Mapping[str, Any]
     _f_globals: Mapping[str, Any]
+    _module_ref: weakref.ref[ModuleType] | None
+    _bucket: TokenBucket | None
+    _fallback: Any
 
     # Marker for functions that use this class
     __trigfunc__ = True
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        namespace: ModuleType | Mapping[str, Any] | None = None,
+        weak: bool = False,
+        rate: int | float | None = None,
+        burst: int = 1,
+        fallback: Any = None,
+    ) -> None:
+        check_bool(weak, arg_name="weak")
+        check_rate(rate, burst)
+
         self._trigcall = None
+        self._f_locals = _EMPTY_NAMESPACE
+        self._f_globals = _EMPTY_NAMESPACE
+        self._module_ref = None
+        self._bucket = None if rate is None else TokenBucket(rate, burst)
+        self._fallback = fallback
+
+        if namespace is not None:
+            self._bind_namespace(namespace, weak)
+            return
 
         frame = get_target_frame()
-        self._f_locals = frame.f_locals
-        self._f_globals = frame.f_globals
+        if weak:
+            module = find_module(frame.f_globals)
+            if module is None:
+                # globals without a module (e.g. exec) cannot be weakly referenced
+                self._f_globals = frame.f_globals
+            else:
+                self._module_ref = weakref.ref(module)
+        else:
+            self._f_locals = frame.f_locals
+            self._f_globals = frame.f_globals
         frame = None
 
-    @classmethod
-    def _clone_with(
-        cls,
-        tricall: _TrigCall,
-        f_locals: Mapping[str, Any],
-        f_globals: Mapping[str, Any],
-    ) -> Self:
-        new_cls = cls.__new__(cls)
+    def _bind_namespace(self, namespace: ModuleType | Mapping[str, Any], weak: bool) -> None:
+        if isinstance(namespace, ModuleType):
+            if weak:
+                self._module_ref = weakref.ref(namespace)
+            else:
+                self._f_globals = vars(namespace)
+        elif isinstance(namespace, Mapping):
+            if weak:
+                raise InvalidArgumentError("weak: a mapping namespace cannot be referenced weakly")
+            self._f_globals = namespace
+        else:
+            raise TypeError(
+                f"namespace must be ModuleType or Mapping, got {type(namespace).__name__}"
+            )
+
+    def _clone_with(self, tricall: _TrigCall | None) -> Self:
+        new_cls = type(self).__new__(type(self))
         new_cls._trigcall = tricall
-        new_cls._f_locals = f_locals
-        new_cls._f_globals = f_globals
+        new_cls._f_locals = self._f_locals
+        new_cls._f_globals = self._f_globals
+        new_cls._module_ref = self._module_ref
+        # clones share the bucket of the instance they were built from
+        new_cls._bucket = self._bucket
+        new_cls._fallback = self._fallback
         return new_cls
 
+    def __copy__(self) -> Self:
+        return self._clone_with(self._trigcall)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> Self:
+        return self._clone_with(copy.deepcopy(self._trigcall, memo))
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        if self._trigcall is None:
+            raise pickle.PicklingError("TrigFunc instance is not bound to a target")
+
+        root_name = self._trigcall.target[0][1]
+        try:
+            root = self._resolve_value(root_name)
+        except NameError:
+            raise pickle.PicklingError(f"TrigFunc root {root_name!r} is not defined") from None
+
+        return _rebuild_trigfunc, (_get_import_ref(root_name, root), self._trigcall.target)
+
     def __call__(self, *args: Any, **kwargs: Any) -> Self:
         if self._trigcall is None:
             raise TypeError("TrigFunc instance is not bound to a callable")
 
-        new_trigcall = self._trigcall.add_call(args, kwargs)
-        return type(self)._clone_with(
-            new_trigcall,
-            self._f_locals,
-            self._f_globals,
-        )
+        return self._clone_with(self._trigcall.add_call(args, kwargs))
 
     def __getattr__(self, name: str) -> Self:
         if self._trigcall is None:
-            new_trigcall = _TrigCall((("attr", name),), name)
+            new_trigcall = _TrigCall((("attr", name),))
         else:
             new_trigcall = self._trigcall.add_attr(name)
 
-        return type(self)._clone_with(
-            new_trigcall,
-            self._f_locals,
-            self._f_globals,
-        )
+        return self._clone_with(new_trigcall)
+
+
+setattr(TrigFunc, DEFERRED_ATTR, True)
+
+
+def _get_import_ref(root_name: str, root: Any) -> str:
+    # build a "module:qualname" reference that resolves back to `root`
+    if isinstance(root, ModuleType):
+        return root.__name__
+
+    module_name = getattr(root, "__module__", None)
+    qualname = getattr(root, "__qualname__", None)
+    if isinstance(module_name, str) and isinstance(qualname, str) and "<locals>" not in qualname:
+        ref = f"{module_name}:{qualname}"
+        try:
+            if _import_ref(ref) is root:
+                return ref
+        except (ImportError, AttributeError):
+            pass
+
+    raise pickle.PicklingError(
+        f"TrigFunc root {root_name!r} cannot be referenced by an importable name"
+    )
+
+
+def _import_ref(ref: str) -> Any:
+    module_name, _, qualname = ref.partition(":")
+    obj = importlib.import_module(module_name)
+    if qualname:
+        for name in qualname.split("."):
+            obj = getattr(obj, name)
+    return obj
+
+
+def _rebuild_trigfunc(ref: str, target: tuple[AttrArg | CallArg, ...]) -> TrigFunc:
+    root_name = target[0][1]
+    func = TrigFunc(namespace={root_name: _import_ref(ref)})
+    return func._clone_with(_TrigCall(target))
+
+
+def _run_deferred(target: TrigFunc, use_bucket: bool = True) -> Any:
+    # module-level so that it can be submitted to process pools
+    return target._run(use_bucket)
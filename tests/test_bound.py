@@ -0,0 +1,117 @@
+from pathlib import Path
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import Triggon
+from triggon import bound as bound_module
+
+
+def _make_module():
+    module = ModuleType("_bound_case")
+    module.__file__ = "/virtual/_bound_case.py"
+    module.LEVEL = 0
+    module.enabled = True
+    module.config = SimpleNamespace(mode="safe")
+    return module
+
+
+def _forbid_frames(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("frame inspected")
+
+    monkeypatch.setattr(bound_module, "get_target_frame", fail)
+
+
+def test_updates_bound_module_without_frames(monkeypatch):
+    module = _make_module()
+    tg = Triggon.from_labels({"A": 10, "B": "fast"})
+    ns = tg.bind(module)
+    _forbid_frames(monkeypatch)
+
+    ns.register_refs({"A": {"LEVEL": 0}, "B": {"config.mode": 0}})
+    ns.set_trigger(("A", "B"))
+
+    assert module.LEVEL == 10
+    assert module.config.mode == "fast"
+
+    ns.revert(("A", "B"))
+
+    assert module.LEVEL == 0
+    assert module.config.mode == "safe"
+
+
+def test_frame_calls_do_not_update_bound_refs():
+    module = _make_module()
+    tg = Triggon.from_label("A", new_values=10)
+    tg.bind(module).register_ref("A", name="LEVEL")
+
+    # refs are keyed by the module file, not by this test file
+    tg.set_trigger("A")
+
+    assert module.LEVEL == 0
+
+
+def test_accepts_globals_mapping():
+    namespace = {"__name__": "cfg", "LEVEL": 1}
+    tg = Triggon.from_label("A", new_values=5)
+    ns = tg.bind(namespace)
+
+    ns.register_ref("A", name="LEVEL")
+    ns.set_trigger("A")
+
+    assert namespace["LEVEL"] == 5
+    assert ns.namespace is namespace
+
+
+def test_evaluates_cond_in_namespace():
+    module = _make_module()
+    tg = Triggon.from_label("A", new_values=10)
+    ns = tg.bind(module)
+    ns.register_ref("A", name="LEVEL")
+
+    module.enabled = False
+    ns.set_trigger("A", cond="enabled")
+    assert module.LEVEL == 0
+
+    module.enabled = True
+    ns.set_trigger("A", cond="enabled")
+    assert module.LEVEL == 10
+
+
+def test_is_registered_and_unregister_refs():
+    module = _make_module()
+    tg = Triggon.from_label("A", new_values=10)
+    ns = tg.bind(module)
+
+    ns.register_ref("A", name="LEVEL")
+    assert ns.is_registered("LEVEL") is True
+    assert tg.is_registered("LEVEL") is False
+
+    ns.unregister_refs("LEVEL")
+    assert ns.is_registered("LEVEL") is False
+
+
+def test_rollback_restores_bound_names(monkeypatch):
+    module = _make_module()
+    ns = Triggon.from_label("A", new_values=1).bind(module)
+    _forbid_frames(monkeypatch)
+
+    with ns.rollback(("LEVEL", "config.mode")):
+        module.LEVEL = 3
+        module.config.mode = "fast"
+
+    assert module.LEVEL == 0
+    assert module.config.mode == "safe"
+
+
+def test_rejects_invalid_namespace():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(TypeError):
+        tg.bind(42)
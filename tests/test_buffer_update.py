@@ -0,0 +1,156 @@
+from pathlib import Path
+import array
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import Triggon
+from triggon._internal.buffers import copy_into, is_buffer_target, snapshot_buffer
+
+WEIGHTS = array.array("d", [1.0, 2.0, 3.0])
+
+
+@pytest.fixture(autouse=True)
+def _reset_weights():
+    global WEIGHTS
+    WEIGHTS = array.array("d", [1.0, 2.0, 3.0])
+
+
+def test_buffer_target_is_updated_in_place():
+    orig = WEIGHTS
+    view = memoryview(WEIGHTS)
+    tg = Triggon.from_label("A", new_values=[array.array("d", [0.5, 0.5, 0.5])])
+    tg.register_ref("A", name="WEIGHTS")
+
+    tg.set_trigger("A")
+
+    assert WEIGHTS is orig
+    assert view.tolist() == [0.5, 0.5, 0.5]
+
+    tg.revert("A")
+
+    assert WEIGHTS is orig
+    assert view.tolist() == [1.0, 2.0, 3.0]
+    view.release()
+
+
+def test_mismatched_buffer_is_rebound_and_restored():
+    orig = WEIGHTS
+    tg = Triggon.from_labels({"A": [array.array("d", [0.0] * 3)], "B": [array.array("d", [9.0])]})
+    tg.register_refs({"A": {"WEIGHTS": 0}, "B": {"WEIGHTS": 0}})
+
+    tg.set_trigger("A")
+    tg.set_trigger("B")
+
+    assert WEIGHTS is not orig
+    assert WEIGHTS.tolist() == [9.0]
+
+    tg.revert(("A", "B"))
+
+    # the original object is back, with the data it had when registered
+    assert WEIGHTS is orig
+    assert orig.tolist() == [1.0, 2.0, 3.0]
+
+
+def test_numpy_array_views_see_the_switched_data():
+    np = pytest.importorskip("numpy")
+    config = SimpleNamespace(limits=np.arange(4.0))
+    orig = config.limits
+    view = config.limits[1:]
+    tg = Triggon.from_label("A", new_values=[np.full(4, 7.0)])
+    tg.register_ref("A", name="config.limits")
+
+    tg.set_trigger("A")
+    # a second activation compares by identity instead of elementwise
+    tg.set_trigger("A")
+
+    assert config.limits is orig
+    assert view.tolist() == [7.0, 7.0, 7.0]
+
+    tg.revert("A")
+
+    assert view.tolist() == [1.0, 2.0, 3.0]
+
+
+def test_revert_of_inactive_label_keeps_user_edits():
+    tg = Triggon.from_label("A", new_values=[array.array("d", [0.0] * 3)])
+    tg.register_ref("A", name="WEIGHTS")
+    WEIGHTS[0] = 42.0
+
+    tg.revert("A")
+
+    assert WEIGHTS.tolist() == [42.0, 2.0, 3.0]
+
+
+def test_revert_restores_data_from_activation():
+    tg = Triggon.from_label("A", new_values=[array.array("d", [0.0] * 3)])
+    tg.register_ref("A", name="WEIGHTS")
+    WEIGHTS[0] = 42.0
+
+    tg.set_trigger("A")
+    assert WEIGHTS.tolist() == [0.0, 0.0, 0.0]
+    tg.revert("A")
+    assert WEIGHTS.tolist() == [42.0, 2.0, 3.0]
+
+    # the next revert has nothing to undo
+    WEIGHTS[1] = 7.0
+    tg.revert("A")
+    assert WEIGHTS.tolist() == [42.0, 7.0, 3.0]
+
+
+def test_numpy_revert_of_inactive_label_keeps_user_edits():
+    np = pytest.importorskip("numpy")
+    config = SimpleNamespace(limits=np.zeros(3))
+    tg = Triggon.from_label("A", new_values=[np.ones(3)])
+    tg.register_ref("A", name="config.limits")
+    config.limits[0] = 42
+
+    tg.revert("A")
+
+    assert config.limits.tolist() == [42.0, 0.0, 0.0]
+
+
+def test_sandbox_restores_buffer_switched_in_place():
+    tg = Triggon.from_label("A", new_values=[array.array("d", [0.0] * 3)])
+    tg.register_ref("A", name="WEIGHTS")
+    orig = WEIGHTS
+
+    with tg.sandbox():
+        tg.set_trigger("A")
+        assert orig.tolist() == [0.0, 0.0, 0.0]
+
+    assert WEIGHTS is orig
+    assert orig.tolist() == [1.0, 2.0, 3.0]
+    assert not tg._inplace_data
+
+
+def test_numpy_shape_mismatch_rebinds():
+    np = pytest.importorskip("numpy")
+    config = SimpleNamespace(limits=np.zeros(2))
+    replacement = np.ones(5)
+    tg = Triggon.from_label("A", new_values=[replacement])
+    tg.register_ref("A", name="config.limits")
+
+    tg.set_trigger("A")
+
+    assert config.limits is replacement
+
+
+def test_read_only_buffers_are_not_buffer_targets():
+    assert not is_buffer_target(b"abc")
+    assert not is_buffer_target("abc")
+    assert is_buffer_target(bytearray(b"abc"))
+
+
+def test_copy_into_rejects_other_layouts():
+    target = array.array("i", [1, 2])
+
+    assert not copy_into(target, array.array("d", [1.0, 2.0]))
+    assert not copy_into(target, array.array("i", [1, 2, 3]))
+    assert copy_into(target, snapshot_buffer(array.array("i", [5, 6])))
+    assert target.tolist() == [5, 6]
@@ -0,0 +1,188 @@
+from pathlib import Path
+import sys
+import time
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import InvalidArgumentError, Triggon, UnregisteredLabelError
+
+MODE = "normal"
+
+
+@pytest.fixture(autouse=True)
+def _reset_mode():
+    global MODE
+    MODE = "normal"
+    yield
+    MODE = "normal"
+
+
+@pytest.fixture
+def tg():
+    return Triggon.from_labels(
+        {
+            "db_slow": None,
+            "cache_down": None,
+            "maintenance": None,
+            "degraded": "degraded",
+            "alert": None,
+        }
+    )
+
+
+def test_or_expression(tg):
+    tg.derive("degraded", "db_slow or cache_down")
+    assert not tg.is_triggered("degraded")
+
+    tg.set_trigger("db_slow")
+    assert tg.is_triggered("degraded")
+    tg.set_trigger("cache_down")
+    tg.revert("db_slow")
+    assert tg.is_triggered("degraded")
+    tg.revert("cache_down")
+    assert not tg.is_triggered("degraded")
+
+
+def test_and_not_and_parentheses(tg):
+    tg.derive("degraded", "(db_slow or cache_down) and not maintenance")
+
+    tg.set_trigger(["cache_down", "maintenance"])
+    assert not tg.is_triggered("degraded")
+    tg.revert("maintenance")
+    assert tg.is_triggered("degraded")
+
+
+def test_refs_are_updated_with_the_input(tg):
+    tg.register_ref("degraded", name="MODE")
+    tg.derive("degraded", "db_slow")
+
+    tg.set_trigger("db_slow")
+    assert MODE == "degraded"
+    tg.revert("db_slow")
+    assert MODE == "normal"
+
+
+def test_initial_state_is_applied(tg):
+    tg.register_ref("degraded", name="MODE")
+    tg.set_trigger("db_slow")
+
+    tg.derive("degraded", "db_slow")
+    assert tg.is_triggered("degraded")
+    assert MODE == "degraded"
+
+
+def test_chained_derived_labels(tg):
+    tg.derive("alert", "degraded and not maintenance")
+    tg.derive("degraded", "db_slow or cache_down")
+
+    tg.set_trigger("db_slow")
+    assert tg.is_triggered("degraded", "alert")
+    tg.set_trigger("maintenance")
+    assert not tg.is_triggered("alert")
+    assert tg.is_triggered("degraded")
+
+
+def test_delayed_input(tg):
+    tg.derive("degraded", "db_slow")
+
+    tg.set_trigger("db_slow", after=0.05)
+    assert not tg.is_triggered("degraded")
+    time.sleep(0.2)
+    assert tg.is_triggered("degraded")
+
+
+def test_redefining_replaces_expression(tg):
+    tg.derive("degraded", "db_slow")
+    tg.set_trigger("cache_down")
+    assert not tg.is_triggered("degraded")
+
+    tg.derive("degraded", "cache_down")
+    assert tg.is_triggered("degraded")
+    tg.set_trigger("db_slow")
+    tg.revert("cache_down")
+    assert not tg.is_triggered("degraded")
+
+
+def test_derived_labels_cannot_be_set_directly(tg):
+    tg.derive("degraded", "db_slow")
+
+    with pytest.raises(InvalidArgumentError):
+        tg.set_trigger("degraded")
+    with pytest.raises(InvalidArgumentError):
+        tg.revert("degraded")
+
+    tg.set_trigger(all=True)
+    assert tg.is_triggered("db_slow", "degraded")
+    tg.revert(all=True)
+    assert not tg.is_triggered("degraded")
+
+
+def test_sandbox_restores_definitions(tg):
+    with tg.sandbox():
+        tg.derive("degraded", "db_slow")
+        tg.set_trigger("db_slow")
+        assert tg.is_triggered("degraded")
+
+    assert not tg.is_triggered("db_slow", "degraded", match_all=False)
+    tg.set_trigger("degraded")
+    assert tg.is_triggered("degraded")
+
+
+@pytest.mark.parametrize(
+    "expr",
+    ["", "db_slow or", "and db_slow", "(db_slow", "db_slow)", "db_slow cache_down", "not"],
+)
+def test_invalid_expressions(tg, expr):
+    with pytest.raises(InvalidArgumentError):
+        tg.derive("degraded", expr)
+
+
+def test_cycles_are_rejected(tg):
+    tg.derive("degraded", "db_slow or alert")
+
+    with pytest.raises(InvalidArgumentError, match="depend on themselves"):
+        tg.derive("alert", "degraded")
+    with pytest.raises(InvalidArgumentError):
+        tg.derive("alert", "alert")
+
+    # the rejected definitions are not kept
+    tg.set_trigger("alert")
+    assert tg.is_triggered("degraded")
+
+
+def test_invalid_labels(tg):
+    with pytest.raises(UnregisteredLabelError):
+        tg.derive("degraded", "db_slow or missing")
+    with pytest.raises(UnregisteredLabelError):
+        tg.derive("missing", "db_slow")
+    with pytest.raises(InvalidArgumentError):
+        tg.derive("degraded", "*db_slow")
+    with pytest.raises(TypeError):
+        tg.derive(["degraded"], "db_slow")
+
+
+def test_index_of_derived_value():
+    tg = Triggon.from_labels({"db_slow": None, "degraded": ("low", "high")})
+    tg.register_ref("degraded", name="MODE")
+
+    tg.derive("degraded", "db_slow", index=1)
+    tg.set_trigger("db_slow")
+    assert MODE == "high"
+
+    tg.revert("db_slow")
+    assert MODE == "normal"
+    tg.derive("degraded", "db_slow")
+    tg.set_trigger("db_slow")
+    assert MODE == "low"
+
+    tg.revert("db_slow")
+    tg.derive("*degraded", "db_slow")
+    tg.set_trigger("db_slow")
+    assert MODE == "high"
+
+    with pytest.raises(IndexError):
+        tg.derive("degraded", "db_slow", index=2)
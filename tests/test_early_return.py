@@ -201,3 +201,169 @@ def test_rejects_symbol_labels():
     with tg.capture_return():
         with pytest.raises(InvalidArgumentError):
             tg.trigger_return("*A", value=10)
+
+
+def test_capture_return_is_reusable():
+    tg = Triggon.from_label("A", new_values=1)
+    capture = tg.capture_return()
+
+    with capture as first:
+        pass
+
+    tg.set_trigger("A")
+    with capture as second:
+        with capture as inner:
+            tg.trigger_return("A", value=5)
+
+    assert tg.capture_return() is capture
+    assert first.triggered is False
+    assert second.triggered is False
+    assert (inner.triggered, inner.value) == (True, 5)
+
+
+def test_capture_return_propagates_other_exceptions():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(ValueError):
+        with tg.capture_return():
+            raise ValueError("boom")
+
+    with pytest.raises(InactiveCaptureError):
+        tg.trigger_return("A")
+
+
+def test_short_circuit_returns_value_while_active():
+    tg = Triggon.from_labels({"A": 1, "B": 2})
+    calls = []
+
+    @tg.short_circuit(("A", "B"), value="skipped")
+    def handle(x):
+        calls.append(x)
+        return x * 2
+
+    assert handle(1) == 2
+    tg.set_trigger("B")
+    assert handle(2) == "skipped"
+    tg.revert("B")
+    assert handle(3) == 6
+
+    assert calls == [1, 3]
+    assert handle.__name__ == "handle"
+
+
+def test_short_circuit_runs_trigfunc_value():
+    tg = Triggon.from_label("A", new_values=1)
+    f = TrigFunc()
+
+    @tg.short_circuit("A", value=f.len([1, 2, 3]))
+    def handle():
+        return 0
+
+    tg.set_trigger("A")
+
+    assert handle() == 3
+
+
+def test_short_circuit_supports_coroutines():
+    import asyncio
+
+    tg = Triggon.from_label("A", new_values=1)
+
+    @tg.short_circuit("A", value="down")
+    async def handle():
+        return "up"
+
+    assert asyncio.run(handle()) == "up"
+    tg.set_trigger("A")
+    assert asyncio.run(handle()) == "down"
+
+
+def test_short_circuit_rejects_unregistered_labels():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(UnregisteredLabelError):
+        tg.short_circuit("missing")
+
+
+def test_capture_stacks_are_per_thread():
+    import threading
+
+    tg = Triggon.from_label("A", new_values=1)
+    tg.set_trigger("A")
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def worker(n):
+        with tg.capture_return() as result:
+            # both threads are inside a capture before either returns
+            barrier.wait()
+            tg.trigger_return("A", value=n)
+        results[n] = result
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in (1, 2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results[1].value == 1
+    assert results[2].value == 2
+
+
+def test_capture_stacks_are_per_task():
+    import asyncio
+
+    tg = Triggon.from_label("A", new_values=1)
+    tg.set_trigger("A")
+
+    async def worker(n, entered, release):
+        with tg.capture_return() as result:
+            entered.set()
+            await release.wait()
+            tg.trigger_return("A", value=n)
+        return result.value
+
+    async def main():
+        release = asyncio.Event()
+        events = [asyncio.Event(), asyncio.Event()]
+        tasks = [asyncio.create_task(worker(n, events[n], release)) for n in (0, 1)]
+        for event in events:
+            await event.wait()
+        release.set()
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(main()) == [0, 1]
+
+
+def test_trigger_return_requires_capture_in_same_thread():
+    import threading
+
+    tg = Triggon.from_label("A", new_values=1)
+    tg.set_trigger("A")
+    errors = []
+
+    def worker():
+        try:
+            tg.trigger_return("A")
+        except InactiveCaptureError as e:
+            errors.append(e)
+
+    with tg.capture_return():
+        t = threading.Thread(target=worker)
+        t.start()
+        t.join()
+
+    assert len(errors) == 1
+
+
+def test_return_targets_capture_of_same_instance():
+    tg_1 = Triggon.from_label("A", new_values=1)
+    tg_2 = Triggon.from_label("B", new_values=1)
+    tg_1.set_trigger("A")
+
+    with tg_1.capture_return() as outer:
+        with tg_2.capture_return() as inner:
+            tg_1.trigger_return("A", value=7)
+
+    assert inner.triggered is False
+    assert (outer.triggered, outer.value) == (True, 7)
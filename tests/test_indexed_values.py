@@ -0,0 +1,132 @@
+from pathlib import Path
+import array
+import sys
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import IndexedValues, InvalidArgumentError, Triggon
+
+LIMIT = 0
+
+
+@pytest.fixture(autouse=True)
+def _reset_limit():
+    global LIMIT
+    LIMIT = 0
+
+
+def test_array_backed_values_are_not_copied():
+    data = array.array("i", range(50_000))
+    values = IndexedValues(data)
+    tg = Triggon.from_label("limit", new_values=values)
+
+    assert tg._new_values["limit"] is values
+    assert tg.switch_lit("limit", -1) == -1
+
+    tg.set_trigger("limit", indices=42_000)
+    assert tg.switch_lit("limit", -1, indices=42_000) == 42_000
+
+
+def test_register_ref_and_trigger_with_index():
+    values = IndexedValues(array.array("d", [0.5, 1.5, 2.5]))
+    tg = Triggon.from_label("limit", new_values=values)
+    tg.set_trigger("limit", indices=2)
+    # the registered index applies when the label is already active
+    tg.register_ref("limit", name="LIMIT", index=2)
+    assert LIMIT == 2.5
+
+    tg.revert("limit")
+    tg.set_trigger("limit", indices=1)
+    assert LIMIT == 1.5
+
+
+def test_out_of_range_index_is_rejected():
+    tg = Triggon.from_label("limit", new_values=IndexedValues(array.array("i", [1, 2])))
+
+    with pytest.raises(IndexError):
+        tg.set_trigger("limit", indices=2)
+    with pytest.raises(IndexError):
+        tg.switch_lit("***limit", 0)
+
+
+def test_numpy_values_are_returned_as_python_scalars():
+    np = pytest.importorskip("numpy")
+    tg = Triggon.from_label("w", new_values=IndexedValues(np.linspace(0.0, 1.0, 5)))
+
+    tg.set_trigger("w")
+    value = tg.switch_lit("w", None, indices=4)
+
+    assert value == 1.0
+    assert type(value) is float
+
+
+def test_sparse_values():
+    values = IndexedValues({3: "three", 10_000: "many"})
+    tg = Triggon.from_label("shard", new_values=values)
+    tg.set_trigger("shard", indices=3)
+
+    assert len(values) == 10_001
+    assert tg.switch_lit("shard", None, indices=10_000) == "many"
+    with pytest.raises(IndexError):
+        tg.switch_lit("shard", None, indices=4)
+
+
+def test_sparse_values_with_default_and_size():
+    values = IndexedValues({1: 5}, size=100, default=0)
+    tg = Triggon.from_label("shard", new_values=values)
+    tg.set_trigger("shard")
+
+    assert tg.switch_lit("shard", None, indices=99) == 0
+    assert tg.switch_lit("shard", None, indices=1) == 5
+    with pytest.raises(IndexError):
+        tg.switch_lit("shard", None, indices=100)
+
+
+def test_memory_mapped_file(tmp_path):
+    path = tmp_path / "limits.bin"
+    path.write_bytes(array.array("q", [7, 8, 9]).tobytes())
+
+    values = IndexedValues.from_file(path, "q")
+    tg = Triggon.from_label("limit", new_values=values)
+    tg.set_trigger("limit")
+
+    assert len(values) == 3
+    assert tg.switch_lit("limit", 0, indices=2) == 9
+    assert values[0:2] == (7, 8)
+
+
+def test_memory_mapped_file_with_offset(tmp_path):
+    path = tmp_path / "limits.bin"
+    path.write_bytes(b"HEAD" + array.array("i", [4, 5]).tobytes())
+
+    assert list(IndexedValues.from_file(path, "i", offset=4)) == [4, 5]
+    with pytest.raises(InvalidArgumentError):
+        IndexedValues.from_file(path, "q")
+
+
+def test_memory_mapped_empty_file(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+
+    with pytest.raises(InvalidArgumentError, match="empty"):
+        IndexedValues.from_file(path, "i")
+
+
+@pytest.mark.parametrize(
+    "args, kwargs, error",
+    [
+        ((array.array("i"),), {}, InvalidArgumentError),
+        (({},), {}, InvalidArgumentError),
+        (({-1: 0},), {}, InvalidArgumentError),
+        (({5: 0},), {"size": 5}, InvalidArgumentError),
+        (({"a": 0},), {}, TypeError),
+        ((object(),), {}, TypeError),
+    ],
+)
+def test_rejects_invalid_data(args, kwargs, error):
+    with pytest.raises(error):
+        IndexedValues(*args, **kwargs)
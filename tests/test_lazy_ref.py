@@ -0,0 +1,219 @@
+from pathlib import Path
+import sys
+from types import ModuleType
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import InvalidArgumentError, Triggon, TrigFunc
+from triggon.core.refs.lazy import LazyRef
+
+LIMIT = 10
+NAMES = ["a", "b"]
+
+
+@pytest.fixture(autouse=True)
+def _reset_globals():
+    global LIMIT, NAMES
+    yield
+    LIMIT = 10
+    NAMES = ["a", "b"]
+
+
+def test_proxy_resolves_active_value_on_access():
+    tg = Triggon.from_label("A", new_values=99)
+    tg.register_ref("A", name="LIMIT", lazy=True)
+
+    assert isinstance(LIMIT, LazyRef)
+    assert LIMIT == 10
+
+    tg.set_trigger("A")
+    assert LIMIT == 99
+    assert LIMIT + 1 == 100
+    assert 1 + LIMIT == 100
+    assert int(LIMIT) == 99
+    assert f"{LIMIT:>4}" == "  99"
+
+    tg.revert("A")
+    assert LIMIT.resolve() == 10
+
+
+def test_toggle_does_not_write_the_global():
+    tg = Triggon.from_label("A", new_values=99)
+    tg.register_ref("A", name="LIMIT", lazy=True)
+    proxy = LIMIT
+
+    tg.set_trigger("A")
+    tg.revert("A")
+    tg.set_trigger("A")
+
+    assert LIMIT is proxy
+
+
+def test_cache_stores_epoch_and_value_together():
+    tg = Triggon.from_label("A", new_values=99)
+    tg.register_ref("A", name="LIMIT", lazy=True)
+
+    tg.set_trigger("A")
+    LIMIT.resolve()
+
+    assert object.__getattribute__(LIMIT, "_state") == (tg._epoch, 99)
+
+
+def test_forwards_container_operations():
+    tg = Triggon.from_label("A", new_values=[["x", "y", "z"]])
+    tg.register_ref("A", name="NAMES", lazy=True)
+
+    assert len(NAMES) == 2
+    tg.set_trigger("A")
+
+    assert len(NAMES) == 3
+    assert NAMES[0] == "x"
+    assert "z" in NAMES
+    assert list(NAMES) == ["x", "y", "z"]
+    NAMES.append("w")
+    assert NAMES.resolve() == ["x", "y", "z", "w"]
+
+
+def test_deferred_value_runs_once_per_activation():
+    calls = []
+
+    def load():
+        calls.append(1)
+        return len(calls)
+
+    tg = Triggon.from_label("A", new_values=TrigFunc().load())
+    tg.register_ref("A", name="LIMIT", lazy=True)
+
+    assert calls == []
+
+    tg.set_trigger("A")
+    assert (LIMIT.resolve(), LIMIT.resolve()) == (1, 1)
+
+    tg.revert("A")
+    tg.set_trigger("A")
+    assert LIMIT.resolve() == 2
+
+
+def test_first_registered_active_label_wins():
+    tg = Triggon.from_labels({"A": 1, "B": 2})
+    tg.register_ref("A", name="LIMIT", lazy=True)
+    tg.register_ref("B", name="LIMIT", lazy=True)
+
+    tg.set_trigger("B")
+    assert LIMIT == 2
+
+    tg.set_trigger("A")
+    assert LIMIT == 1
+
+
+def test_unregister_restores_original_value():
+    tg = Triggon.from_labels({"A": 1, "B": 2})
+    tg.register_ref("A", name="LIMIT", lazy=True)
+    tg.register_ref("B", name="LIMIT", lazy=True)
+
+    assert tg.is_registered("LIMIT", label="A")
+
+    tg.unregister_refs("LIMIT", labels="A")
+    assert isinstance(LIMIT, LazyRef)
+    assert not tg.is_registered("LIMIT", label="A")
+    assert tg.is_registered("LIMIT", label="B")
+
+    tg.unregister_refs("LIMIT")
+    assert type(LIMIT) is int
+    assert LIMIT == 10
+
+
+def test_bound_namespace_registers_lazily():
+    module = ModuleType("_lazy_case")
+    module.LEVEL = 0
+    tg = Triggon.from_label("A", new_values=5)
+    tg.bind(module).register_ref("A", name="LEVEL", lazy=True)
+
+    tg.set_trigger("A")
+
+    assert module.LEVEL == 5
+    assert module.__dict__["LEVEL"].resolve() == 5
+
+
+def test_sandbox_resets_cached_value():
+    tg = Triggon.from_label("A", new_values=99)
+    tg.register_ref("A", name="LIMIT", lazy=True)
+
+    with tg.sandbox():
+        tg.set_trigger("A")
+        assert LIMIT == 99
+
+    assert LIMIT == 10
+
+
+def test_rejects_attribute_paths():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(InvalidArgumentError):
+        tg.register_ref("A", name="NAMES.append", lazy=True)
+    with pytest.raises(TypeError):
+        tg.register_ref("A", name="LIMIT", lazy=1)
+
+
+def test_rejects_names_that_are_not_global():
+    tg = Triggon.from_label("A", new_values=1)
+    local_value = 1
+
+    with pytest.raises(InvalidArgumentError):
+        tg.register_ref("A", name="local_value", lazy=True)
+    assert local_value == 1
+
+
+def test_sandbox_removes_lazy_registration():
+    tg = Triggon.from_label("A", new_values=99)
+
+    with tg.sandbox():
+        tg.register_ref("A", name="LIMIT", lazy=True)
+        assert isinstance(LIMIT, LazyRef)
+
+    assert type(LIMIT) is int
+    assert LIMIT == 10
+    assert not tg.is_registered("LIMIT")
+
+
+def test_sandbox_restores_unregistered_lazy_ref():
+    tg = Triggon.from_labels({"A": 1, "B": 2})
+    tg.register_ref("A", name="LIMIT", lazy=True)
+
+    with tg.sandbox():
+        tg.register_ref("B", name="LIMIT", lazy=True)
+        tg.unregister_refs("LIMIT", labels="A")
+        tg.unregister_refs("LIMIT", labels="B")
+        assert type(LIMIT) is int
+
+    assert isinstance(LIMIT, LazyRef)
+    assert tg.is_registered("LIMIT", label="A")
+    assert not tg.is_registered("LIMIT", label="B")
+
+
+def test_inplace_operator_on_mutable_value_keeps_proxy():
+    global NAMES
+    tg = Triggon.from_label("A", new_values=[["x"]])
+    tg.register_ref("A", name="NAMES", lazy=True)
+    tg.set_trigger("A")
+
+    NAMES += ["y"]
+
+    assert isinstance(NAMES, LazyRef)
+    assert NAMES.resolve() == ["x", "y"]
+
+
+def test_inplace_operator_on_immutable_value_rebinds():
+    global LIMIT
+    tg = Triggon.from_label("A", new_values=99)
+    tg.register_ref("A", name="LIMIT", lazy=True)
+    tg.set_trigger("A")
+
+    LIMIT += 1
+
+    assert type(LIMIT) is int
+    assert LIMIT == 100
@@ -0,0 +1,222 @@
+from pathlib import Path
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import InvalidArgumentError, LazyValue, Triggon
+from triggon._internal.lock import UPDATE_LOCK
+
+TABLE = None
+
+
+@pytest.fixture(autouse=True)
+def _reset_table():
+    global TABLE
+    TABLE = None
+
+
+def wait_until(predicate, timeout: float = 0.4, interval: float = 0.005):
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(interval)
+
+    assert predicate()
+
+
+class Loader:
+    def __init__(self, value, delay=0.0):
+        self.value = value
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.value
+
+
+def test_loaded_on_first_read_and_reused():
+    loader = Loader({"a": 1})
+    value = LazyValue(loader)
+    tg = Triggon.from_label("A", new_values=value)
+
+    assert tg.switch_lit("A", None) is None
+    assert loader.calls == 0
+
+    tg.set_trigger("A")
+    assert tg.switch_lit("A", None) == {"a": 1}
+    assert tg.switch_lit("A", None) == {"a": 1}
+    assert loader.calls == 1
+    assert value.is_loaded
+
+
+def test_loaded_on_activation_of_registered_ref():
+    loader = Loader([1, 2, 3])
+    tg = Triggon.from_label("A", new_values=LazyValue(loader))
+    tg.register_ref("A", name="TABLE")
+
+    tg.set_trigger("A")
+
+    assert TABLE == [1, 2, 3]
+    assert loader.calls == 1
+
+
+def test_shared_across_indices_and_labels():
+    loader = Loader("weights")
+    value = LazyValue(loader)
+    tg = Triggon.from_labels({"A": (value, value), "B": value})
+    tg.set_trigger(("A", "B"))
+
+    assert tg.switch_lit("*A", None) == "weights"
+    assert tg.switch_lit("A", None) == "weights"
+    assert tg.switch_lit("B", None) == "weights"
+    assert loader.calls == 1
+
+
+def test_loader_runs_outside_instance_lock():
+    locked = []
+    tg = None
+
+    def loader():
+        locked.append(tg._lock.locked())
+        return 1
+
+    tg = Triggon.from_label("A", new_values=LazyValue(loader))
+    tg.set_trigger("A")
+    tg.switch_lit("A", None)
+
+    assert locked == [False]
+
+
+def test_loader_runs_outside_update_lock_on_activation():
+    locked = []
+
+    def loader():
+        locked.append(UPDATE_LOCK.locked())
+        return [1]
+
+    tg = Triggon.from_label("A", new_values=LazyValue(loader))
+    tg.register_ref("A", name="TABLE")
+    tg.set_trigger("A")
+
+    assert TABLE == [1]
+    assert locked == [False]
+
+
+def test_is_not_a_trigger_call_target():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(TypeError, match="TrigFunc"):
+        tg.trigger_call("A", LazyValue(lambda: 1))
+
+
+def test_concurrent_first_reads_load_once():
+    loader = Loader("table", delay=0.05)
+    tg = Triggon.from_label("A", new_values=LazyValue(loader))
+    tg.set_trigger("A")
+    results = []
+
+    threads = [
+        threading.Thread(target=lambda: results.append(tg.switch_lit("A", None))) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["table"] * 4
+    assert loader.calls == 1
+
+
+def test_budget_evicts_least_recently_used_inactive_values():
+    a = LazyValue(Loader("a"), size_hint=60)
+    b = LazyValue(Loader("b"), size_hint=60)
+    c = LazyValue(Loader("c"), size_hint=60)
+    tg = Triggon.from_labels({"A": a, "B": b, "C": c})
+    tg.configure_value_budget(130)
+
+    for label in ("A", "B"):
+        tg.set_trigger(label)
+        tg.switch_lit(label, None)
+        tg.revert(label)
+    assert a.is_loaded and b.is_loaded
+
+    tg.set_trigger("C")
+    tg.switch_lit("C", None)
+
+    assert not a.is_loaded
+    assert b.is_loaded and c.is_loaded
+    assert a.loaded_size == 0
+
+
+def test_budget_never_evicts_values_of_active_labels():
+    a = LazyValue(Loader("a"), size_hint=60)
+    b = LazyValue(Loader("b"), size_hint=60)
+    tg = Triggon.from_labels({"A": a, "B": b})
+    tg.configure_value_budget(50)
+    tg.set_trigger(("A", "B"))
+
+    assert tg.switch_lit("A", None) == "a"
+    assert tg.switch_lit("B", None) == "b"
+    assert a.is_loaded and b.is_loaded
+
+    tg.revert("A")
+    tg.configure_value_budget(60)
+
+    assert not a.is_loaded
+    assert b.is_loaded
+
+
+def test_budget_keeps_prewarmed_value_until_activation():
+    loader = Loader("a")
+    a = LazyValue(loader, size_hint=100)
+    tg = Triggon.from_label("A", new_values=a)
+    tg.configure_value_budget(10)
+
+    tg.set_trigger("A", after=0.2, prewarm=0.15)
+    wait_until(lambda: loader.calls == 1)
+
+    assert a.is_loaded
+    assert tg.is_triggered("A") is False
+
+    wait_until(lambda: tg.is_triggered("A"))
+    assert tg.switch_lit("A", None) == "a"
+    assert loader.calls == 1
+
+
+def test_evicted_value_is_loaded_again():
+    loader = Loader("a")
+    a = LazyValue(loader, size_hint=10)
+    tg = Triggon.from_label("A", new_values=a)
+    tg.set_trigger("A")
+    tg.switch_lit("A", None)
+    tg.revert("A")
+
+    tg.configure_value_budget(0)
+    assert not a.is_loaded
+
+    tg.set_trigger("A")
+    assert tg.switch_lit("A", None) == "a"
+    assert loader.calls == 2
+
+
+def test_rejects_invalid_arguments():
+    with pytest.raises(TypeError):
+        LazyValue("not callable")
+    with pytest.raises(InvalidArgumentError):
+        LazyValue(lambda: 1, size_hint=-1)
+
+    tg = Triggon.from_label("A", new_values=1)
+    with pytest.raises(InvalidArgumentError):
+        tg.configure_value_budget(-1)
+    with pytest.raises(TypeError):
+        tg.configure_value_budget(1.5)
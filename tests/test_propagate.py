@@ -0,0 +1,122 @@
+from pathlib import Path
+import gc
+import sys
+import time
+from types import ModuleType, SimpleNamespace
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import Triggon
+
+LEVEL = 0
+
+
+@pytest.fixture(autouse=True)
+def _reset_level():
+    global LEVEL
+    LEVEL = 0
+    yield
+    LEVEL = 0
+
+
+def _make_module(monkeypatch, name):
+    module = ModuleType(name)
+    module.__file__ = f"/virtual/{name}.py"
+    module.LEVEL = 0
+    module.config = SimpleNamespace(mode="safe")
+    monkeypatch.setitem(sys.modules, name, module)
+    return module
+
+
+def test_propagate_updates_refs_of_every_module(monkeypatch):
+    first = _make_module(monkeypatch, "_propagate_first")
+    second = _make_module(monkeypatch, "_propagate_second")
+    tg = Triggon.from_label("A", new_values=10)
+
+    tg.bind(first).register_ref("A", name="LEVEL")
+    tg.bind(second).register_refs({"A": {"LEVEL": 0, "config.mode": 0}})
+    tg.register_ref("A", name="LEVEL")
+
+    tg.set_trigger("A", propagate=True)
+
+    assert (first.LEVEL, second.LEVEL, second.config.mode, LEVEL) == (10, 10, 10, 10)
+
+    tg.revert("A", propagate=True)
+
+    assert (first.LEVEL, second.LEVEL, second.config.mode, LEVEL) == (0, 0, "safe", 0)
+
+
+def test_without_propagate_only_caller_file_is_updated(monkeypatch):
+    module = _make_module(monkeypatch, "_propagate_local")
+    tg = Triggon.from_label("A", new_values=10)
+    tg.bind(module).register_ref("A", name="LEVEL")
+    tg.register_ref("A", name="LEVEL")
+
+    tg.set_trigger("A")
+
+    assert LEVEL == 10
+    assert module.LEVEL == 0
+
+
+def test_bound_namespace_can_propagate(monkeypatch):
+    first = _make_module(monkeypatch, "_propagate_bound_a")
+    second = _make_module(monkeypatch, "_propagate_bound_b")
+    tg = Triggon.from_label("A", new_values=3)
+    ns = tg.bind(first)
+    ns.register_ref("A", name="LEVEL")
+    tg.bind(second).register_ref("A", name="LEVEL")
+
+    ns.set_trigger("A", propagate=True)
+
+    assert (first.LEVEL, second.LEVEL) == (3, 3)
+
+
+def test_refs_of_unloaded_modules_are_skipped(monkeypatch):
+    tg = Triggon.from_label("A", new_values=10)
+    module = _make_module(monkeypatch, "_propagate_unloaded")
+    tg.bind(module).register_ref("A", name="LEVEL")
+    tg.register_ref("A", name="LEVEL")
+
+    # the ref keeps only a weak reference to its module
+    monkeypatch.delitem(sys.modules, "_propagate_unloaded")
+    del module
+    gc.collect()
+
+    tg.set_trigger("A", propagate=True)
+
+    assert LEVEL == 10
+
+
+def test_namespace_without_module_is_not_propagated():
+    namespace = {"__name__": "_propagate_plain", "LEVEL": 1}
+    tg = Triggon.from_label("A", new_values=5)
+    tg.bind(namespace).register_ref("A", name="LEVEL")
+
+    tg.set_trigger("A", propagate=True)
+
+    assert namespace["LEVEL"] == 1
+
+
+def test_delayed_trigger_propagates(monkeypatch):
+    module = _make_module(monkeypatch, "_propagate_delayed")
+    tg = Triggon.from_label("A", new_values=7)
+    tg.bind(module).register_ref("A", name="LEVEL")
+
+    tg.set_trigger("A", after=0.02, propagate=True)
+    deadline = time.monotonic() + 2
+    while module.LEVEL != 7 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert module.LEVEL == 7
+
+
+@pytest.mark.parametrize("method", ["set_trigger", "revert"])
+def test_rejects_non_bool_propagate(method):
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(TypeError):
+        getattr(tg, method)("A", propagate=1)
@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 import sys
 
@@ -96,6 +97,40 @@ def _run_nested_rollback_state():
     return run()
 
 
+def _run_without_source(source: str) -> dict:
+    # code compiled from a string has no source file to parse
+    namespace = {"Triggon": Triggon}
+    exec(compile(source, "<no-source>", "exec"), namespace)
+    namespace["run"]()
+    return namespace
+
+
+def _run_bytecode_discovery():
+    x = 1
+    total = 10
+
+    class Holder:
+        value = 2
+
+    holder = Holder()
+
+    def run():
+        nonlocal x, total
+
+        with Triggon.rollback(discover="bytecode"):
+            x = 5
+            total += 7
+            holder.value = 20
+            holder.value += 1
+
+            inside = (x, total, holder.value)
+
+        outside = (x, total, holder.value)
+        return inside, outside
+
+    return run()
+
+
 def test_rejects_invalid_targets_type():
     with pytest.raises(TypeError):
         with Triggon.rollback(123):
@@ -108,6 +143,12 @@ def test_rejects_empty_targets():
             pass
 
 
+def test_rejects_unknown_discover_mode():
+    with pytest.raises(InvalidArgumentError, match="discover"):
+        with Triggon.rollback(discover="ast"):
+            pass
+
+
 def test_raises_on_unsupported_python(monkeypatch):
     monkeypatch.setattr(sys, "version_info", (3, 12, 9))
 
@@ -164,6 +205,35 @@ def test_auto_collect_restores_attr_assignments():
     assert outside[2] == 2
 
 
+def test_explicit_targets_do_not_need_source():
+    namespace = _run_without_source(
+        "x = 1\ndef run():\n    global x\n    with Triggon.rollback('x'):\n        x = 5\n"
+    )
+
+    assert namespace["x"] == 1
+
+
+def test_bytecode_discovery_does_not_need_source():
+    namespace = _run_without_source(
+        "x = 1\n"
+        "def run():\n"
+        "    global x\n"
+        "    with Triggon.rollback(discover='bytecode'):\n"
+        "        x = 5\n"
+        "        for i in range(3):\n"
+        "            x += i\n"
+    )
+
+    assert namespace["x"] == 1
+
+
+def test_bytecode_discovery_restores_assignments():
+    inside, outside = _run_bytecode_discovery()
+
+    assert inside == (5, 17, 21)
+    assert outside == (1, 10, 2)
+
+
 def test_auto_collect_restores_annotated_assignments():
     def run():
         x = 1
@@ -219,6 +289,101 @@ def test_nested_restores_outer_scope_state():
     assert after_outer == 1
 
 
+def test_track_mutations_undoes_in_place_changes():
+    cfg = {"timeout": 1}
+    items = [1, 2]
+
+    class Holder:
+        tags = {"a"}
+
+    holder = Holder()
+
+    def run():
+        with Triggon.rollback(track_mutations=True):
+            cfg["timeout"] = 5
+            cfg["retries"] = 3
+            items.append(3)
+            holder.tags.add("b")
+
+            assert cfg == {"timeout": 5, "retries": 3}
+            assert items == [1, 2, 3]
+
+    run()
+
+    assert cfg == {"timeout": 1}
+    assert items == [1, 2]
+    assert holder.tags == {"a"}
+    assert type(cfg) is dict and type(holder.tags) is set
+
+
+def test_track_mutations_with_explicit_targets():
+    items = [1, 2]
+
+    def run():
+        with pytest.raises(RuntimeError):
+            with Triggon.rollback("items", track_mutations=True):
+                items.extend([3, 4])
+                raise RuntimeError("boom")
+
+    run()
+
+    assert items == [1, 2]
+
+
+def test_without_track_mutations_keeps_in_place_changes():
+    items = [1, 2]
+
+    def run():
+        with Triggon.rollback("items"):
+            items.append(3)
+
+    run()
+
+    assert items == [1, 2, 3]
+
+
+def test_track_mutations_keeps_container_api():
+    cfg = {"a": 1}
+    items = [1, 2]
+    tags = {"x"}
+
+    def run():
+        with Triggon.rollback(track_mutations=True):
+            cfg["b"] = 2
+            items.append(3)
+            tags.update({"y"})
+
+            assert type(cfg) is dict and isinstance(cfg, dict)
+            assert cfg.copy() == {"a": 1, "b": 2}
+            assert json.dumps(cfg) == '{"a": 1, "b": 2}'
+            assert cfg | {"c": 3} == {"a": 1, "b": 2, "c": 3}
+            assert items + [4] == [1, 2, 3, 4]
+            assert items.copy() == [1, 2, 3]
+            assert tags | {"z"} == {"x", "y", "z"}
+
+    run()
+
+    assert cfg == {"a": 1}
+    assert items == [1, 2]
+    assert tags == {"x"}
+
+
+def test_track_mutations_restores_changes_through_stored_refs():
+    items = [1, 2]
+    stored = []
+
+    def run():
+        with Triggon.rollback("items", track_mutations=True):
+            items.append(3)
+            stored.append(items)
+
+    run()
+    stored[0].append(4)
+
+    assert stored[0] is items
+    assert items == [1, 2, 4]
+
+
 def test_raises_update_err_when_attr_restore_fails():
     class WriteOnce:
         def __init__(self):
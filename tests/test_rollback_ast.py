@@ -11,7 +11,8 @@ if ROOT not in sys.path:
 import pytest
 
 from triggon import RollbackSourceError
-from triggon._internal.rollback_ast import _find_with_node
+from triggon._internal import rollback_ast
+from triggon._internal.rollback_ast import _WithIndex, _find_with_node
 
 
 def test_find_with_node_falls_back_to_module_file():
@@ -44,3 +45,86 @@ def test_find_with_node_raises_on_missing_source():
 
     with pytest.raises(RollbackSourceError, match=r"Triggon\.rollback\(\) could not find"):
         _find_with_node(frame)
+
+
+def _write_case(source: str) -> Path:
+    source_path = Path(__file__).with_name(f"_rollback_case_{uuid4().hex}.py")
+    source_path.write_text(source, encoding="utf-8")
+    return source_path
+
+
+def _make_frame(source_path: Path, lineno: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        f_code=SimpleNamespace(co_filename=str(source_path)),
+        f_lineno=lineno,
+        f_globals={},
+    )
+
+
+def _count_parses(monkeypatch) -> list[str]:
+    parsed = []
+    orig_parse = rollback_ast.ast.parse
+
+    def counting_parse(source, *args, **kwargs):
+        parsed.append(kwargs.get("filename"))
+        return orig_parse(source, *args, **kwargs)
+
+    monkeypatch.setattr(rollback_ast.ast, "parse", counting_parse)
+    return parsed
+
+
+def test_index_finds_innermost_block():
+    source = (
+        "with a():\n"  # 1
+        "    x = 1\n"  # 2
+        "    with b():\n"  # 3
+        "        y = 2\n"  # 4
+        "    z = 3\n"  # 5
+        "w = 4\n"  # 6
+        "with c():\n"  # 7
+        "    v = 5\n"  # 8
+    )
+    index = _WithIndex(ast.parse(source))
+
+    assert index.find(4).start == 3
+    assert index.find(5).start == 1
+    assert index.find(6) is None
+    assert index.find(8).start == 7
+
+
+def test_index_precomputes_assigned_names():
+    source = "with a():\n    x = 1\n    obj.attr += 2\n    with b():\n        y: int = 3\n"
+    index = _WithIndex(ast.parse(source))
+
+    assert index.find(2).assigned_names == ("x", "obj.attr", "y")
+    assert index.find(5).assigned_names == ("y",)
+
+
+def test_reuses_cached_index_for_same_file(monkeypatch):
+    source_path = _write_case("def run():\n    with helper():\n        value = 1\n")
+    parsed = _count_parses(monkeypatch)
+
+    try:
+        first = _find_with_node(_make_frame(source_path, 2))
+        second = _find_with_node(_make_frame(source_path, 3))
+
+        assert first is second
+        assert len(parsed) == 1
+    finally:
+        source_path.unlink(missing_ok=True)
+
+
+def test_reparses_after_file_changes(monkeypatch):
+    source_path = _write_case("with helper():\n    value = 1\n")
+    parsed = _count_parses(monkeypatch)
+
+    try:
+        _find_with_node(_make_frame(source_path, 1))
+
+        source_path.write_text("x = 0\n\nwith helper():\n    value = 1\n    other = 2\n")
+        node = _find_with_node(_make_frame(source_path, 3))
+
+        assert node.lineno == 3
+        assert len(parsed) == 2
+    finally:
+        source_path.unlink(missing_ok=True)
@@ -0,0 +1,93 @@
+from pathlib import Path
+import sys
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon._internal import rollback_bytecode
+from triggon._internal.rollback_bytecode import collect_assigned_names
+
+
+def _capture_enter():
+    captured = []
+
+    class Capture:
+        def __enter__(self):
+            frame = sys._getframe(1)
+            captured.append((frame.f_code, frame.f_lasti))
+
+        def __exit__(self, *exc_info):
+            return None
+
+    return Capture, captured
+
+
+def test_collects_names_inside_block_only():
+    Capture, captured = _capture_enter()
+    holder = type("Holder", (), {"value": 0})()
+
+    def run():
+        before = 0
+        with Capture() as ctx:
+            x = 1
+            holder.value = 2
+            try:
+                y = 3
+            finally:
+                z = 4
+        after = 5
+        return before, ctx, x, y, z, after
+
+    run()
+    code, lasti = captured[0]
+
+    assert collect_assigned_names(code, lasti) == ("x", "holder.value", "y", "z")
+
+
+def test_collects_names_of_innermost_block():
+    Capture, captured = _capture_enter()
+
+    def run():
+        with Capture():
+            outer = 1
+            with Capture():
+                inner = 2
+        return outer, inner
+
+    run()
+    code, lasti = captured[1]
+
+    assert collect_assigned_names(code, lasti) == ("inner",)
+
+
+def test_returns_empty_tuple_without_with_block():
+    def run():
+        return 1
+
+    assert collect_assigned_names(run.__code__, 0) == ()
+
+
+def test_caches_per_code_and_offset(monkeypatch):
+    Capture, captured = _capture_enter()
+
+    def run():
+        with Capture():
+            x = 1
+        return x
+
+    run()
+    code, lasti = captured[0]
+
+    calls = []
+    orig = rollback_bytecode._analyse_with_block
+
+    def counting(*args):
+        calls.append(args)
+        return orig(*args)
+
+    monkeypatch.setattr(rollback_bytecode, "_analyse_with_block", counting)
+    collect_assigned_names(code, lasti)
+    collect_assigned_names(code, lasti)
+
+    assert len(calls) == 1
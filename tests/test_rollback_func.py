@@ -0,0 +1,158 @@
+import asyncio
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import InvalidArgumentError, Triggon, UpdateError
+from triggon._internal import rollback_func
+
+RETRIES = 3
+config = SimpleNamespace(mode="safe", nested=SimpleNamespace(level=1))
+
+
+@Triggon.rollback_func()
+def _mutate_module_state():
+    global RETRIES
+    RETRIES = 10
+    config.mode = "fast"
+    config.nested.level += 1
+    return RETRIES, config.mode, config.nested.level
+
+
+def test_auto_discovery_restores_globals_and_attrs():
+    inside = _mutate_module_state()
+
+    assert inside == (10, "fast", 2)
+    assert (RETRIES, config.mode, config.nested.level) == (3, "safe", 1)
+
+
+def test_restores_after_exception():
+    @Triggon.rollback_func()
+    def run():
+        config.mode = "broken"
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        run()
+
+    assert config.mode == "safe"
+
+
+def test_explicit_targets_restore_only_given_names():
+    @Triggon.rollback_func("config.mode")
+    def run():
+        global RETRIES
+        config.mode = "fast"
+        RETRIES = 5
+
+    try:
+        run()
+        assert config.mode == "safe"
+        assert RETRIES == 5
+    finally:
+        globals()["RETRIES"] = 3
+
+
+def test_restores_closure_variables():
+    count = 0
+
+    @Triggon.rollback_func()
+    def run():
+        nonlocal count
+        count += 1
+        return count
+
+    assert run() == 1
+    assert run() == 1
+    assert count == 0
+
+
+def test_ignores_local_attr_roots():
+    @Triggon.rollback_func()
+    def run(obj):
+        obj.value = 2
+
+    obj = SimpleNamespace(value=1)
+    run(obj)
+
+    assert obj.value == 2
+
+
+def test_analyses_function_once(monkeypatch):
+    calls = []
+    orig = rollback_func.collect_function_names
+
+    def counting(code):
+        calls.append(code)
+        return orig(code)
+
+    monkeypatch.setattr(rollback_func, "collect_function_names", counting)
+
+    @Triggon.rollback_func()
+    def run():
+        config.mode = "fast"
+
+    run()
+    run()
+
+    assert len(calls) == 1
+
+
+def test_restores_after_coroutine_finishes():
+    @Triggon.rollback_func()
+    async def run():
+        config.mode = "async"
+        await asyncio.sleep(0)
+        return config.mode
+
+    assert asyncio.run(run()) == "async"
+    assert config.mode == "safe"
+
+
+def test_keeps_function_metadata():
+    assert _mutate_module_state.__name__ == "_mutate_module_state"
+
+
+def test_rejects_local_variable_targets():
+    with pytest.raises(InvalidArgumentError, match="local variables"):
+
+        @Triggon.rollback_func("x")
+        def run():
+            x = 1
+            return x
+
+
+def test_rejects_non_function():
+    with pytest.raises(TypeError):
+        Triggon.rollback_func()(print)
+
+
+def test_raises_update_err_when_restore_fails():
+    class Locked:
+        def __init__(self):
+            self._value = 1
+
+        @property
+        def value(self):
+            return self._value
+
+        @value.setter
+        def value(self, new_value):
+            if new_value == 1 and self._value != 1:
+                raise ValueError("cannot restore original value")
+            self._value = new_value
+
+    box = Locked()
+
+    @Triggon.rollback_func("box.value")
+    def run():
+        box.value = 2
+
+    with pytest.raises(UpdateError, match="failed to update 'box.value'"):
+        run()
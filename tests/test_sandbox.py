@@ -0,0 +1,159 @@
+from pathlib import Path
+import sys
+from types import SimpleNamespace
+from time import sleep
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import Triggon, UnregisteredLabelError
+from triggon.pytest_plugin import triggon_sandbox
+
+level = 0
+mode = "off"
+settings = SimpleNamespace(retries=1)
+
+
+def _make_tg():
+    tg = Triggon.from_labels({"A": 10, "B": "on", "C": 5})
+    tg.register_ref("A", name="level")
+    tg.register_ref("B", name="mode")
+    tg.register_ref("C", name="settings.retries")
+    return tg
+
+
+def test_restores_flags_and_registered_values():
+    global level
+
+    tg = _make_tg()
+    tg.set_trigger("B")
+
+    with tg.sandbox():
+        tg.set_trigger(("A", "C"))
+        tg.revert("B")
+        assert (level, mode, settings.retries) == (10, "off", 5)
+
+    assert tg.is_triggered("A") is False
+    assert tg.is_triggered("B") is True
+    assert (level, mode, settings.retries) == (0, "on", 1)
+
+    tg.revert("B")
+    assert mode == "off"
+
+
+def test_cancels_timers_started_inside():
+    tg = _make_tg()
+
+    with tg.sandbox():
+        tg.set_trigger("A", after=0.05)
+
+    sleep(0.1)
+
+    assert tg.is_triggered("A") is False
+    assert level == 0
+
+    tg.set_trigger("A", after=0.01)
+    sleep(0.05)
+    try:
+        assert tg.is_triggered("A") is True
+    finally:
+        tg.revert("A")
+
+
+def test_keeps_timers_started_before():
+    tg = _make_tg()
+    tg.set_trigger("A", after=0.05)
+
+    with tg.sandbox():
+        pass
+
+    sleep(0.1)
+    try:
+        assert tg.is_triggered("A") is True
+    finally:
+        tg.revert("A")
+
+
+def test_removes_labels_and_refs_added_inside():
+    tg = _make_tg()
+
+    with tg.sandbox():
+        tg.add_label("D", new_values=1)
+        tg.set_trigger("C")
+        tg.register_ref("C", name="level")
+        assert level == 5
+
+    assert level == 0
+    assert tg.is_registered("level", label="C") is False
+    assert tg.is_registered("level", label="A") is True
+    with pytest.raises(UnregisteredLabelError):
+        tg.set_trigger("D")
+
+
+def test_restores_refs_unregistered_inside():
+    tg = _make_tg()
+
+    with tg.sandbox():
+        tg.unregister_refs("level")
+        assert tg.is_registered("level") is False
+
+    assert tg.is_registered("level", label="A") is True
+    tg.set_trigger("A")
+    assert level == 10
+    tg.revert("A")
+    assert level == 0
+
+
+def test_restores_only_targets_switched_inside():
+    global level
+
+    tg = _make_tg()
+
+    with tg.sandbox() as sandboxed:
+        tg.set_trigger("A")
+        level = 20
+        assert list(sandboxed._sandboxes[-1]._written) == [(id(globals()), "level")]
+
+    assert level == 0
+
+
+def test_keeps_direct_assignments_to_untouched_targets():
+    tg = _make_tg()
+
+    try:
+        with tg.sandbox():
+            settings.retries = 3
+
+        assert settings.retries == 3
+    finally:
+        settings.retries = 1
+
+
+def test_restores_after_exception():
+    tg = _make_tg()
+
+    with pytest.raises(RuntimeError):
+        with tg.sandbox():
+            tg.set_trigger("A")
+            raise RuntimeError("boom")
+
+    assert tg.is_triggered("A") is False
+    assert level == 0
+
+
+def test_fixture_sandboxes_live_instances():
+    tg = _make_tg()
+
+    fixture = triggon_sandbox.__wrapped__()
+    next(fixture)
+    tg.set_trigger(("A", "B"))
+    assert (level, mode) == (10, "on")
+
+    with pytest.raises(StopIteration):
+        next(fixture)
+
+    assert (level, mode) == (0, "off")
+    assert tg.is_triggered("A") is False
@@ -0,0 +1,96 @@
+from collections import OrderedDict, defaultdict
+from pathlib import Path
+import sys
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon._internal.snapshot import ContainerSnapshot, snapshot_container
+
+
+def test_dict_restore_undoes_changed_and_new_keys():
+    data = {"a": 1, "b": 2}
+    snapshot = snapshot_container(data)
+
+    data["a"] = 10
+    data["c"] = 3
+    del data["b"]
+    data.update(d=4)
+    snapshot.restore()
+
+    assert data == {"a": 1, "b": 2}
+    assert list(data) == ["a", "b"]
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda l: l.append(9),
+        lambda l: l.extend([7, 8]),
+        lambda l: l.insert(-1, 9),
+        lambda l: l.insert(100, 9),
+        lambda l: l.pop(),
+        lambda l: l.remove(3),
+        lambda l: l.__setitem__(-1, 9),
+        lambda l: l.__setitem__(slice(1, 3), [7, 7, 7]),
+        lambda l: l.__setitem__(slice(None, None, 2), [0, 0, 0]),
+        lambda l: l.__delitem__(slice(None, None, -2)),
+        lambda l: l.__delitem__(-2),
+        lambda l: l.__iadd__([5]),
+        lambda l: l.sort(reverse=True),
+        lambda l: l.reverse(),
+        lambda l: l.clear(),
+    ],
+)
+def test_list_restore_undoes_elements(mutate):
+    data = [1, 2, 3, 4, 5]
+    snapshot = snapshot_container(data)
+
+    mutate(data)
+    snapshot.restore()
+
+    assert data == [1, 2, 3, 4, 5]
+
+
+def test_list_restore_keeps_unchanged_elements():
+    items = [object() for _ in range(5)]
+    data = items[:]
+    snapshot = snapshot_container(data)
+
+    data[2] = object()
+    snapshot.restore()
+
+    assert all(a is b for a, b in zip(data, items))
+
+
+def test_set_restore_undoes_members():
+    data = {1, 2, 3}
+    snapshot = snapshot_container(data)
+
+    data.add(4)
+    data.discard(1)
+    data |= {5, 6}
+    data -= {2}
+    snapshot.restore()
+
+    assert data == {1, 2, 3}
+
+
+def test_restore_keeps_identity():
+    data = {"a": 1}
+    snapshot = snapshot_container(data)
+
+    data["a"] = 2
+    snapshot.restore()
+
+    assert snapshot.target is data
+
+
+def test_snapshots_only_plain_containers():
+    assert isinstance(snapshot_container([]), ContainerSnapshot)
+    assert snapshot_container(defaultdict(int)) is None
+    assert snapshot_container(OrderedDict()) is None
+    assert snapshot_container((1, 2)) is None
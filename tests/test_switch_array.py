@@ -0,0 +1,97 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import InvalidArgumentError, Triggon, TrigFunc, UnregisteredLabelError
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def tg():
+    return Triggon.from_labels({"A": (1.0, 1.5), "B": 2.0, "C": 3.0})
+
+
+def test_label_ids(tg):
+    choices = np.array([0, 1, 2, -1, 1])
+
+    result = tg.switch_array(["A", "B", "C"], choices, 0.0)
+    assert result.tolist() == [0.0] * 5
+
+    tg.set_trigger(["A", "C"])
+    result = tg.switch_array(["A", "B", "C"], choices, 0.0)
+    assert result.tolist() == [1.0, 0.0, 3.0, 0.0, 0.0]
+
+
+def test_originals_array_is_not_modified(tg):
+    originals = np.arange(4, dtype=float)
+    tg.set_trigger("B")
+
+    result = tg.switch_array(["A", "B"], np.array([1, 1, 0, -1]), originals)
+    assert result.tolist() == [2.0, 2.0, 2.0, 3.0]
+    assert originals.tolist() == [0.0, 1.0, 2.0, 3.0]
+
+    tg.revert("B")
+    result = tg.switch_array(["A", "B"], np.array([1, 1, 0, -1]), originals)
+    assert result.tolist() == originals.tolist()
+    assert result is not originals
+
+
+def test_masks_use_label_priority(tg):
+    masks = np.array(
+        [
+            [True, True, False, False],
+            [True, False, True, False],
+        ]
+    )
+    tg.set_trigger(["A", "B"])
+    assert tg.switch_array(["A", "B"], masks, 0.0).tolist() == [1.0, 1.0, 2.0, 0.0]
+
+    tg.revert("A")
+    assert tg.switch_array(["A", "B"], masks, 0.0).tolist() == [2.0, 0.0, 2.0, 0.0]
+
+
+def test_indices_and_star_prefix(tg):
+    tg.set_trigger("A")
+    choices = np.array([0, 0])
+
+    assert tg.switch_array("*A", choices, 0.0).tolist() == [1.5, 1.5]
+    assert tg.switch_array("A", choices, 0.0, indices=1).tolist() == [1.5, 1.5]
+
+
+def test_array_label_values_are_broadcast():
+    tg = Triggon.from_label("scale", new_values=np.array([10, 20, 30]))
+    tg.set_trigger("scale")
+
+    result = tg.switch_array("scale", np.array([0, -1, 0]), np.array([1, 2, 3]))
+    assert result.tolist() == [10, 2, 30]
+
+
+def test_deferred_value_runs_once():
+    calls = []
+    tg = Triggon.from_label("A", new_values=TrigFunc(namespace={"calls": calls}).calls.append(1))
+    tg.set_trigger("A")
+
+    tg.switch_array("A", np.zeros(100, dtype=int), 0)
+    assert calls == [1]
+
+
+def test_invalid_choices(tg):
+    with pytest.raises(InvalidArgumentError):
+        tg.switch_array(["A", "B"], np.array([0, 2]), 0.0)
+    with pytest.raises(InvalidArgumentError):
+        tg.switch_array(["A", "B"], np.array([True, False, True]), 0.0)
+    with pytest.raises(TypeError):
+        tg.switch_array(["A", "B"], np.array([0.5, 1.0]), 0.0)
+
+
+def test_invalid_labels(tg):
+    with pytest.raises(UnregisteredLabelError):
+        tg.switch_array("missing", np.array([0]), 0.0)
+    with pytest.raises(IndexError):
+        tg.switch_array("B", np.array([0]), 0.0, indices=2)
@@ -0,0 +1,115 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import InvalidArgumentError, Triggon, TrigFunc, UnregisteredLabelError
+from triggon.switch_attr import SwitchAttr
+
+
+def test_returns_default_until_label_is_active():
+    tg = Triggon.from_label("fast", new_values=0.01)
+
+    class Connection:
+        timeout = tg.attr("fast", default=5.0)
+
+    conns = [Connection() for _ in range(3)]
+    assert [conn.timeout for conn in conns] == [5.0, 5.0, 5.0]
+
+    tg.set_trigger("fast")
+    assert [conn.timeout for conn in conns] == [0.01, 0.01, 0.01]
+
+    tg.revert("fast")
+    assert [conn.timeout for conn in conns] == [5.0, 5.0, 5.0]
+
+
+def test_first_active_label_wins():
+    tg = Triggon.from_labels({"A": "a", "B": "b"})
+
+    class Config:
+        mode = tg.attr(("A", "B"), default="off")
+
+    tg.set_trigger("B")
+    assert Config().mode == "b"
+
+    tg.set_trigger("A")
+    assert Config().mode == "a"
+
+
+def test_uses_indexed_values():
+    tg = Triggon.from_label("A", new_values=(1, 2, 3))
+
+    class Config:
+        star = tg.attr("**A")
+        explicit = tg.attr("A", indices=1)
+
+    tg.set_trigger("A")
+
+    assert Config().star == 3
+    assert Config().explicit == 2
+
+
+def test_instance_assignment_overrides_switched_value():
+    tg = Triggon.from_label("A", new_values=10)
+
+    class Config:
+        level = tg.attr("A", default=0)
+
+    tg.set_trigger("A")
+    config = Config()
+    config.level = 1
+
+    assert config.level == 1
+    assert Config().level == 10
+
+    del config.level
+    assert config.level == 10
+
+
+def test_class_access_returns_descriptor():
+    tg = Triggon.from_label("A", new_values=10)
+
+    class Config:
+        level = tg.attr("A", default=0)
+
+    descriptor = Config.__dict__["level"]
+    assert Config.level is descriptor
+    assert isinstance(descriptor, SwitchAttr)
+    assert descriptor.labels == ("A",)
+    assert descriptor.default == 0
+    assert "level" in repr(descriptor)
+
+
+def test_runs_deferred_value_on_each_read():
+    calls = []
+
+    def load():
+        calls.append(1)
+        return len(calls)
+
+    tg = Triggon.from_label("A", new_values=TrigFunc().load())
+
+    class Config:
+        value = tg.attr("A")
+
+    assert Config().value is None
+
+    tg.set_trigger("A")
+
+    assert Config().value == 1
+    assert Config().value == 2
+
+
+def test_rejects_invalid_labels():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(UnregisteredLabelError):
+        tg.attr("B")
+    with pytest.raises(InvalidArgumentError):
+        tg.attr("A", indices=(0, 1))
+    with pytest.raises(IndexError):
+        tg.attr("A", indices=3)
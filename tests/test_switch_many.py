@@ -0,0 +1,124 @@
+from pathlib import Path
+import sys
+import threading
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import InvalidArgumentError, Triggon, TrigFunc, UnregisteredLabelError
+
+
+def test_mapping_spec_returns_dict():
+    tg = Triggon.from_labels({"debug": (10, "verbose"), "fast": 0.1})
+    spec = {
+        "retries": ("debug", 3),
+        "level": ("debug", "info", 1),
+        "timeout": (["fast", "debug"], 5.0),
+    }
+
+    assert tg.switch_many(spec) == {"retries": 3, "level": "info", "timeout": 5.0}
+
+    tg.set_trigger("debug")
+    assert tg.switch_many(spec) == {"retries": 10, "level": "verbose", "timeout": 10}
+
+    tg.set_trigger("fast")
+    assert tg.switch_many(spec)["timeout"] == 0.1
+
+
+def test_sequence_spec_returns_tuple():
+    tg = Triggon.from_labels({"A": ("a0", "a1"), "B": "b"})
+    tg.set_trigger("A")
+
+    result = tg.switch_many([("A", 0), ("*A", 0), ("B", "orig"), ["A", 0, 1]])
+    assert result == ("a0", "a1", "orig", "a1")
+
+
+def test_compiled_batch_follows_flags():
+    tg = Triggon.from_labels({"A": 1, "B": 2})
+    batch = tg.compile_switches({"x": ("A", 0), "y": (("B", "A"), 0)})
+    assert len(batch) == 2
+
+    assert tg.switch_many(batch) == {"x": 0, "y": 0}
+    tg.set_trigger("A")
+    assert tg.switch_many(batch) == {"x": 1, "y": 1}
+    tg.set_trigger("B")
+    assert tg.switch_many(batch) == {"x": 1, "y": 2}
+    tg.revert(all=True)
+    assert tg.switch_many(batch) == {"x": 0, "y": 0}
+
+
+def test_deferred_values_are_executed():
+    calls = []
+    tg = Triggon.from_label("B", new_values=TrigFunc(namespace={"calls": calls}).calls.append(1))
+    tg.set_trigger("B")
+
+    assert tg.switch_many([("B", None)]) == (None,)
+    assert calls == [1]
+
+
+def test_results_come_from_one_state():
+    tg = Triggon.from_labels({"A": 1, "B": 1})
+    batch = tg.compile_switches([(label, 0) for label in ("A", "B") * 50])
+    stop = threading.Event()
+
+    def toggle():
+        while not stop.is_set():
+            with tg._lock:
+                for label in ("A", "B"):
+                    tg._label_is_active[label] = not tg._label_is_active[label]
+
+    thread = threading.Thread(target=toggle)
+    thread.start()
+    try:
+        for _ in range(200):
+            result = tg.switch_many(batch)
+            assert len(set(result)) == 1
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_batch_of_another_instance_is_rejected():
+    tg = Triggon.from_label("A", new_values=1)
+    other = Triggon.from_label("A", new_values=2)
+
+    with pytest.raises(InvalidArgumentError):
+        other.switch_many(tg.compile_switches([("A", 0)]))
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        [("A",)],
+        [("A", 0, 0, 0)],
+        {"x": "A"},
+        [(1, 0)],
+        [("A", 0, "0")],
+    ],
+)
+def test_invalid_items(spec):
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises((InvalidArgumentError, TypeError)):
+        tg.switch_many(spec)
+
+
+def test_invalid_spec_type():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(TypeError):
+        tg.switch_many("A")
+    with pytest.raises(TypeError):
+        tg.compile_switches(42)
+
+
+def test_errors_are_raised_when_compiling():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(UnregisteredLabelError):
+        tg.compile_switches([("A", 0), ("missing", 0)])
+    with pytest.raises(IndexError):
+        tg.compile_switches([("A", 0, 3)])
@@ -0,0 +1,90 @@
+from pathlib import Path
+import math
+import sys
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import InvalidArgumentError, Triggon, TrigFunc, UnregisteredLabelError
+
+
+def test_items_pass_through_without_active_label():
+    tg = Triggon.from_label("double", new_values=lambda x: x * 2)
+
+    assert list(tg.switch_stream("double", range(5))) == [0, 1, 2, 3, 4]
+    assert list(tg.switch_stream("double", range(3), str)) == ["0", "1", "2"]
+
+
+def test_active_label_transforms_items():
+    tg = Triggon.from_labels({"double": lambda x: x * 2, "neg": (abs, lambda x: -x)})
+    tg.set_trigger(["double", "neg"])
+
+    assert list(tg.switch_stream(["double", "neg"], range(3))) == [0, 2, 4]
+    assert list(tg.switch_stream("*neg", range(3))) == [0, -1, -2]
+    assert list(tg.switch_stream("neg", [-1, 2], indices=0)) == [1, 2]
+
+
+def test_is_lazy():
+    tg = Triggon.from_label("double", new_values=lambda x: x * 2)
+    seen = []
+
+    def source():
+        for i in range(10):
+            seen.append(i)
+            yield i
+
+    stream = tg.switch_stream("double", source(), chunk_size=4)
+    assert seen == []
+    assert next(stream) == 0
+    assert seen == [0, 1, 2, 3]
+
+
+def test_label_changes_apply_at_chunk_boundaries():
+    tg = Triggon.from_label("double", new_values=lambda x: x * 2)
+    results = []
+
+    for item in tg.switch_stream("double", range(9), chunk_size=3):
+        results.append(item)
+        if item == 1:
+            tg.set_trigger("double")
+
+    assert results == [0, 1, 2, 6, 8, 10, 12, 14, 16]
+
+
+def test_deferred_transform_runs_once_per_chunk():
+    calls = []
+
+    def make():
+        calls.append(1)
+        return math.sqrt
+
+    tg = Triggon.from_label("root", new_values=TrigFunc(namespace={"make": make}).make())
+    tg.set_trigger("root")
+
+    assert list(tg.switch_stream("root", [1, 4, 9, 16], chunk_size=2)) == [1.0, 2.0, 3.0, 4.0]
+    assert len(calls) == 2
+
+
+def test_non_callable_label_value():
+    tg = Triggon.from_label("A", new_values=1)
+    tg.set_trigger("A")
+
+    stream = tg.switch_stream("A", range(3))
+    with pytest.raises(TypeError):
+        next(stream)
+
+
+def test_invalid_arguments_are_raised_eagerly():
+    tg = Triggon.from_label("A", new_values=abs)
+
+    with pytest.raises(InvalidArgumentError):
+        tg.switch_stream("A", range(3), chunk_size=0)
+    with pytest.raises(TypeError):
+        tg.switch_stream("A", range(3), chunk_size=1.5)
+    with pytest.raises(TypeError):
+        tg.switch_stream("A", range(3), 1)
+    with pytest.raises(UnregisteredLabelError):
+        tg.switch_stream("missing", range(3))
@@ -0,0 +1,101 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import InvalidArgumentError, Triggon, TrigFunc, UnregisteredLabelError
+
+
+@pytest.fixture
+def tg():
+    return Triggon.from_labels({"dev": None, "fast": None, "prod": None, "canary": None})
+
+
+def test_combinations(tg):
+    table = tg.switch_table(
+        {
+            frozenset({"dev", "fast"}): "dev-fast",
+            "dev": "dev",
+            ("prod", "!canary"): "prod",
+        },
+        default="off",
+    )
+    assert set(table.labels) == {"dev", "fast", "prod", "canary"}
+    assert len(table) == 3
+
+    assert table.resolve() == "off"
+    tg.set_trigger("dev")
+    assert table.resolve() == "dev"
+    tg.set_trigger("fast")
+    assert table.resolve() == "dev-fast"
+
+    tg.revert(all=True)
+    tg.set_trigger("prod")
+    assert table.resolve() == "prod"
+    tg.set_trigger("canary")
+    assert table.resolve() == "off"
+
+
+def test_first_matching_rule_wins(tg):
+    table = tg.switch_table({"dev": 1, ("dev", "fast"): 2})
+    tg.set_trigger(["dev", "fast"])
+
+    assert table.resolve() == 1
+
+
+def test_negation_only_and_catch_all(tg):
+    table = tg.switch_table({"!prod": "safe", (): "any"})
+
+    assert table.resolve() == "safe"
+    tg.set_trigger("prod")
+    assert table.resolve() == "any"
+
+
+def test_follows_sandbox_restore(tg):
+    table = tg.switch_table({"dev": 1}, default=0)
+
+    with tg.sandbox():
+        tg.set_trigger("dev")
+        assert table.resolve() == 1
+    assert table.resolve() == 0
+
+
+def test_lookup_is_stored_per_combination(tg):
+    table = tg.switch_table({"dev": 1, "fast": 2}, default=0)
+
+    for _ in range(3):
+        tg.set_trigger("dev")
+        assert table.resolve() == 1
+        tg.revert("dev")
+        assert table.resolve() == 0
+
+    assert len(table._lookup) == 2
+
+
+def test_deferred_values_run_on_every_resolve(tg):
+    calls = []
+    table = tg.switch_table({"dev": TrigFunc(namespace={"calls": calls}).calls.append(1)})
+    tg.set_trigger("dev")
+
+    table.resolve()
+    table.resolve()
+    assert calls == [1, 1]
+
+
+def test_invalid_rules(tg):
+    with pytest.raises(InvalidArgumentError):
+        tg.switch_table({})
+    with pytest.raises(InvalidArgumentError):
+        tg.switch_table({("dev", "!dev"): 1})
+    with pytest.raises(InvalidArgumentError):
+        tg.switch_table({"*dev": 1})
+    with pytest.raises(TypeError):
+        tg.switch_table([("dev", 1)])
+    with pytest.raises(TypeError):
+        tg.switch_table({1: 1})
+    with pytest.raises(UnregisteredLabelError):
+        tg.switch_table({("dev", "!missing"): 1})
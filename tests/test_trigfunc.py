@@ -1,4 +1,6 @@
+import math
 from pathlib import Path
+import pickle
 import sys
 
 import pytest
@@ -7,7 +9,7 @@ ROOT = str(Path(__file__).resolve().parents[1] / "src")
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-from triggon import TrigFunc
+from triggon import InvalidArgumentError, TrigFunc, Triggon
 
 
 def glob_trigfunc_target(prefix: str, *, suffix: str) -> str:
@@ -104,3 +106,165 @@ def test_raises_for_missing_attr():
 
     with pytest.raises(AttributeError, match=r"object has no attribute 'missing'"):
         f.box.missing()._run()
+
+
+def test_rate_limited_chain_returns_fallback():
+    f = TrigFunc(rate=0.001, fallback=-1)
+    call = f.len("abcd")
+
+    assert call._run() == 4
+    assert call._run() == -1
+
+
+def test_rate_limited_clones_share_bucket():
+    f = TrigFunc(rate=0.001, burst=2, fallback=-1)
+
+    assert f.len("ab")._run() == 2
+    assert f.sum([1, 2])._run() == 3
+    assert f.len("ab")._run() == -1
+
+
+def test_rate_limited_value_in_switch_lit():
+    f = TrigFunc(rate=0.001, fallback="cached")
+    tg = Triggon.from_label("A", new_values=f.str.upper("abc"))
+
+    tg.set_trigger("A")
+
+    assert tg.switch_lit("A", original_val="orig") == "ABC"
+    assert tg.switch_lit("A", original_val="orig") == "cached"
+
+
+def test_rejects_non_positive_rate():
+    with pytest.raises(InvalidArgumentError):
+        TrigFunc(rate=0)
+
+
+class _ReprCounter:
+    calls = 0
+
+    def __repr__(self):
+        type(self).calls += 1
+        return "counter"
+
+
+def test_debug_name_is_not_built_while_recording():
+    _ReprCounter.calls = 0
+    f = TrigFunc()
+
+    f.len(_ReprCounter(), key=_ReprCounter())
+
+    assert _ReprCounter.calls == 0
+
+
+def test_debug_name_is_not_built_without_logger():
+    _ReprCounter.calls = 0
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    tg.set_trigger("A")
+    tg.trigger_call("A", f.id(_ReprCounter()))
+
+    assert _ReprCounter.calls == 0
+
+
+def test_debug_name_formats_chain():
+    f = TrigFunc()
+
+    assert f.obj.method(1, "a", key=2)._trigcall.name == "obj.method(1, 'a', key=2)"
+
+
+def test_resolves_from_explicit_mapping_namespace():
+    f = TrigFunc(namespace={"double": lambda x: x * 2})
+
+    assert f.double(4)._run() == 8
+
+
+def test_resolves_from_explicit_module_namespace():
+    f = TrigFunc(namespace=math)
+
+    assert f.sqrt(9)._run() == 3
+
+
+def test_explicit_namespace_skips_frame_locals():
+    def build(local_only):
+        return TrigFunc(namespace={}).local_only.upper()
+
+    with pytest.raises(NameError, match="'local_only' is not defined"):
+        build("local")._run()
+
+
+def test_weak_capture_does_not_pin_locals():
+    import gc
+    import weakref
+
+    class Big:
+        pass
+
+    def build():
+        big = Big()
+        return TrigFunc(weak=True).len("abc"), weakref.ref(big)
+
+    call, big_ref = build()
+    gc.collect()
+
+    assert big_ref() is None
+    assert call._run() == 3
+
+
+def test_weak_capture_resolves_module_globals():
+    f = TrigFunc(weak=True)
+
+    assert f.glob_trigfunc_target("[", suffix="]")._run() == "[global]"
+
+
+def test_rejects_weak_mapping_namespace():
+    with pytest.raises(InvalidArgumentError):
+        TrigFunc(namespace={}, weak=True)
+
+
+def test_rejects_invalid_namespace_type():
+    with pytest.raises(TypeError, match="namespace must be"):
+        TrigFunc(namespace=123)
+
+
+def test_pickles_builtin_root():
+    call = pickle.loads(pickle.dumps(TrigFunc().len("abcd")))
+
+    assert call._run() == 4
+
+
+def test_pickles_module_root_with_kwargs():
+    call = pickle.loads(pickle.dumps(TrigFunc().math.fsum([0.5, 0.25])))
+
+    assert call._run() == 0.75
+
+
+def test_pickles_qualname_root():
+    call = pickle.loads(pickle.dumps(TrigFunc().glob_trigfunc_target("<", suffix=">")))
+
+    assert call._run() == "<global>"
+
+
+def test_rejects_pickling_local_root():
+    def local_target():
+        return 1
+
+    with pytest.raises(pickle.PicklingError, match="importable name"):
+        pickle.dumps(TrigFunc().local_target())
+
+
+def test_rejects_pickling_unbound_instance():
+    with pytest.raises(pickle.PicklingError, match="not bound"):
+        pickle.dumps(TrigFunc())
+
+
+def test_copy_keeps_local_root():
+    import copy
+
+    def local_target():
+        return 1
+
+    call = TrigFunc().local_target()
+
+    assert copy.copy(call)._run() == 1
+    assert copy.deepcopy(call)._run() == 1
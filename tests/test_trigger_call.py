@@ -1,5 +1,9 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import gc
+import os
 from pathlib import Path
 import sys
+from time import sleep
 
 import pytest
 
@@ -66,3 +70,203 @@ def test_rejects_symbol_labels():
 
     with pytest.raises(InvalidArgumentError):
         tg.trigger_call("*A", f.len("abc"))
+
+
+def test_rate_limit_returns_fallback_when_throttled():
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    tg.set_trigger("A")
+
+    assert tg.trigger_call("A", f.len("ab"), rate=0.001, fallback="skip") == 2
+    assert tg.trigger_call("A", f.len("ab"), rate=0.001, fallback="skip") == "skip"
+
+
+def test_rate_limit_allows_burst():
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    tg.set_trigger("A")
+
+    results = [tg.trigger_call("A", f.len("abc"), rate=0.001, burst=2) for _ in range(3)]
+
+    assert results == [3, 3, None]
+
+
+def test_rate_limit_keeps_separate_buckets_per_target():
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    tg.set_trigger("A")
+
+    assert tg.trigger_call("A", f.len("ab"), rate=0.001) == 2
+    assert tg.trigger_call("A", f.sum([1, 2]), rate=0.001) == 3
+
+
+def test_rate_limit_keeps_separate_buckets_per_root():
+    class Counter:
+        def __init__(self):
+            self.n = 0
+
+        def bump(self):
+            self.n += 1
+            return self.n
+
+    tg = Triggon.from_label("A", new_values=1)
+
+    def call(counter):
+        f = TrigFunc()
+        return tg.trigger_call("A", f.counter.bump(), rate=0.001)
+
+    first = Counter()
+    second = Counter()
+
+    tg.set_trigger("A")
+
+    assert call(first) == 1
+    assert call(second) == 1
+    assert call(first) is None
+
+
+def test_rate_limit_drops_buckets_of_collected_roots():
+    class Session:
+        def ping(self):
+            return "pong"
+
+    tg = Triggon.from_label("A", new_values=1)
+
+    def call():
+        f = TrigFunc(namespace={"session": Session()})
+        return tg.trigger_call("A", f.session.ping(), rate=5)
+
+    tg.set_trigger("A")
+
+    for _ in range(100):
+        assert call() == "pong"
+
+    gc.collect()
+    assert len(tg._call_buckets) == 0
+
+
+def test_rate_limit_bounds_buckets_of_unreferenceable_roots():
+    tg = Triggon.from_label("A", new_values=1)
+
+    def call(n):
+        f = TrigFunc()
+        return tg.trigger_call("A", f.n.bit_length(), rate=5)
+
+    tg.set_trigger("A")
+
+    for i in range(1000, 2000):
+        assert call(i) is not None
+
+    assert len(tg._call_buckets) == 256
+
+
+def test_call_rate_replaces_trigfunc_rate():
+    f = TrigFunc(rate=0.001, fallback="own")
+    tg = Triggon.from_label("A", new_values=1)
+
+    tg.set_trigger("A")
+
+    results = [tg.trigger_call("A", f.len("ab"), rate=0.001, burst=2) for _ in range(3)]
+
+    assert results == [2, 2, None]
+    assert f.len("ab")._run() == 2
+
+
+def test_rate_limit_does_not_reset_on_other_limits():
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    tg.set_trigger("A")
+
+    assert tg.trigger_call("A", f.len("ab"), rate=0.001) == 2
+    assert tg.trigger_call("A", f.len("ab"), rate=0.002) == 2
+    assert tg.trigger_call("A", f.len("ab"), rate=0.001) is None
+    assert tg.trigger_call("A", f.len("ab"), rate=0.002) is None
+
+
+def test_rate_limit_does_not_consume_tokens_when_inactive():
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    assert tg.trigger_call("A", f.len("ab"), rate=0.001, fallback="skip") is None
+
+    tg.set_trigger("A")
+
+    assert tg.trigger_call("A", f.len("ab"), rate=0.001, fallback="skip") == 2
+
+
+def test_rate_limit_refills_over_time():
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    tg.set_trigger("A")
+
+    assert tg.trigger_call("A", f.len("ab"), rate=100) == 2
+    sleep(0.03)
+    assert tg.trigger_call("A", f.len("ab"), rate=100) == 2
+
+
+@pytest.mark.parametrize(
+    ("rate", "burst", "err"),
+    [
+        (0, 1, InvalidArgumentError),
+        (-1, 1, InvalidArgumentError),
+        (1, 0, InvalidArgumentError),
+        ("1", 1, TypeError),
+        (1, 1.5, TypeError),
+    ],
+)
+def test_rejects_invalid_rate_limit(rate, burst, err):
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(err):
+        tg.trigger_call("A", f.len("abc"), rate=rate, burst=burst)
+
+
+def test_submits_to_thread_pool():
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    tg.set_trigger("A")
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = tg.trigger_call("A", f.len("abc"), executor=pool)
+
+        assert future.result(timeout=5) == 3
+
+
+def test_submits_to_process_pool():
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    tg.set_trigger("A")
+
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        future = tg.trigger_call("A", f.os.getpid(), executor=pool)
+
+        assert future.result(timeout=30) != os.getpid()
+
+
+def test_executor_not_used_when_inactive():
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        assert tg.trigger_call("A", f.len("abc"), executor=pool) is None
+
+
+def test_executor_returns_fallback_future_when_throttled():
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    tg.set_trigger("A")
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        tg.trigger_call("A", f.len("abc"), rate=0.001, executor=pool)
+        future = tg.trigger_call("A", f.len("abc"), rate=0.001, fallback=0, executor=pool)
+
+        assert future.result(timeout=5) == 0
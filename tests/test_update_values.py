@@ -317,6 +317,102 @@ def test_reschedule_replaces_pending_update():
     assert registered_value == 20
 
 
+def test_prewarm_runs_deferred_value_before_activation():
+    f = TrigFunc()
+    calls = []
+    global registered_value
+    registered_value = 0
+
+    def make_value():
+        calls.append("run")
+        return 10
+
+    tg = Triggon.from_label("A", new_values=f.make_value())
+    tg.register_ref("A", name="registered_value")
+
+    tg.set_trigger("A", after=0.15, prewarm=0.14)
+
+    wait_until(lambda: calls == ["run"])
+    assert tg.is_triggered("A") is False
+    assert registered_value == 0
+
+    wait_until(lambda: registered_value == 10)
+    assert calls == ["run"]
+
+
+def test_prewarm_result_is_shared_by_refs():
+    f = TrigFunc()
+    calls = []
+    global registered_a, registered_b
+    registered_a = 0
+    registered_b = 0
+
+    def make_value():
+        calls.append("run")
+        return 10
+
+    tg = Triggon.from_label("A", new_values=f.make_value())
+    tg.register_refs({"A": {"registered_a": 0, "registered_b": 0}})
+
+    tg.set_trigger("A", after=0.05, prewarm=0.05)
+
+    wait_until(lambda: registered_a == 10 and registered_b == 10)
+    assert calls == ["run"]
+
+
+def test_prewarm_discards_rescheduled_result():
+    f = TrigFunc()
+    global registered_value
+    registered_value = 0
+
+    tg = Triggon.from_label("A", new_values=(f.len("ab"), f.len("abcd")))
+    tg.register_ref("A", name="registered_value")
+
+    tg.set_trigger("A", indices=0, after=0.2, prewarm=0.2)
+    sleep(0.05)
+    tg.set_trigger("A", indices=1, after=0.05, prewarm=0.05, reschedule=True)
+
+    wait_until(lambda: registered_value == 4)
+    sleep(0.2)
+
+    assert registered_value == 4
+
+
+def test_prewarm_failure_runs_value_on_activation():
+    f = TrigFunc()
+    calls = []
+    global registered_value
+    registered_value = 0
+
+    def make_value():
+        calls.append("run")
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return 10
+
+    tg = Triggon.from_label("A", new_values=f.make_value())
+    tg.register_ref("A", name="registered_value")
+
+    tg.set_trigger("A", after=0.1, prewarm=0.1)
+
+    wait_until(lambda: registered_value == 10)
+    assert calls == ["run", "run"]
+
+
+def test_prewarm_requires_after():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(InvalidArgumentError, match="'prewarm' requires 'after'"):
+        tg.set_trigger("A", prewarm=1)
+
+
+def test_prewarm_rejects_bool():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(TypeError):
+        tg.set_trigger("A", after=1, prewarm=True)
+
+
 def test_switch_lit_uses_single_symbol_label():
     tg = Triggon.from_label("A", new_values=(10, 20, 30))
 
@@ -0,0 +1,119 @@
+from pathlib import Path
+import gc
+import sys
+import weakref
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import Triggon
+
+
+class Session:
+    def __init__(self):
+        self.mode = "safe"
+
+
+class SlottedSession:
+    __slots__ = ("mode",)
+
+    def __init__(self):
+        self.mode = "safe"
+
+
+def _attr_ids(tg, label):
+    return [ref.ref_id for ref in tg._label_refs[label]["attr"]]
+
+
+def _register(tg, session):
+    # register from a separate frame so the test holds the only reference
+    tg.register_ref("A", name="session.mode")
+
+
+def test_registered_attribute_does_not_keep_parent_alive():
+    tg = Triggon.from_label("A", new_values="fast")
+    session = Session()
+    session_ref = weakref.ref(session)
+    _register(tg, session)
+
+    del session
+    gc.collect()
+
+    assert session_ref() is None
+    assert _attr_ids(tg, "A") == []
+    assert tg._id_meta == {}
+
+
+def test_updates_parent_while_alive():
+    tg = Triggon.from_label("A", new_values="fast")
+    session = Session()
+    tg.register_ref("A", name="session.mode")
+
+    tg.set_trigger("A")
+    assert session.mode == "fast"
+
+    tg.revert("A")
+    assert session.mode == "safe"
+
+
+def test_parent_without_weakref_support_is_kept():
+    tg = Triggon.from_label("A", new_values="fast")
+    _register(tg, SlottedSession())
+    gc.collect()
+
+    assert len(_attr_ids(tg, "A")) == 1
+
+    tg.set_trigger("A")
+
+    # the strongly held parent is still updated
+    assert tg._label_refs["A"]["attr"][0].parent_obj.mode == "fast"
+
+
+def test_purge_is_deferred_while_lock_is_held():
+    tg = Triggon.from_label("A", new_values="fast")
+    session = Session()
+    _register(tg, session)
+
+    with tg._lock:
+        del session
+        gc.collect()
+        # the callback must not block on the lock held by this thread
+        assert len(_attr_ids(tg, "A")) == 1
+
+    assert len(tg._dead_refs) == 1
+
+    # triggering skips the dead ref until it is purged
+    tg.set_trigger("A")
+
+    assert not tg.is_registered("session.mode", label="A")
+    assert _attr_ids(tg, "A") == []
+    assert not tg._dead_refs
+
+
+def test_reregistering_after_collection_uses_new_parent():
+    tg = Triggon.from_label("A", new_values="fast")
+    _register(tg, Session())
+    gc.collect()
+
+    session = Session()
+    tg.register_ref("A", name="session.mode")
+    tg.set_trigger("A")
+
+    assert session.mode == "fast"
+    assert len(_attr_ids(tg, "A")) == 1
+
+
+def test_collected_parent_does_not_keep_instance_alive():
+    tg = Triggon.from_label("A", new_values="fast")
+    session = Session()
+    _register(tg, session)
+    tg_ref = weakref.ref(tg)
+
+    del tg
+    gc.collect()
+
+    assert tg_ref() is None
+    # the callback of a parent outliving its instance is a no-op
+    del session
+    gc.collect()
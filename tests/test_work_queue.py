@@ -0,0 +1,207 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import queue
+import sys
+import threading
+from time import monotonic, sleep
+
+import pytest
+
+ROOT = str(Path(__file__).resolve().parents[1] / "src")
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from triggon import InvalidArgumentError, TrigFunc, Triggon, UnregisteredLabelError
+
+
+def wait_until(predicate, timeout: float = 0.4, interval: float = 0.005):
+    deadline = monotonic() + timeout
+
+    while monotonic() < deadline:
+        if predicate():
+            return
+        sleep(interval)
+
+    assert predicate()
+
+
+def test_holds_work_until_label_is_active():
+    tg = Triggon.from_label("A", new_values=1)
+    calls = []
+
+    future = tg.submit_when("A", lambda: calls.append("run") or 10)
+
+    assert calls == []
+    assert future.done() is False
+
+    tg.set_trigger("A")
+
+    assert calls == ["run"]
+    assert future.result(timeout=1) == 10
+
+
+def test_runs_immediately_when_label_is_active():
+    tg = Triggon.from_label("A", new_values=1)
+    tg.set_trigger("A")
+
+    future = tg.submit_when("A", lambda: 5)
+
+    assert future.result(timeout=1) == 5
+
+
+def test_runs_deferred_target():
+    f = TrigFunc()
+    tg = Triggon.from_label("A", new_values=1)
+
+    future = tg.submit_when("A", f.len("abc"))
+    tg.set_trigger("A")
+
+    assert future.result(timeout=1) == 3
+
+
+def test_drains_in_submission_order():
+    tg = Triggon.from_label("A", new_values=1)
+    tg.configure_queue("A", batch_size=2)
+    calls = []
+
+    for i in range(5):
+        tg.submit_when("A", lambda i=i: calls.append(i))
+    tg.set_trigger("A")
+
+    assert calls == [0, 1, 2, 3, 4]
+
+
+def test_drains_into_executor():
+    tg = Triggon.from_label("A", new_values=1)
+    thread_names = []
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="queue-worker") as pool:
+        tg.configure_queue("A", executor=pool)
+        future = tg.submit_when("A", lambda: thread_names.append(threading.current_thread().name))
+        tg.set_trigger("A")
+        future.result(timeout=1)
+
+    assert thread_names[0].startswith("queue-worker")
+
+
+def test_drains_on_delayed_trigger():
+    tg = Triggon.from_label("A", new_values=1)
+
+    future = tg.submit_when("A", lambda: 7)
+    tg.set_trigger("A", after=0.02)
+
+    assert future.result(timeout=1) == 7
+
+
+def test_keeps_work_queued_after_revert():
+    tg = Triggon.from_label("A", new_values=1)
+    tg.set_trigger("A")
+    tg.revert("A")
+
+    future = tg.submit_when("A", lambda: 1)
+
+    assert future.done() is False
+
+
+def test_stores_target_exception_in_future():
+    tg = Triggon.from_label("A", new_values=1)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    future = tg.submit_when("A", fail)
+    tg.set_trigger("A")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        future.result(timeout=1)
+
+
+def test_propagates_keyboard_interrupt():
+    tg = Triggon.from_label("A", new_values=1)
+
+    def interrupt():
+        raise KeyboardInterrupt
+
+    tg.submit_when("A", interrupt)
+
+    with pytest.raises(KeyboardInterrupt):
+        tg.set_trigger("A")
+
+
+def test_skips_cancelled_work():
+    tg = Triggon.from_label("A", new_values=1)
+    calls = []
+
+    future = tg.submit_when("A", lambda: calls.append("run"))
+    future.cancel()
+    tg.set_trigger("A")
+
+    assert calls == []
+
+
+def test_raises_full_without_blocking():
+    tg = Triggon.from_label("A", new_values=1)
+    tg.configure_queue("A", maxsize=1)
+
+    tg.submit_when("A", lambda: 1)
+
+    with pytest.raises(queue.Full):
+        tg.submit_when("A", lambda: 2, block=False)
+
+
+def test_raises_full_after_timeout():
+    tg = Triggon.from_label("A", new_values=1)
+    tg.configure_queue("A", maxsize=1)
+
+    tg.submit_when("A", lambda: 1)
+
+    with pytest.raises(queue.Full):
+        tg.submit_when("A", lambda: 2, timeout=0.01)
+
+
+def test_blocked_producer_resumes_after_drain():
+    tg = Triggon.from_label("A", new_values=1)
+    tg.configure_queue("A", maxsize=1)
+    results = []
+
+    tg.submit_when("A", lambda: 1)
+
+    def produce():
+        results.append(tg.submit_when("A", lambda: 2, timeout=1))
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    sleep(0.02)
+    tg.set_trigger("A")
+    producer.join(timeout=1)
+
+    assert results[0].result(timeout=1) == 2
+
+
+def test_rejects_non_callable_target():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(TypeError, match="TrigFunc or be callable"):
+        tg.submit_when("A", 123)
+
+
+def test_rejects_unregistered_label():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(UnregisteredLabelError):
+        tg.submit_when("B", lambda: 1)
+
+
+@pytest.mark.parametrize("kwargs", [{"maxsize": 0}, {"batch_size": -1}])
+def test_configure_rejects_non_positive_sizes(kwargs):
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(InvalidArgumentError):
+        tg.configure_queue("A", **kwargs)
+
+
+def test_configure_rejects_invalid_executor():
+    tg = Triggon.from_label("A", new_values=1)
+
+    with pytest.raises(TypeError, match="executor must be Executor"):
+        tg.configure_queue("A", executor=object())